@@ -29,12 +29,36 @@ POPUP_OFFSET_Y = 20
 # Translation settings
 TRANSLATION_TIMEOUT = 10  # seconds
 TRANSLATION_RETRY_ATTEMPTS = 3
+TRANSLATION_RETRY_BASE_DELAY = 0.5  # seconds, doubled per retry (with jitter)
+TRANSLATION_RETRY_MAX_DELAY = 4.0  # seconds
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures before failing fast
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30  # seconds before a trial request is allowed
+HTTP_POOL_CONNECTIONS = 10  # distinct hosts kept in the connection pool
+HTTP_POOL_MAXSIZE = 20  # keep-alive connections per host
+TRANSLATOR_REGISTRY_SIZE = 32  # language pairs with a cached translator object
+BATCH_MAX_WORKERS = 8  # concurrent requests used by batch_translate
+ASYNC_MAX_CONNECTIONS = 100  # connections shared by all async translations
+ASYNC_MAX_CONCURRENCY = 100  # in-flight items per abatch_translate call
+# Requests per second and burst size per translation backend (missing = unlimited)
+RATE_LIMITS = {
+    'googletrans': {'qps': 5, 'burst': 10},
+    'deep_translator': {'qps': 5, 'burst': 10},
+}
+SPECULATIVE_TRANSLATION = True  # start work as soon as the hotkey fires
+SPECULATIVE_TARGETS = 2  # default plus most recently chosen target languages
+OFFLINE_DRAIN_INTERVAL = 30  # seconds between attempts to replay queued requests
+OFFLINE_DRAIN_BATCH_SIZE = 50  # queued requests replayed per batch
+OFFLINE_MAX_ATTEMPTS = 5  # failed replays before a queued request is dropped
+TRANSLATION_CACHE_SIZE = 2048  # in-process LRU cache entries
+TRANSLATION_CACHE_MAX_BYTES = 8 * 1024 * 1024
+TRANSLATION_CACHE_TTL = None  # seconds, None = entries never expire
 PRESERVE_ENTITY_TYPES = ["PERSON", "ORG", "GPE", "LOC", "PRODUCT", "EVENT"]
 
 # NLP settings
 SPACY_MODEL = "en_core_web_sm"
 TF_IDF_MAX_FEATURES = 10
 KEY_TERMS_COUNT = 5
+IDF_MIN_DOCUMENTS = 50  # stored texts needed before key terms use the corpus IDF model
 
 # Logging settings
 LOG_LEVEL = "INFO"
@@ -6,19 +6,25 @@ NLP Mini Project
 Demonstrates: Translation, NER, Context Analysis, Domain Detection, TTS
 """
 
+import json
 import logging
 import sys
 import os
+import threading
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
+import config
 from src.translator import TranslationEngine
 from src.context_analyzer import ContextAnalyzer
 from src.hotkey_handler import HotkeyHandler
 from src.gui import TranslationPopup
 from src.memory import TranslationMemory
+from src.idf_model import IDFModel
+from src.offline_queue import OfflineQueue
+from src.speculation import SpeculativeExecutor
 from src.audio_handler import AudioHandler
 from src.language_selector import LanguageSelector
 from src.system_tray import SystemTrayIcon
@@ -41,12 +47,13 @@ class TranslationAssistant:
     Main application class integrating all components
     """
     
-    def __init__(self, target_language: str = 'es'):
+    def __init__(self, target_language: str = 'es', backend=None):
         """
         Initialize the translation assistant
         
         Args:
             target_language: Default target language for translations
+            backend: Translation backend (default: Google Translate)
         """
         logger.info("Initializing Translation Assistant...")
         
@@ -59,15 +66,35 @@ class TranslationAssistant:
         try:
             # Translation engine
             custom_dict_path = self.data_dir / 'custom_dictionary.json'
-            self.translator = TranslationEngine(str(custom_dict_path))
+            self.translator = TranslationEngine(str(custom_dict_path), backend=backend)
             
-            # Context analyzer
-            self.analyzer = ContextAnalyzer()
+            # Corpus IDF model for key terms, kept up to date from translation memory
+            self.idf_model = IDFModel(str(self.data_dir / 'idf_model'), min_documents=config.IDF_MIN_DOCUMENTS)
+            
+            # Context analyzer (models warm up in the background)
+            self.analyzer = ContextAnalyzer(
+                load_in_background=True,
+                custom_dict_path=str(custom_dict_path),
+                idf_model=self.idf_model
+            )
             
             # Translation memory
             memory_path = self.data_dir / 'translation_memory.db'
             self.memory = TranslationMemory(str(memory_path))
             
+            # Offline fallback: answer from memory, queue the rest for replay
+            self.offline_queue = OfflineQueue(
+                self.translator,
+                self.memory,
+                batch_size=config.OFFLINE_DRAIN_BATCH_SIZE,
+                drain_interval=config.OFFLINE_DRAIN_INTERVAL,
+                max_attempts=config.OFFLINE_MAX_ATTEMPTS
+            )
+            
+            # Background work started while the language selector is open
+            self.speculator = SpeculativeExecutor(max_workers=config.SPECULATIVE_TARGETS + 2)
+            self._recent_targets = []
+            
             # Audio handler
             self.audio = AudioHandler()
             
@@ -108,10 +135,27 @@ class TranslationAssistant:
             # Show language selector first
             selector = LanguageSelector(self.target_language)
             
+            # A previous selection that was never translated
+            previous = getattr(self, '_pending_translation', None)
+            if previous and previous.get('speculation'):
+                self.speculator.abandon(previous['speculation'])
+            
+            # Start detection, analysis and likely translations while the user chooses
+            speculation = None
+            if config.SPECULATIVE_TRANSLATION:
+                speculation = self.speculator.start(
+                    selected_text,
+                    detect=self.translator.detect_language,
+                    analyze=self._speculative_analysis,
+                    translate=self._speculative_translation,
+                    targets=self._speculative_targets()
+                )
+            
             # Store data for translation after selection
             self._pending_translation = {
                 'text': selected_text,
-                'position': cursor_position
+                'position': cursor_position,
+                'speculation': speculation
             }
             
             # Show selector and wait for language choice
@@ -133,17 +177,16 @@ class TranslationAssistant:
             
             selected_text = self._pending_translation['text']
             cursor_position = self._pending_translation['position']
+            speculation = self._pending_translation.get('speculation')
+            if speculation:
+                self.speculator.resolve(speculation, target_lang)
+            self._remember_target(target_lang)
             
-            # Step 1: Perform context analysis
-            analysis = self.analyzer.analyze_full_context(selected_text)
-            
-            logger.info(f"Context analysis complete:")
-            logger.info(f"  - Domain: {analysis['primary_domain']}")
-            logger.info(f"  - Entities found: {len(analysis['entities'])}")
-            logger.info(f"  - Key terms: {[t[0] for t in analysis['key_terms'][:3]]}")
+            # Step 1: Detect language (usually finished in the background)
+            detection = speculation.get_detection() if speculation else None
+            detected_lang, confidence = detection or self.translator.detect_language(selected_text)
             
-            # Step 2: Check translation memory
-            detected_lang, confidence = self.translator.detect_language(selected_text)
+            # Step 2: Check translation memory before any NLP work
             cached_translation = self.memory.find_translation(
                 selected_text,
                 detected_lang,
@@ -160,37 +203,58 @@ class TranslationAssistant:
                     'confidence': cached_translation['confidence'],
                     'method': 'cache'
                 }
+                # Metadata comes from what was stored with the translation
+                domain = cached_translation['domain'] or 'general'
+                entities = json.loads(cached_translation['entities']) if cached_translation['entities'] else []
             else:
-                # Step 3: Perform translation WITHOUT entity preservation
+                # Step 3: Context analysis runs while the translation request is in flight
+                analysis_future = speculation.analysis if speculation else None
+                if analysis_future is None or analysis_future.cancelled():
+                    analysis_future = self.speculator.submit(self.analyzer.analyze_full_context, selected_text)
+                
+                # Perform translation WITHOUT entity preservation
                 # (Entity preservation was causing mixed language output)
-                # Only preserve proper nouns like names and places if needed
+                # Speculative translation into this language, if one was started
+                translation_result = speculation.get_translation(target_lang) if speculation else None
                 
-                translation_result = self.translator.translate(
-                    selected_text,
-                    target_lang=target_lang,
-                    preserve_entities=None  # Disabled for cleaner translations
-                )
+                if translation_result is None or translation_result['method'] == 'error':
+                    # Falls back to memory and queues the request when the backend is down
+                    translation_result = self.offline_queue.translate(
+                        selected_text,
+                        target_lang=target_lang,
+                        detection=(detected_lang, confidence)  # Reuse detection from step 1
+                    )
                 
-                # Step 4: Store in translation memory
-                self.memory.add_translation(
-                    original_text=selected_text,
-                    translated_text=translation_result['translated_text'],
-                    source_lang=translation_result['source_language'],
-                    target_lang=translation_result['target_language'],
-                    context=analysis['context']['context_before'],
-                    domain=analysis['primary_domain'],
-                    entities=[],  # No entities preserved
-                    confidence=translation_result['confidence'],
-                    method=translation_result['method']
-                )
+                analysis = self._wait_for_analysis(analysis_future, selected_text)
+                domain = analysis['primary_domain']
+                entities = analysis['entity_texts']
+                
+                logger.info(f"Context analysis complete:")
+                logger.info(f"  - Domain: {domain}")
+                logger.info(f"  - Entities found: {len(analysis['entities'])}")
+                logger.info(f"  - Key terms: {[t[0] for t in analysis['key_terms'][:3]]}")
                 
-                logger.info("Translation stored in memory")
+                # Step 4: Store in translation memory (never untranslated error output)
+                if translation_result['method'] != 'error' and not translation_result.get('offline'):
+                    self.memory.add_translation(
+                        original_text=selected_text,
+                        translated_text=translation_result['translated_text'],
+                        source_lang=translation_result['source_language'],
+                        target_lang=translation_result['target_language'],
+                        context=analysis['context']['context_before'],
+                        domain=domain,
+                        entities=entities,  # Detected entities, shown again on memory hits
+                        confidence=translation_result['confidence'],
+                        method=translation_result['method']
+                    )
+                    
+                    logger.info("Translation stored in memory")
             
             # Step 5: Display popup with results
             metadata = {
-                'domain': analysis['primary_domain'],
+                'domain': domain,
                 'confidence': translation_result['confidence'],
-                'entities': [],  # No entities preserved for cleaner output
+                'entities': entities,
                 'method': translation_result.get('method', 'unknown')
             }
             
@@ -206,6 +270,43 @@ class TranslationAssistant:
         except Exception as e:
             logger.error(f"Error handling hotkey: {e}", exc_info=True)
     
+    def _wait_for_analysis(self, analysis_future, text: str) -> dict:
+        """Get a background context analysis, analyzing directly if it failed or was skipped"""
+        try:
+            analysis = analysis_future.result()
+        except Exception as e:
+            logger.warning(f"Background context analysis failed: {e}")
+            analysis = None
+        return analysis or self.analyzer.analyze_full_context(text)
+    
+    def _is_remembered(self, text: str, target_lang: str, detection: tuple = None) -> bool:
+        """Check whether translation memory already holds text in target_lang"""
+        source_lang = (detection or self.translator.detect_language(text))[0]
+        return self.memory.find_translation(text, source_lang, target_lang) is not None
+    
+    def _speculative_analysis(self, text: str):
+        """Analyze text in the background unless the default target is a memory hit"""
+        if self._is_remembered(text, self.target_language):
+            return None
+        return self.analyzer.analyze_full_context(text)
+    
+    def _speculative_translation(self, text: str, target_lang: str, detection: tuple):
+        """Translate text in the background unless translation memory already has it"""
+        if self._is_remembered(text, target_lang, detection):
+            return None
+        return self.translator.translate(text, target_lang=target_lang, detection=detection)
+    
+    def _speculative_targets(self) -> list:
+        """Target languages worth translating into before the user chooses"""
+        targets = [self.target_language] + self._recent_targets
+        return list(dict.fromkeys(targets))[:config.SPECULATIVE_TARGETS]
+    
+    def _remember_target(self, target_lang: str):
+        """Move target_lang to the front of the recently chosen languages"""
+        self._recent_targets = [target_lang] + [
+            lang for lang in self._recent_targets if lang != target_lang
+        ][:config.SPECULATIVE_TARGETS - 1]
+    
     def _handle_copy(self, text: str):
         """Handle copy button click"""
         logger.info("Copy action executed")
@@ -243,6 +344,14 @@ class TranslationAssistant:
         """Get usage statistics"""
         return self.memory.get_statistics()
     
+    def _refresh_idf_model(self):
+        """Update the IDF model from translation memory and save it if it changed"""
+        try:
+            if self.idf_model.update_from_memory(self.memory):
+                self.idf_model.save()
+        except Exception as e:
+            logger.error(f"Error refreshing IDF model: {e}")
+    
     def start(self):
         """Start the application"""
         try:
@@ -257,6 +366,12 @@ class TranslationAssistant:
             # Start hotkey listener
             self.hotkey_handler.start()
             
+            # Replay requests queued while offline once the backend is reachable
+            self.offline_queue.start()
+            
+            # Add texts stored since the last session to the IDF model
+            threading.Thread(target=self._refresh_idf_model, name='idf-refresh', daemon=True).start()
+            
             # Keep application running with status window
             print("\n" + "="*60)
             print("🌐 TRANSLATION ASSISTANT RUNNING")
@@ -284,6 +399,13 @@ class TranslationAssistant:
             # Stop hotkey listener
             self.hotkey_handler.stop()
             
+            # Stop replaying queued requests before the database closes
+            self.offline_queue.stop()
+            self.speculator.shutdown()
+            
+            # Fold this session's translations into the IDF model
+            self._refresh_idf_model()
+            
             # Close database connection
             self.memory.close()
             
@@ -292,6 +414,9 @@ class TranslationAssistant:
             logger.info("Session Statistics:")
             logger.info(f"  Total translations: {stats.get('total_translations', 0)}")
             logger.info(f"  Total usage: {stats.get('total_usage', 0)}")
+            speculation_stats = self.speculator.get_stats()
+            logger.info(f"  Speculation hit rate: {speculation_stats['hit_rate']:.0%} "
+                        f"({speculation_stats['hits']}/{speculation_stats['hits'] + speculation_stats['misses']})")
             
             logger.info("Translation Assistant stopped successfully")
             
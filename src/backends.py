@@ -0,0 +1,477 @@
+"""
+Translation Backends Module
+Defines the backend interface used by TranslationEngine
+Includes the Google Translate backend and a deterministic offline fake for load testing
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple
+
+# Try importing googletrans (fails on Python 3.13+ due to missing 'cgi' module)
+try:
+    from googletrans import Translator
+    GOOGLETRANS_AVAILABLE = True
+except (ImportError, ModuleNotFoundError) as e:
+    GOOGLETRANS_AVAILABLE = False
+    logging.warning(f"googletrans not available: {e}. Using deep-translator as primary.")
+
+# aiohttp is optional: without it async calls run the blocking client in a worker thread
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError as e:
+    AIOHTTP_AVAILABLE = False
+    logging.warning(f"aiohttp not available: {e}. Async translation will use worker threads.")
+
+from src.http_pool import ConnectionPool, TranslatorRegistry
+from src.segment_markers import MARKER_PATTERN, MARKER_TEMPLATE
+
+logger = logging.getLogger(__name__)
+
+
+class BackendError(Exception):
+    """Raised when a translation backend fails to produce a result"""
+
+    def __init__(self, message: str, transient: bool = True):
+        """
+        Initialize backend error
+
+        Args:
+            message: Error description
+            transient: Whether retrying may succeed (see resilience.is_transient_error)
+        """
+        super().__init__(message)
+        self.transient = transient
+
+
+class TranslationBackend(ABC):
+    """
+    Interface every translation backend implements
+    """
+
+    # Short identifier reported as the translation 'method'
+    name = 'backend'
+
+    # Largest text (in characters) accepted by a single request
+    max_payload = 5000
+
+    @abstractmethod
+    def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Translate a single text
+
+        Args:
+            text: Text to translate (at most max_payload characters)
+            source_lang: Source language code
+            target_lang: Target language code
+            timeout: Seconds the request may take (None = backend default)
+
+        Returns:
+            Translated text
+        """
+
+    async def atranslate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Translate a single text without blocking the event loop
+
+        Backends without a native async client run translate() in a worker thread.
+
+        Args:
+            text: Text to translate (at most max_payload characters)
+            source_lang: Source language code
+            target_lang: Target language code
+            timeout: Seconds the request may take (None = backend default)
+
+        Returns:
+            Translated text
+        """
+        return await asyncio.to_thread(self.translate, text, source_lang, target_lang, timeout)
+
+    def translate_many(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        timeout: Optional[float] = None
+    ) -> List[str]:
+        """
+        Translate several texts for the same language pair
+
+        Args:
+            texts: Texts to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            timeout: Seconds each request may take (None = backend default)
+
+        Returns:
+            Translated texts, in input order
+        """
+        return [self.translate(text, source_lang, target_lang, timeout) for text in texts]
+
+    def detect(self, text: str) -> Tuple[str, float]:
+        """
+        Detect the language of a text
+
+        Args:
+            text: Input text
+
+        Returns:
+            Tuple of (language_code, confidence)
+        """
+        raise NotImplementedError(f"{self.name} backend does not support detection")
+
+    def capabilities(self) -> Dict[str, bool]:
+        """
+        Describe optional features of the backend
+
+        Returns:
+            Dictionary with 'detect' and 'batch' flags
+        """
+        return {'detect': False, 'batch': False}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get backend-specific request statistics"""
+        return {}
+
+    def close(self):
+        """Release resources held by the backend"""
+
+    async def aclose(self):
+        """Release async resources held by the backend"""
+
+
+class GoogleBackend(TranslationBackend):
+    """
+    Google Translate via googletrans (Python 3.12 and below) with
+    deep-translator over a pooled connection as primary/fallback
+    """
+
+    name = 'google'
+    max_payload = 5000
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        registry_size: int = 32,
+        timeout: Optional[float] = None,
+        async_connection_limit: int = 100
+    ):
+        """
+        Initialize Google backend
+
+        Args:
+            pool_connections: Number of distinct hosts to keep pools for
+            pool_maxsize: Maximum keep-alive connections per host
+            registry_size: Number of language pairs to keep translators for
+            timeout: Default request timeout in seconds (None = no timeout)
+            async_connection_limit: Connections shared by all async requests
+        """
+        self.timeout = timeout
+        self.async_connection_limit = async_connection_limit
+
+        # Created lazily on the event loop that first uses it
+        self._async_session = None
+        self._async_session_loop = None
+        self._async_requests = 0
+
+        # Initialize googletrans only if available (Python 3.12 and below)
+        self.translator = Translator(timeout=timeout) if GOOGLETRANS_AVAILABLE else None
+        # googletrans takes no per-call timeout; calls with one run here
+        self._googletrans_executor = None
+        self._executor_lock = threading.Lock()
+        self.name = 'googletrans' if self.translator else 'deep_translator'
+
+        # Long-lived connection pool shared by all language pairs
+        self.connection_pool = ConnectionPool(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+        self.translator_registry = TranslatorRegistry(
+            self.connection_pool,
+            max_pairs=registry_size,
+            timeout=timeout
+        )
+
+    def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Translate text with googletrans, falling back to deep-translator
+
+        The primary and the fallback share one timeout budget. A googletrans
+        call is abandoned once the budget is spent; deep-translator's timeout
+        bounds each connect and read, so its total time is best-effort.
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        try:
+            if self.translator:
+                return self._googletrans_translate(text, source_lang, target_lang, timeout)
+
+            translator = self.translator_registry.get(source_lang, target_lang)
+            return translator.translate(text, timeout=timeout)
+        except Exception as e:
+            if not self.translator:
+                # deep-translator already was the primary; let the caller retry
+                raise
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f"No time left for the fallback translator after: {e}") from e
+            logger.warning(f"Primary translator failed: {e}, trying fallback")
+            translator = self.translator_registry.get(source_lang, target_lang)
+            return translator.translate(text, timeout=remaining)
+
+    def _googletrans_translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        timeout: Optional[float]
+    ) -> str:
+        """Call googletrans, giving up after timeout seconds (the call itself is not interrupted)"""
+        if timeout is None:
+            return self.translator.translate(text, src=source_lang, dest=target_lang).text
+
+        with self._executor_lock:
+            if self._googletrans_executor is None:
+                self._googletrans_executor = ThreadPoolExecutor(thread_name_prefix='googletrans')
+        future = self._googletrans_executor.submit(
+            self.translator.translate, text, src=source_lang, dest=target_lang
+        )
+        try:
+            return future.result(timeout=max(0.0, timeout)).text
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"googletrans did not answer within {timeout:.2f}s") from None
+
+    async def atranslate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Translate text over a shared aiohttp session (deep-translator endpoint)"""
+        if not AIOHTTP_AVAILABLE:
+            return await super().atranslate(text, source_lang, target_lang, timeout)
+
+        timeout = timeout if timeout is not None else self.timeout
+        translator = self.translator_registry.get(source_lang, target_lang)
+        params = translator.build_params(text)
+        if params is None:
+            return text.strip()
+
+        session = await self._get_async_session()
+        self._async_requests += 1
+        try:
+            async with session.get(
+                translator.base_url,
+                params=params,
+                proxy=(translator.proxies or {}).get('https'),
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                html = await response.text()
+        except aiohttp.ClientConnectionError as e:
+            # Not all aiohttp connection errors are OSErrors; report them as one
+            raise ConnectionError(str(e)) from e
+        return translator.parse_response(response.status, html, text)
+
+    async def _get_async_session(self) -> "aiohttp.ClientSession":
+        """Get the shared aiohttp session, recreating it if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._async_session is not None and self._async_session_loop is not loop:
+            # Sessions are bound to the loop they were created on
+            session, old_loop = self._async_session, self._async_session_loop
+            self._async_session = None
+            if not session.closed:
+                logger.debug("Event loop changed, replacing async HTTP session")
+                if old_loop.is_closed():
+                    # Its connections can no longer be closed through the old
+                    # loop; closing the session releases them and awaits nothing
+                    await session.close()
+                else:
+                    # The old loop is still alive (e.g. in another thread)
+                    asyncio.run_coroutine_threadsafe(session.close(), old_loop)
+
+        if self._async_session is None or self._async_session.closed:
+            connector = aiohttp.TCPConnector(limit=self.async_connection_limit)
+            self._async_session = aiohttp.ClientSession(connector=connector)
+            self._async_session_loop = loop
+        return self._async_session
+
+    def detect(self, text: str) -> Tuple[str, float]:
+        """Detect language with googletrans"""
+        if not self.translator:
+            return super().detect(text)
+        detected = self.translator.detect(text)
+        return detected.lang, detected.confidence
+
+    def capabilities(self) -> Dict[str, bool]:
+        return {'detect': self.translator is not None, 'batch': False}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get connection pool statistics"""
+        stats = self.connection_pool.get_stats()
+        stats['cached_language_pairs'] = len(self.translator_registry)
+        stats['async_requests'] = self._async_requests
+        return stats
+
+    def close(self):
+        self.connection_pool.close()
+        if self._googletrans_executor is not None:
+            self._googletrans_executor.shutdown(wait=False)
+
+    async def aclose(self):
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+
+
+class FakeBackend(TranslationBackend):
+    """
+    Deterministic in-process backend for tests and load testing without network
+
+    Translations are the input prefixed with the target language, e.g. "[es] Hello".
+    Like a real service it leaves segment markers alone and "translates" the
+    text between them, e.g. "[[0]] [es] Hi [[1]] [es] there". Latency and
+    failures are simulated from a seeded random generator, so a run with the
+    same seed and call order is reproducible.
+    """
+
+    name = 'fake'
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        max_payload: int = 5000,
+        seed: Optional[int] = 0
+    ):
+        """
+        Initialize fake backend
+
+        Args:
+            latency: Simulated seconds per request
+            latency_jitter: Extra random latency, uniformly in [0, latency_jitter]
+            error_rate: Probability (0-1) that a request raises BackendError
+            max_payload: Largest accepted text in characters
+            seed: Random seed for latency and error simulation
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.max_payload = max_payload
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.error_count = 0
+
+    def _next_outcome(self) -> Tuple[float, bool]:
+        """Draw the simulated (delay, failed) outcome of the next request"""
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+        return delay, failed
+
+    def _simulate_request(self, timeout: Optional[float] = None):
+        """Sleep for the simulated latency and maybe raise a simulated error"""
+        delay, failed = self._next_outcome()
+        if timeout is not None and delay > timeout:
+            time.sleep(max(0.0, timeout))
+            raise TimeoutError(f"Simulated request timed out after {timeout:.2f}s")
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise BackendError("Simulated backend failure")
+
+    async def _asimulate_request(self, timeout: Optional[float] = None):
+        """Async version of _simulate_request() that yields to the event loop"""
+        delay, failed = self._next_outcome()
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(max(0.0, timeout))
+            raise TimeoutError(f"Simulated request timed out after {timeout:.2f}s")
+        await asyncio.sleep(delay)
+        if failed:
+            raise BackendError("Simulated backend failure")
+
+    @staticmethod
+    def _fake_translate(text: str, target_lang: str) -> str:
+        """Tag each marker-delimited segment with the target language"""
+        output = []
+        # split() alternates text pieces and captured marker numbers
+        for idx, piece in enumerate(MARKER_PATTERN.split(text)):
+            if idx % 2:
+                output.append(MARKER_TEMPLATE.format(piece))
+            elif piece.strip():
+                output.append(f"[{target_lang}] {piece.strip()}")
+        return ' '.join(output)
+
+    def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        timeout: Optional[float] = None
+    ) -> str:
+        if len(text) > self.max_payload:
+            raise BackendError(f"Payload of {len(text)} chars exceeds {self.max_payload}", transient=False)
+        self._simulate_request(timeout)
+        return self._fake_translate(text, target_lang)
+
+    async def atranslate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        timeout: Optional[float] = None
+    ) -> str:
+        if len(text) > self.max_payload:
+            raise BackendError(f"Payload of {len(text)} chars exceeds {self.max_payload}", transient=False)
+        await self._asimulate_request(timeout)
+        return self._fake_translate(text, target_lang)
+
+    def translate_many(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        timeout: Optional[float] = None
+    ) -> List[str]:
+        # One simulated round trip for the whole batch
+        self._simulate_request(timeout)
+        return [self._fake_translate(text, target_lang) for text in texts]
+
+    def capabilities(self) -> Dict[str, bool]:
+        return {'detect': False, 'batch': True}
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'requests': self.request_count, 'errors': self.error_count}
@@ -6,20 +6,26 @@ Uses spaCy, NLTK, and scikit-learn for text analysis
 
 import logging
 import re
-from typing import List, Dict, Tuple, Optional
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import Future
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Tuple, Optional, Union
 import json
 import os
 
-# NLP Libraries
-import spacy
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer, PorterStemmer
-from sklearn.feature_extraction.text import TfidfVectorizer
+from src.domain_classifier import DomainClassifier
+
+# spaCy, NLTK and scikit-learn are imported when the models are loaded
+# (see ContextAnalyzer._load_models), so importing this module stays cheap
 
 logger = logging.getLogger(__name__)
 
+# Used before the NLP models are ready
+_SIMPLE_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+_SIMPLE_TOKEN = re.compile(r"\w+|[^\w\s]")
+
 
 class ContextAnalyzer:
     """
@@ -27,28 +33,59 @@ class ContextAnalyzer:
     Includes: sentence segmentation, NER, domain detection, key term extraction
     """
     
-    def __init__(self, spacy_model: str = 'en_core_web_sm'):
+    # Entity types worth preserving during translation
+    IMPORTANT_ENTITY_TYPES = ['PERSON', 'ORG', 'GPE', 'LOC', 'PRODUCT', 'EVENT']
+    
+    # Pipeline components (by factory) each analysis task runs. Sentence
+    # boundaries come from the first available factory, in this order, so
+    # segmentation never pays for a dependency parse when a senter exists.
+    SENTENCE_FACTORIES = ('senter', 'sentencizer', 'parser')
+    ENTITY_FACTORIES = ('ner', 'entity_ruler')
+    TASKS = ('sentences', 'entities', 'full')
+    
+    def __init__(
+        self,
+        spacy_model: str = 'en_core_web_sm',
+        doc_cache_size: int = 16,
+        load_in_background: bool = False,
+        custom_dict_path: Optional[str] = None,
+        idf_model=None
+    ):
         """
         Initialize context analyzer
         
+        Models are not loaded here. By default they load on first use; with
+        load_in_background they are warmed on a background thread and
+        analyze_full_context() returns a cheap degraded analysis until ready.
+        
         Args:
             spacy_model: spaCy model to use (default: en_core_web_sm)
+            doc_cache_size: Number of recently parsed texts whose spaCy Doc is kept
+            load_in_background: Start loading models on a background thread now
+            custom_dict_path: Path to custom dictionary JSON file (its 'domains'
+                keyword lists extend domain detection)
+            idf_model: Corpus IDFModel used for key terms once trained
+                (default: fit TF-IDF on the text's own sentences)
         """
-        # Initialize spaCy
-        try:
-            self.nlp = spacy.load(spacy_model)
-            logger.info(f"Loaded spaCy model: {spacy_model}")
-        except Exception as e:
-            logger.warning(f"Could not load {spacy_model}: {e}")
-            logger.info("Creating blank English model")
-            self.nlp = spacy.blank('en')
-        
-        # Initialize NLTK components
-        self._initialize_nltk()
-        
-        # Initialize lemmatizer and stemmer
-        self.lemmatizer = WordNetLemmatizer()
-        self.stemmer = PorterStemmer()
+        self.spacy_model = spacy_model
+        self.nlp = None
+        self.stop_words = set()
+        self.idf_model = idf_model
+        
+        # Resolved once every model is loaded
+        self.ready: Future = Future()
+        self._load_lock = threading.Lock()
+        self._loading_in_background = load_in_background
+        
+        # Parsed Docs shared by every stage of an analysis
+        # (text -> (Doc, names of the pipeline components already applied))
+        self.doc_cache_size = doc_cache_size
+        self._doc_cache: "OrderedDict[str, Tuple[spacy.tokens.Doc, set]]" = OrderedDict()
+        self._doc_lock = threading.Lock()
+        self._extend_lock = threading.Lock()
+        self.parses = 0
+        self.doc_cache_hits = 0
+        self.component_runs: Dict[str, int] = {}
         
         # Domain keywords (loaded from dictionary)
         self.domain_keywords = {
@@ -62,10 +99,103 @@ class ContextAnalyzer:
                       'subsequently', 'notwithstanding']
         }
         
+        # Compiled from the keywords above, config and the custom dictionary
+        custom_dict = {}
+        if custom_dict_path and os.path.exists(custom_dict_path):
+            try:
+                with open(custom_dict_path, 'r', encoding='utf-8') as f:
+                    custom_dict = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading custom dictionary: {e}")
+        self.domain_classifier = DomainClassifier.from_sources(self.domain_keywords, custom_dict)
+        
+        if load_in_background:
+            threading.Thread(target=self._ensure_models, name='analyzer-warmup', daemon=True).start()
+        
         logger.info("Context analyzer initialized")
     
+    def _ensure_models(self):
+        """Load the NLP models once; concurrent callers wait for the first load"""
+        if self.ready.done():
+            return
+        with self._load_lock:
+            if self.ready.done():
+                return
+            try:
+                self._load_models()
+                self.ready.set_result(True)
+            except Exception as e:
+                logger.error(f"Context analyzer models failed to load: {e}")
+                self.ready.set_exception(e)
+    
+    def _load_models(self):
+        """Import the NLP libraries and load spaCy, NLTK and WordNet resources"""
+        import spacy
+        from nltk.tokenize import sent_tokenize, word_tokenize
+        from nltk.stem import WordNetLemmatizer, PorterStemmer
+        from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+        
+        # Initialize spaCy
+        try:
+            self.nlp = spacy.load(self.spacy_model)
+            logger.info(f"Loaded spaCy model: {self.spacy_model}")
+        except Exception as e:
+            logger.warning(f"Could not load {self.spacy_model}: {e}")
+            logger.info("Creating blank English model")
+            self.nlp = spacy.blank('en')
+        
+        # Initialize NLTK components
+        self._initialize_nltk()
+        
+        # Initialize lemmatizer and stemmer
+        self.lemmatizer = WordNetLemmatizer()
+        self.stemmer = PorterStemmer()
+        
+        self._sent_tokenize = sent_tokenize
+        self._word_tokenize = word_tokenize
+        self._tfidf_vectorizer = TfidfVectorizer
+        self._count_vectorizer = CountVectorizer
+        logger.info("Context analyzer models loaded")
+    
+    def is_ready(self) -> bool:
+        """Check whether the NLP models have finished loading"""
+        return self.ready.done() and self.ready.exception() is None
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the NLP models, loading them now unless a background load is running
+        
+        Args:
+            timeout: Maximum seconds to wait for a background load (None = no limit)
+            
+        Returns:
+            True if the models are ready
+        """
+        if not self._loading_in_background:
+            self._ensure_models()
+        try:
+            self.ready.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+    
+    def _require_models(self):
+        """
+        Make sure the models are loaded before a stage uses them
+        
+        Raises:
+            RuntimeError: If loading the models failed
+        """
+        if not self.ready.done():
+            self.wait_until_ready()
+        if self.ready.done() and self.ready.exception() is not None:
+            raise RuntimeError("Context analyzer models failed to load") from self.ready.exception()
+    
     def _initialize_nltk(self):
         """Download required NLTK data"""
+        import nltk
+        from nltk.corpus import stopwords
+        
         required_data = ['punkt', 'stopwords', 'wordnet', 'averaged_perceptron_tagger']
         for data in required_data:
             try:
@@ -83,6 +213,113 @@ class ContextAnalyzer:
             self.stop_words = set()
             logger.warning("Could not load stopwords")
     
+    def _components_for(self, tasks: Tuple[str, ...], enabled_only: bool = False) -> List[str]:
+        """
+        Resolve analysis tasks to the pipeline components they need
+        
+        Args:
+            tasks: Task names from TASKS
+            enabled_only: Only consider enabled components (nlp.pipe can not
+                run disabled ones)
+            
+        Returns:
+            Component names in pipeline order (disabled components such as
+            en_core_web_sm's senter included when a task needs them)
+        """
+        names = self.nlp.pipe_names if enabled_only else [name for name, _ in self.nlp.components]
+        factories = {name: self.nlp.get_pipe_meta(name).factory for name in names}
+        wanted = set()
+        for task in tasks:
+            if task == 'sentences':
+                for factory in self.SENTENCE_FACTORIES:
+                    match = [name for name, f in factories.items() if f == factory]
+                    if match:
+                        wanted.add(match[0])
+                        break
+            elif task == 'entities':
+                wanted.update(name for name, f in factories.items() if f in self.ENTITY_FACTORIES)
+            elif task == 'full':
+                wanted.update(self.nlp.pipe_names)
+            else:
+                raise ValueError(f"Unknown analysis task: {task}")
+        
+        # The parser sets sentence boundaries itself
+        if any(factories[name] == 'parser' for name in wanted):
+            wanted = {name for name in wanted if factories[name] not in ('senter', 'sentencizer')}
+        
+        # Shared embedding layers (tok2vec/transformer) the wanted components listen to
+        for name in names:
+            if wanted.intersection(getattr(self.nlp.get_pipe(name), 'listening_components', ())):
+                wanted.add(name)
+        
+        return [name for name in names if name in wanted]
+    
+    def _apply_components(self, doc: "spacy.tokens.Doc", names: List[str]) -> "spacy.tokens.Doc":
+        """Run the named pipeline components over doc in order"""
+        for name in names:
+            doc = self.nlp.get_pipe(name)(doc)
+        with self._doc_lock:
+            for name in names:
+                self.component_runs[name] = self.component_runs.get(name, 0) + 1
+        return doc
+    
+    def _parse(self, text: str, tasks: Tuple[str, ...] = ('full',)) -> "spacy.tokens.Doc":
+        """
+        Parse text with only the spaCy components the given tasks need
+        
+        A recently parsed identical text reuses its Doc; components it has not
+        been through yet are run on it instead of parsing again.
+        
+        Args:
+            text: Input text
+            tasks: Analysis tasks the Doc is needed for ('sentences', 'entities', 'full')
+            
+        Returns:
+            spaCy Doc (shared; callers must not modify it)
+        """
+        self._require_models()
+        components = self._components_for(tasks)
+        
+        with self._doc_lock:
+            entry = self._doc_cache.get(text)
+            if entry is not None:
+                self._doc_cache.move_to_end(text)
+                self.doc_cache_hits += 1
+        
+        if entry is not None:
+            doc, applied = entry
+            if any(name not in applied for name in components):
+                with self._extend_lock:
+                    missing = [name for name in components if name not in applied]
+                    doc = self._apply_components(doc, missing)
+                    applied.update(missing)
+            return doc
+        
+        doc = self._apply_components(self.nlp.make_doc(text), components)
+        
+        with self._doc_lock:
+            self.parses += 1
+            self._doc_cache[text] = (doc, set(components))
+            while len(self._doc_cache) > self.doc_cache_size:
+                self._doc_cache.popitem(last=False)
+        return doc
+    
+    def get_parse_stats(self) -> Dict[str, int]:
+        """
+        Get spaCy parsing statistics
+        
+        Returns:
+            Dictionary with parse count, Doc cache hits, cached Docs and
+            how many times each pipeline component ran
+        """
+        with self._doc_lock:
+            return {
+                'parses': self.parses,
+                'doc_cache_hits': self.doc_cache_hits,
+                'cached_docs': len(self._doc_cache),
+                'component_runs': dict(self.component_runs)
+            }
+    
     def segment_sentences(self, text: str) -> List[str]:
         """
         Segment text into sentences
@@ -94,20 +331,23 @@ class ContextAnalyzer:
             List of sentences
         """
         try:
-            # Use spaCy for sentence segmentation
-            doc = self.nlp(text)
-            sentences = [sent.text.strip() for sent in doc.sents]
-            
-            if not sentences:
-                # Fallback to NLTK
-                sentences = sent_tokenize(text)
-            
-            return sentences
+            # Use spaCy for sentence segmentation (senter only when available)
+            return self._sentences_from_doc(self._parse(text, ('sentences',)))
         except Exception as e:
             logger.error(f"Sentence segmentation error: {e}")
             # Simple fallback
             return [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
     
+    def _sentences_from_doc(self, doc: "spacy.tokens.Doc") -> List[str]:
+        """Read sentences off a parsed Doc, falling back to NLTK if it has none"""
+        sentences = [sent.text.strip() for sent in doc.sents]
+        
+        if not sentences:
+            # Fallback to NLTK
+            sentences = self._sent_tokenize(doc.text)
+        
+        return sentences
+    
     def extract_context(
         self, 
         text: str, 
@@ -127,37 +367,114 @@ class ContextAnalyzer:
         Returns:
             Dictionary with context_before, main_text, context_after
         """
-        sentences = self.segment_sentences(text)
-        
-        # Find which sentence(s) contain the selected text
-        selected_indices = []
-        for idx, sent in enumerate(sentences):
-            if selected_text.lower() in sent.lower():
-                selected_indices.append(idx)
+        return self.extract_contexts(text, [selected_text], num_sentences_before, num_sentences_after)[0]
+    
+    def extract_contexts(
+        self,
+        text: str,
+        selections: List[Union[str, Tuple[int, int]]],
+        num_sentences_before: int = 2,
+        num_sentences_after: int = 2,
+        sentences: Optional[List[str]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Extract context around many selections in one document
         
-        if not selected_indices:
-            return {
-                'context_before': '',
-                'main_text': selected_text,
-                'context_after': ''
-            }
+        The text is segmented once. Each selection is located by character
+        offset (exact match first, then ignoring case and whitespace) and
+        mapped to the sentences it overlaps, so selections spanning sentence
+        boundaries get all of their sentences. A string selected more than
+        once resolves to successive occurrences.
         
-        # Get range of sentences
-        first_idx = selected_indices[0]
-        last_idx = selected_indices[-1]
+        Args:
+            text: Full text
+            selections: Selected strings, or (start, end) character offsets in text
+            num_sentences_before: Number of sentences before to include
+            num_sentences_after: Number of sentences after to include
+            sentences: Sentences of text, if already segmented
+            
+        Returns:
+            Dictionary with context_before, main_text, context_after per
+            selection, in input order
+        """
+        if sentences is None:
+            sentences = self.segment_sentences(text)
+        starts = self._sentence_starts(text, sentences)
+        
+        # Where to resume searching for a string selected again
+        search_from: Dict[str, int] = {}
+        contexts = []
+        for selection in selections:
+            if isinstance(selection, str):
+                span = self._locate(text, selection, search_from.get(selection, 0))
+                if span is not None:
+                    search_from[selection] = span[1]
+            else:
+                span = selection
+            
+            if span is None or not starts:
+                contexts.append({
+                    'context_before': '',
+                    'main_text': selection if isinstance(selection, str) else text[selection[0]:selection[1]],
+                    'context_after': ''
+                })
+                continue
+            
+            # Sentences holding the first and last selected characters
+            first_idx = max(0, bisect_right(starts, span[0]) - 1)
+            last_idx = max(first_idx, bisect_right(starts, max(span[0], span[1] - 1)) - 1)
+            
+            start_idx = max(0, first_idx - num_sentences_before)
+            end_idx = min(len(sentences), last_idx + num_sentences_after + 1)
+            
+            contexts.append({
+                'context_before': ' '.join(sentences[start_idx:first_idx]),
+                'main_text': ' '.join(sentences[first_idx:last_idx + 1]),
+                'context_after': ' '.join(sentences[last_idx + 1:end_idx])
+            })
         
-        start_idx = max(0, first_idx - num_sentences_before)
-        end_idx = min(len(sentences), last_idx + num_sentences_after + 1)
+        return contexts
+    
+    def _sentence_starts(self, text: str, sentences: List[str]) -> List[int]:
+        """
+        Character offset in text where each sentence starts (sorted)
         
-        context_before = ' '.join(sentences[start_idx:first_idx])
-        main_text = ' '.join(sentences[first_idx:last_idx + 1])
-        context_after = ' '.join(sentences[last_idx + 1:end_idx])
+        Sentences are found in order, so a repeated sentence maps to its own
+        occurrence. A sentence that can not be found (e.g. normalized by the
+        tokenizer) starts where the previous one ended.
+        """
+        starts = []
+        position = 0
+        for sentence in sentences:
+            start = text.find(sentence, position)
+            if start == -1:
+                start = position
+            starts.append(start)
+            position = start + len(sentence)
+        return starts
+    
+    def _locate(self, text: str, selected_text: str, search_from: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        Find the character span of selected text
         
-        return {
-            'context_before': context_before,
-            'main_text': main_text,
-            'context_after': context_after
-        }
+        Args:
+            text: Full text
+            selected_text: Text to find
+            search_from: Offset to start searching at
+            
+        Returns:
+            (start, end) offsets, or None if not found
+        """
+        start = text.find(selected_text, search_from)
+        if start != -1:
+            return start, start + len(selected_text)
+        
+        words = selected_text.split()
+        if not words:
+            return None
+        pattern = r'\s+'.join(re.escape(word) for word in words)
+        match = re.compile(pattern, re.IGNORECASE).search(text, search_from)
+        return match.span() if match else None
     
     def extract_named_entities(self, text: str) -> List[Dict[str, str]]:
         """
@@ -170,22 +487,25 @@ class ContextAnalyzer:
             List of dictionaries with entity text, label, and position
         """
         try:
-            doc = self.nlp(text)
-            entities = []
-            
-            for ent in doc.ents:
-                entities.append({
-                    'text': ent.text,
-                    'label': ent.label_,
-                    'start': ent.start_char,
-                    'end': ent.end_char
-                })
-            
-            return entities
+            return self._entities_from_doc(self._parse(text, ('entities',)))
         except Exception as e:
             logger.error(f"NER extraction error: {e}")
             return []
     
+    def _entities_from_doc(self, doc: "spacy.tokens.Doc") -> List[Dict[str, str]]:
+        """List the named entities of a parsed Doc"""
+        entities = []
+        
+        for ent in doc.ents:
+            entities.append({
+                'text': ent.text,
+                'label': ent.label_,
+                'start': ent.start_char,
+                'end': ent.end_char
+            })
+        
+        return entities
+    
     def get_entity_texts(self, text: str) -> List[str]:
         """
         Get list of entity texts to preserve during translation
@@ -196,10 +516,11 @@ class ContextAnalyzer:
         Returns:
             List of entity strings
         """
-        entities = self.extract_named_entities(text)
-        # Filter for important entity types
-        important_types = ['PERSON', 'ORG', 'GPE', 'LOC', 'PRODUCT', 'EVENT']
-        return [ent['text'] for ent in entities if ent['label'] in important_types]
+        return self._important_entity_texts(self.extract_named_entities(text))
+    
+    def _important_entity_texts(self, entities: List[Dict[str, str]]) -> List[str]:
+        """Filter extracted entities down to the texts of important entity types"""
+        return [ent['text'] for ent in entities if ent['label'] in self.IMPORTANT_ENTITY_TYPES]
     
     def tokenize_and_preprocess(self, text: str) -> Dict[str, any]:
         """
@@ -211,8 +532,10 @@ class ContextAnalyzer:
         Returns:
             Dictionary with various tokenization and preprocessing results
         """
+        self._require_models()
+        
         # Word tokenization
-        words = word_tokenize(text.lower())
+        words = self._word_tokenize(text.lower())
         
         # Remove stopwords
         filtered_words = [w for w in words if w not in self.stop_words and w.isalnum()]
@@ -242,16 +565,7 @@ class ContextAnalyzer:
         Returns:
             Dictionary with domain scores
         """
-        text_lower = text.lower()
-        words = set(word_tokenize(text_lower))
-        
-        scores = {}
-        for domain, keywords in self.domain_keywords.items():
-            matching_keywords = words.intersection(set(keywords))
-            score = len(matching_keywords) / len(keywords) if keywords else 0
-            scores[domain] = score
-        
-        return scores
+        return self.domain_classifier.score(text)
     
     def get_primary_domain(self, text: str) -> str:
         """
@@ -263,39 +577,52 @@ class ContextAnalyzer:
         Returns:
             Domain name (technical/casual/formal/general)
         """
-        scores = self.detect_domain(text)
-        
+        return self._primary_domain(self.detect_domain(text))
+    
+    def _primary_domain(self, scores: Dict[str, float]) -> str:
+        """Pick the highest-scoring domain, or 'general' if nothing matched"""
         if not scores or max(scores.values()) == 0:
             return 'general'
         
         return max(scores, key=scores.get)
     
-    def extract_key_terms(self, text: str, top_n: int = 5) -> List[Tuple[str, float]]:
+    def extract_key_terms(
+        self,
+        text: str,
+        top_n: int = 5,
+        sentences: Optional[List[str]] = None,
+        preprocessing: Optional[Dict[str, any]] = None
+    ) -> List[Tuple[str, float]]:
         """
         Extract key terms using TF-IDF
         
+        With a trained corpus IDF model the text is scored in one transform;
+        otherwise a vectorizer is fitted on the text's own sentences.
+        
         Args:
             text: Input text
             top_n: Number of top terms to return
+            sentences: Sentences of text, if already segmented
+            preprocessing: tokenize_and_preprocess() output for text, if already computed
             
         Returns:
             List of (term, score) tuples
         """
         try:
+            if self._idf_model_ready():
+                return self.idf_model.key_terms(text, top_n)
+            
             # Need at least 2 documents for TF-IDF
-            sentences = self.segment_sentences(text)
+            if sentences is None:
+                sentences = self.segment_sentences(text)
             
             if len(sentences) < 2:
                 # Fallback: return most frequent non-stopword tokens
-                tokens = self.tokenize_and_preprocess(text)
-                word_freq = {}
-                for word in tokens['filtered_tokens']:
-                    word_freq[word] = word_freq.get(word, 0) + 1
-                sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-                return sorted_words[:top_n]
+                return self._frequent_terms(preprocessing or self.tokenize_and_preprocess(text), top_n)
             
             # TF-IDF vectorization
-            vectorizer = TfidfVectorizer(max_features=top_n, stop_words='english')
+            self._require_models()
+            vectorizer = self._tfidf_vectorizer(max_features=top_n, stop_words='english')
             tfidf_matrix = vectorizer.fit_transform(sentences)
             
             # Get feature names and scores
@@ -311,6 +638,88 @@ class ContextAnalyzer:
             logger.error(f"Key term extraction error: {e}")
             return []
     
+    def _idf_model_ready(self) -> bool:
+        """Check whether key terms should come from the corpus IDF model"""
+        return self.idf_model is not None and self.idf_model.is_trained()
+    
+    def _frequent_terms(self, preprocessing: Dict[str, any], top_n: int) -> List[Tuple[str, int]]:
+        """Most frequent filtered tokens, used when there are too few sentences for TF-IDF"""
+        word_freq = {}
+        for word in preprocessing['filtered_tokens']:
+            word_freq[word] = word_freq.get(word, 0) + 1
+        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+        return sorted_words[:top_n]
+    
+    def _batch_key_terms(
+        self,
+        sentence_lists: List[List[str]],
+        preprocessings: List[Dict[str, any]],
+        top_n: int = 5
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        extract_key_terms() for many texts with one vectorizer pass
+        
+        Every text's sentences are counted by a single CountVectorizer; each
+        text's rows are then weighted exactly as TfidfVectorizer(max_features=
+        top_n) would weight that text on its own.
+        
+        Args:
+            sentence_lists: Sentences of each text
+            preprocessings: tokenize_and_preprocess() output of each text
+            top_n: Number of top terms per text
+            
+        Returns:
+            Key terms of each text, in input order
+        """
+        import numpy as np
+        
+        results = [
+            self._frequent_terms(preprocessing, top_n) if len(sentences) < 2 else []
+            for sentences, preprocessing in zip(sentence_lists, preprocessings)
+        ]
+        tfidf_texts = [i for i, sentences in enumerate(sentence_lists) if len(sentences) >= 2]
+        if not tfidf_texts:
+            return results
+        
+        try:
+            vectorizer = self._count_vectorizer(stop_words='english')
+            counts = vectorizer.fit_transform(
+                [sentence for i in tfidf_texts for sentence in sentence_lists[i]]
+            ).tocsr()
+        except ValueError as e:
+            # Every sentence in the batch was stopwords only
+            logger.error(f"Key term extraction error: {e}")
+            return results
+        feature_names = vectorizer.get_feature_names_out()
+        
+        row = 0
+        for i in tfidf_texts:
+            num_rows = len(sentence_lists[i])
+            text_counts = counts[row:row + num_rows]
+            row += num_rows
+            
+            # max_features: keep the top_n most frequent terms of this text,
+            # breaking ties the way TfidfVectorizer does
+            term_freq = np.asarray(text_counts.sum(axis=0)).ravel()
+            present = np.flatnonzero(term_freq)
+            kept = np.sort(present[(-term_freq[present]).argsort()[:top_n]])
+            if not len(kept):
+                continue
+            
+            # Smoothed IDF and L2-normalized rows, as TfidfVectorizer computes them
+            tf = text_counts[:, kept].toarray().astype(float)
+            idf = np.log((1 + num_rows) / (1 + (tf > 0).sum(axis=0))) + 1
+            tfidf = tf * idf
+            norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            scores = (tfidf / norms).sum(axis=0)
+            
+            term_scores = list(zip(feature_names[kept], scores))
+            term_scores.sort(key=lambda x: x[1], reverse=True)
+            results[i] = term_scores[:top_n]
+        
+        return results
+    
     def analyze_full_context(self, text: str, selected_text: Optional[str] = None) -> Dict[str, any]:
         """
         Perform complete context analysis
@@ -322,9 +731,24 @@ class ContextAnalyzer:
         Returns:
             Comprehensive analysis dictionary
         """
+        if not self._loading_in_background:
+            self._ensure_models()
+        if not self.is_ready():
+            # Still warming up, or the load failed (already logged once)
+            return self._degraded_analysis(text, selected_text)
+        
+        # Parse once with the components both spaCy stages need; they reuse the Doc
+        try:
+            self._parse(text, ('sentences', 'entities'))
+        except Exception as e:
+            logger.error(f"Parsing error: {e}")
+        
+        # Sentence segmentation
+        sentences = self.segment_sentences(text)
+        
         # Extract context if selected text provided
         if selected_text:
-            context = self.extract_context(text, selected_text)
+            context = self.extract_contexts(text, [selected_text], sentences=sentences)[0]
         else:
             context = {
                 'context_before': '',
@@ -334,20 +758,17 @@ class ContextAnalyzer:
         
         # Named entities
         entities = self.extract_named_entities(text)
-        entity_texts = self.get_entity_texts(text)
+        entity_texts = self._important_entity_texts(entities)
         
         # Preprocessing
         preprocessing = self.tokenize_and_preprocess(text)
         
         # Domain detection
         domain_scores = self.detect_domain(text)
-        primary_domain = self.get_primary_domain(text)
+        primary_domain = self._primary_domain(domain_scores)
         
         # Key terms
-        key_terms = self.extract_key_terms(text)
-        
-        # Sentence segmentation
-        sentences = self.segment_sentences(text)
+        key_terms = self.extract_key_terms(text, sentences=sentences, preprocessing=preprocessing)
         
         return {
             'context': context,
@@ -360,6 +781,163 @@ class ContextAnalyzer:
             'sentences': sentences,
             'num_sentences': len(sentences)
         }
+    
+    def analyze_many(
+        self,
+        texts: Iterable[str],
+        batch_size: int = 64,
+        n_process: int = 1
+    ) -> Iterator[Dict[str, any]]:
+        """
+        Analyze many texts, streaming them through spaCy in batches
+        
+        Yields the same dictionary analyze_full_context() returns for each
+        text, in input order. Only one batch of Docs and results is held at a
+        time, so memory stays flat for large document sets. With n_process > 1
+        the spaCy stage runs in worker processes (call from under
+        ``if __name__ == '__main__':`` on platforms that spawn processes) and
+        sentence boundaries come from the enabled pipeline, since disabled
+        components such as senter are not available to nlp.pipe.
+        
+        Args:
+            texts: Texts to analyze
+            batch_size: Texts per spaCy and TF-IDF batch
+            n_process: spaCy worker processes (-1 = one per CPU core)
+            
+        Yields:
+            Analysis dictionary per text
+        """
+        self._require_models()
+        docs = self._pipe_docs(texts, batch_size, n_process)
+        
+        while True:
+            batch = list(islice(docs, batch_size))
+            if not batch:
+                break
+            
+            sentence_lists = []
+            entity_lists = []
+            for doc in batch:
+                try:
+                    sentence_lists.append(self._sentences_from_doc(doc))
+                except Exception as e:
+                    logger.error(f"Sentence segmentation error: {e}")
+                    sentence_lists.append([s.strip() for s in re.split(r'[.!?]+', doc.text) if s.strip()])
+                entity_lists.append(self._entities_from_doc(doc))
+            
+            preprocessings = [self.tokenize_and_preprocess(doc.text) for doc in batch]
+            if self._idf_model_ready():
+                key_term_lists = [self.idf_model.key_terms(doc.text) for doc in batch]
+            else:
+                key_term_lists = self._batch_key_terms(sentence_lists, preprocessings)
+            # Score the raw text so the keyword tokens match detect_domain()
+            domain_score_lists = self.domain_classifier.score_batch([doc.text for doc in batch])
+            
+            for doc, sentences, entities, preprocessing, key_terms, domain_scores in zip(
+                batch, sentence_lists, entity_lists, preprocessings, key_term_lists, domain_score_lists
+            ):
+                yield {
+                    'context': {
+                        'context_before': '',
+                        'main_text': doc.text,
+                        'context_after': ''
+                    },
+                    'entities': entities,
+                    'entity_texts': self._important_entity_texts(entities),
+                    'preprocessing': preprocessing,
+                    'domain_scores': domain_scores,
+                    'primary_domain': self._primary_domain(domain_scores),
+                    'key_terms': key_terms,
+                    'sentences': sentences,
+                    'num_sentences': len(sentences)
+                }
+    
+    def _pipe_docs(self, texts: Iterable[str], batch_size: int, n_process: int) -> Iterator["spacy.tokens.Doc"]:
+        """Stream texts through the components needed for sentences and entities"""
+        tasks = ('sentences', 'entities')
+        
+        if n_process != 1:
+            components = self._components_for(tasks, enabled_only=True)
+            disable = [name for name in self.nlp.pipe_names if name not in components]
+            docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disable)
+        else:
+            # Chain the components' own batched pipe() methods, as nlp.pipe
+            # does, so disabled components like senter can be used
+            components = self._components_for(tasks)
+            docs = (self.nlp.make_doc(text) for text in texts)
+            for name in components:
+                component = self.nlp.get_pipe(name)
+                if hasattr(component, 'pipe'):
+                    docs = component.pipe(docs, batch_size=batch_size)
+                else:
+                    docs = map(component, docs)
+        
+        for doc in docs:
+            with self._doc_lock:
+                self.parses += 1
+                for name in components:
+                    self.component_runs[name] = self.component_runs.get(name, 0) + 1
+            yield doc
+    
+    def _degraded_analysis(self, text: str, selected_text: Optional[str] = None) -> Dict[str, any]:
+        """
+        Cheap analysis used while the models are still loading, or if they failed to load
+        
+        Splits sentences and tokens with regular expressions and skips NER,
+        stopword removal and lemmatization. The result has the same keys as
+        analyze_full_context() plus 'degraded': True.
+        
+        Args:
+            text: Full text to analyze
+            selected_text: Optional selected portion
+            
+        Returns:
+            Analysis dictionary
+        """
+        sentences = [s.strip() for s in _SIMPLE_SENTENCE_END.split(text) if s.strip()]
+        
+        if selected_text:
+            context = self.extract_contexts(text, [selected_text], sentences=sentences)[0]
+        else:
+            context = {
+                'context_before': '',
+                'main_text': text,
+                'context_after': ''
+            }
+        
+        words = _SIMPLE_TOKEN.findall(text.lower())
+        filtered_words = [w for w in words if w.isalnum()]
+        preprocessing = {
+            'original_tokens': words,
+            'filtered_tokens': filtered_words,
+            'lemmatized': filtered_words,
+            'stemmed': filtered_words,
+            'num_tokens': len(words),
+            'num_unique_tokens': len(set(words))
+        }
+        
+        domain_scores = self.domain_classifier.score_tokens(words)
+        
+        word_freq = {}
+        for word in filtered_words:
+            word_freq[word] = word_freq.get(word, 0) + 1
+        if self._idf_model_ready():
+            key_terms = self.idf_model.key_terms(text)
+        else:
+            key_terms = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:5]
+        
+        return {
+            'context': context,
+            'entities': [],
+            'entity_texts': [],
+            'preprocessing': preprocessing,
+            'domain_scores': domain_scores,
+            'primary_domain': self._primary_domain(domain_scores),
+            'key_terms': key_terms,
+            'sentences': sentences,
+            'num_sentences': len(sentences),
+            'degraded': True
+        }
 
 
 # Example usage and testing
@@ -0,0 +1,237 @@
+"""
+Domain Classifier Module
+Scores text against per-domain keyword lists (technical/casual/formal/...)
+Keywords, including multi-word phrases, are compiled once into a token index
+"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import config
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+
+# Keyword lists from config, merged with every other source
+CONFIG_KEYWORDS = {
+    'technical': config.TECHNICAL_KEYWORDS,
+    'casual': config.CASUAL_KEYWORDS,
+    'formal': config.FORMAL_KEYWORDS
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, as matched against the keyword index"""
+    return _TOKEN.findall(text.lower())
+
+
+class DomainClassifier:
+    """
+    Keyword-based domain scorer compiled into a token index
+
+    A domain's score is the share of its distinct keywords found in the text.
+    """
+
+    def __init__(self, domain_keywords: Dict[str, Iterable[str]]):
+        """
+        Initialize domain classifier
+
+        Args:
+            domain_keywords: Domain name -> keywords (single words or phrases)
+        """
+        self.domains: List[str] = list(domain_keywords)
+
+        # Distinct keywords as token tuples; ids index the scoring matrix rows
+        self.keywords: List[tuple] = []
+        keyword_ids: Dict[tuple, int] = {}
+        # keyword id -> indices of the domains listing it
+        self._keyword_domains: List[List[int]] = []
+        domain_sizes = [0] * len(self.domains)
+
+        for d, domain in enumerate(self.domains):
+            seen = set()
+            for keyword in domain_keywords[domain]:
+                tokens = tuple(tokenize(keyword))
+                if not tokens or tokens in seen:
+                    continue
+                seen.add(tokens)
+                if tokens not in keyword_ids:
+                    keyword_ids[tokens] = len(self.keywords)
+                    self.keywords.append(tokens)
+                    self._keyword_domains.append([])
+                self._keyword_domains[keyword_ids[tokens]].append(d)
+            domain_sizes[d] = len(seen)
+
+        self._weights = [1.0 / size if size else 0.0 for size in domain_sizes]
+
+        # First token -> [(remaining tokens, keyword id)], longest phrase first
+        self._index: Dict[str, List[tuple]] = {}
+        for tokens, keyword_id in keyword_ids.items():
+            self._index.setdefault(tokens[0], []).append((tokens[1:], keyword_id))
+        for candidates in self._index.values():
+            candidates.sort(key=lambda c: len(c[0]), reverse=True)
+
+        self._matrix = None
+
+        logger.info(f"Domain classifier compiled: {len(self.keywords)} keywords in {len(self.domains)} domains")
+
+    @classmethod
+    def from_sources(
+        cls,
+        base_keywords: Optional[Dict[str, Iterable[str]]] = None,
+        custom_dict: Optional[Dict] = None
+    ) -> 'DomainClassifier':
+        """
+        Build a classifier from every keyword source
+
+        Args:
+            base_keywords: Built-in domain keywords (e.g. ContextAnalyzer.domain_keywords)
+            custom_dict: Parsed custom dictionary JSON; its 'domains' block is merged in
+
+        Returns:
+            DomainClassifier over the union of the sources' keywords
+        """
+        merged: Dict[str, List[str]] = {}
+        sources = [base_keywords or {}, CONFIG_KEYWORDS, (custom_dict or {}).get('domains', {})]
+        for source in sources:
+            for domain, keywords in source.items():
+                if isinstance(keywords, (list, tuple)):
+                    merged.setdefault(domain, []).extend(keywords)
+        return cls(merged)
+
+    def match(self, tokens: Sequence[str]) -> set:
+        """
+        Find the keywords present in a token sequence in one pass
+
+        Args:
+            tokens: Lowercase tokens
+
+        Returns:
+            Set of matched keyword ids
+        """
+        matched = set()
+        num_tokens = len(tokens)
+        for i, token in enumerate(tokens):
+            for rest, keyword_id in self._index.get(token, ()):
+                end = i + 1 + len(rest)
+                if end <= num_tokens and tuple(tokens[i + 1:end]) == rest:
+                    matched.add(keyword_id)
+        return matched
+
+    def score_tokens(self, tokens: Sequence[str]) -> Dict[str, float]:
+        """
+        Score already tokenized, lowercase text
+
+        Args:
+            tokens: Lowercase tokens
+
+        Returns:
+            Dictionary with domain scores
+        """
+        scores = [0.0] * len(self.domains)
+        for keyword_id in self.match(tokens):
+            for d in self._keyword_domains[keyword_id]:
+                scores[d] += self._weights[d]
+        return dict(zip(self.domains, scores))
+
+    def score(self, text: str) -> Dict[str, float]:
+        """
+        Score text against every domain
+
+        Args:
+            text: Input text
+
+        Returns:
+            Dictionary with domain scores
+        """
+        return self.score_tokens(tokenize(text))
+
+    def score_matrix(self, texts: Iterable[Union[str, Sequence[str]]]):
+        """
+        Score a batch of texts as one sparse matrix product
+
+        Args:
+            texts: Texts, or lowercase token sequences
+
+        Returns:
+            numpy array of shape (len(texts), len(self.domains))
+        """
+        import numpy as np
+        from scipy import sparse
+
+        # Build the (texts x keywords) presence matrix directly in CSR form
+        indptr, indices = [0], []
+        for text in texts:
+            indices.extend(self.match(tokenize(text) if isinstance(text, str) else text))
+            indptr.append(len(indices))
+
+        presence = sparse.csr_matrix(
+            (np.ones(len(indices)), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+            shape=(len(indptr) - 1, len(self.keywords))
+        )
+        return (presence @ self._keyword_matrix()).toarray()
+
+    def _keyword_matrix(self):
+        """Sparse (keywords x domains) matrix of per-domain keyword weights"""
+        if self._matrix is None:
+            from scipy import sparse
+
+            rows, cols, values = [], [], []
+            for keyword_id, domains in enumerate(self._keyword_domains):
+                for d in domains:
+                    rows.append(keyword_id)
+                    cols.append(d)
+                    values.append(self._weights[d])
+            self._matrix = sparse.csr_matrix(
+                (values, (rows, cols)),
+                shape=(len(self.keywords), len(self.domains))
+            )
+        return self._matrix
+
+    def score_batch(self, texts: Iterable[Union[str, Sequence[str]]]) -> List[Dict[str, float]]:
+        """
+        Score a batch of texts
+
+        Args:
+            texts: Texts, or lowercase token sequences
+
+        Returns:
+            Dictionary with domain scores per text, in input order
+        """
+        return [dict(zip(self.domains, row.tolist())) for row in self.score_matrix(texts)]
+
+    def classify(self, text: str) -> str:
+        """
+        Get the primary domain of a text
+
+        Args:
+            text: Input text
+
+        Returns:
+            Highest-scoring domain, or 'general' if no keyword matched
+        """
+        scores = self.score(text)
+        if not scores or max(scores.values()) == 0:
+            return 'general'
+        return max(scores, key=scores.get)
+
+    def classify_batch(self, texts: Iterable[Union[str, Sequence[str]]]) -> List[str]:
+        """
+        Get the primary domain of each text in a batch
+
+        Args:
+            texts: Texts, or lowercase token sequences
+
+        Returns:
+            Domain per text ('general' where no keyword matched), in input order
+        """
+        matrix = self.score_matrix(texts)
+        if not self.domains:
+            return ['general'] * len(matrix)
+        best = matrix.argmax(axis=1)
+        return [
+            self.domains[d] if matrix[i, d] > 0 else 'general'
+            for i, d in enumerate(best.tolist())
+        ]
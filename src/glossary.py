@@ -0,0 +1,106 @@
+"""
+Glossary Module
+Enforces custom dictionary terminology during translation
+Terms from 'technical_terms' and 'user_defined' are compiled per target language
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.placeholders import PlaceholderMasker, get_masker
+
+logger = logging.getLogger(__name__)
+
+# Punctuation ignored when a whole selection is looked up as a single term
+_EDGE_PUNCTUATION = re.compile(r'^[\s"\'“”‘’(\[]+|[\s"\'“”‘’)\].,;:!?]+$')
+
+
+def normalize_term(term: str) -> str:
+    """Lowercase and collapse whitespace so glossary lookups ignore formatting"""
+    return ' '.join(term.lower().split())
+
+
+class Glossary:
+    """
+    Per-target-language terminology compiled into placeholder maskers
+    """
+
+    # Sections of the custom dictionary holding {term: {lang: translation}}
+    TERM_SECTIONS = ('technical_terms', 'user_defined')
+
+    def __init__(self, custom_dict: Optional[Dict] = None, source_lang: str = 'en'):
+        """
+        Initialize glossary
+
+        Args:
+            custom_dict: Parsed custom dictionary JSON
+            source_lang: Language the glossary terms are written in
+        """
+        self.source_lang = source_lang
+
+        # target_lang -> {normalized_term: translation}
+        self._terms: Dict[str, Dict[str, str]] = {}
+        for section in self.TERM_SECTIONS:
+            # Later sections (user_defined) override earlier ones
+            for term, translations in (custom_dict or {}).get(section, {}).items():
+                if not isinstance(translations, dict):
+                    continue
+                for lang, translation in translations.items():
+                    if term.strip() and translation:
+                        self._terms.setdefault(lang, {})[normalize_term(term)] = translation
+
+        # Compile once per target language; entity sets are combined on demand
+        self._items: Dict[str, Tuple[Tuple[str, str], ...]] = {
+            lang: tuple(sorted(terms.items())) for lang, terms in self._terms.items()
+        }
+        self._maskers: Dict[str, PlaceholderMasker] = {
+            lang: PlaceholderMasker([], dict(items)) for lang, items in self._items.items()
+        }
+
+        if self._terms:
+            logger.info(f"Glossary compiled for {len(self._terms)} target languages")
+
+    def applies_to(self, source_lang: Optional[str], target_lang: str) -> bool:
+        """Check whether glossary terms exist for this language pair"""
+        return source_lang in (None, self.source_lang) and target_lang in self._terms
+
+    def lookup(self, text: str, source_lang: Optional[str], target_lang: str) -> Optional[str]:
+        """
+        Translate text directly if the whole selection is a glossary term
+
+        Args:
+            text: Selected text
+            source_lang: Source language code (None = unknown)
+            target_lang: Target language code
+
+        Returns:
+            Glossary translation, or None if text is not exactly a term
+        """
+        if not self.applies_to(source_lang, target_lang):
+            return None
+        term = normalize_term(_EDGE_PUNCTUATION.sub('', text))
+        return self._terms[target_lang].get(term)
+
+    def get_masker(self, target_lang: Optional[str], entities: Sequence[str] = ()) -> PlaceholderMasker:
+        """
+        Get the masker protecting glossary terms (and optional entities)
+
+        Args:
+            target_lang: Target language code (None = entities only, no glossary)
+            entities: Additional terms to preserve unchanged
+
+        Returns:
+            Compiled PlaceholderMasker
+        """
+        if not entities and target_lang in self._maskers:
+            return self._maskers[target_lang]
+        return get_masker(entities, self._items.get(target_lang, ()))
+
+    def get_terms(self, target_lang: str) -> Dict[str, str]:
+        """Get the {term: translation} mapping for a target language"""
+        return dict(self._terms.get(target_lang, {}))
+
+    def languages(self) -> List[str]:
+        """Get target languages that have glossary terms"""
+        return sorted(self._terms)
@@ -0,0 +1,270 @@
+"""
+HTTP Connection Pool Module
+Keeps long-lived, keep-alive HTTP connections shared by all translation requests
+Reuses per-language-pair translator objects instead of rebuilding them on every call
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+from deep_translator import GoogleTranslator
+from deep_translator.exceptions import RequestError, TranslationNotFound
+from deep_translator.validate import is_empty, is_input_valid, request_failed
+
+logger = logging.getLogger(__name__)
+
+# Engine language codes that Google Translate spells differently
+BACKEND_LANGUAGE_CODES = {
+    'zh-cn': 'zh-CN',
+    'zh-tw': 'zh-TW',
+}
+
+
+class HTTPStatusError(RequestError):
+    """Non-2xx response; carries the status so 429/5xx can be told apart from client errors"""
+
+    def __init__(self, status: int):
+        super().__init__(f"Translation request failed with HTTP {status}")
+        self.status = status
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTP connections shared by all language pairs
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20):
+        """
+        Initialize connection pool
+
+        Args:
+            pool_connections: Number of distinct hosts to keep pools for
+            pool_maxsize: Maximum number of connections kept open per host
+        """
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+        logger.info(f"Connection pool initialized (maxsize per host: {pool_maxsize})")
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request over a pooled connection
+
+        Args:
+            url: Request URL
+            **kwargs: Extra arguments passed to requests (params, timeout, proxies)
+
+        Returns:
+            HTTP response
+        """
+        return self.session.get(url, **kwargs)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get connection reuse statistics
+
+        Returns:
+            Dictionary with request, new connection and reused connection counts
+        """
+        total_requests = 0
+        new_connections = 0
+
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            host_pool = pools.get(key)
+            if host_pool is None:
+                continue
+            total_requests += host_pool.num_requests
+            new_connections += host_pool.num_connections
+
+        return {
+            'requests': total_requests,
+            'new_connections': new_connections,
+            'reused_connections': max(0, total_requests - new_connections)
+        }
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+class PooledGoogleTranslator(GoogleTranslator):
+    """
+    GoogleTranslator that sends requests over a shared connection pool
+
+    Unlike the base class, translate() keeps no per-call state on the instance,
+    so a single object can safely serve concurrent requests for its language pair.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        target: str,
+        pool: ConnectionPool,
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize pooled translator
+
+        Args:
+            source: Source language code
+            target: Target language code
+            pool: Shared connection pool
+            timeout: Request timeout in seconds (None = no timeout)
+        """
+        super().__init__(source=source, target=target)
+        self.pool = pool
+        self.timeout = timeout
+
+    @property
+    def base_url(self) -> str:
+        """Endpoint queried with build_params() (shared by the async client)"""
+        return self._base_url
+
+    def translate(self, text: str, **kwargs) -> str:
+        """
+        Translate text using a pooled connection
+
+        Args:
+            text: Text to translate
+
+        Returns:
+            Translated text
+        """
+        params = self.build_params(text)
+        if params is None:
+            return text.strip()
+
+        response = self.pool.get(
+            self.base_url,
+            params=params,
+            proxies=self.proxies,
+            timeout=kwargs.get('timeout', self.timeout)
+        )
+        try:
+            return self.parse_response(response.status_code, response.text, text)
+        finally:
+            response.close()
+
+    def build_params(self, text: str) -> Optional[Dict[str, str]]:
+        """
+        Build request query parameters for text
+
+        Args:
+            text: Text to translate
+
+        Returns:
+            Query parameters, or None if there is nothing to send
+        """
+        if not is_input_valid(text, max_chars=5000):
+            return None
+
+        text = text.strip()
+        if self._same_source_target() or is_empty(text):
+            return None
+
+        params = dict(self._url_params)
+        params['tl'] = self._target
+        params['sl'] = self._source
+        params[self.payload_key] = text
+        return params
+
+    def parse_response(self, status_code: int, html: str, text: str) -> str:
+        """
+        Extract the translation from a Google Translate response page
+
+        Args:
+            status_code: HTTP status code
+            html: Response body
+            text: Text that was translated (for error messages)
+
+        Returns:
+            Translated text
+        """
+        if status_code == 429 or request_failed(status_code=status_code):
+            raise HTTPStatusError(status_code)
+
+        soup = BeautifulSoup(html, 'html.parser')
+        element = soup.find(self._element_tag, self._element_query)
+        if not element:
+            element = soup.find(self._element_tag, self._alt_element_query)
+            if not element:
+                raise TranslationNotFound(text)
+
+        return element.get_text(strip=True)
+
+
+class TranslatorRegistry:
+    """
+    Small LRU registry of per-language-pair translators sharing one connection pool
+    """
+
+    def __init__(self, pool: ConnectionPool, max_pairs: int = 32, timeout: Optional[float] = None):
+        """
+        Initialize translator registry
+
+        Args:
+            pool: Shared connection pool
+            max_pairs: Maximum number of language pairs to keep translators for
+            timeout: Request timeout passed to created translators
+        """
+        self.pool = pool
+        self.max_pairs = max_pairs
+        self.timeout = timeout
+        self._translators: "OrderedDict[Tuple[str, str], PooledGoogleTranslator]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source_lang: str, target_lang: str) -> PooledGoogleTranslator:
+        """
+        Get (or create) the translator for a language pair
+
+        Args:
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            Pooled translator for the pair
+
+        Raises:
+            LanguageNotSupportedException: If Google does not support a language
+        """
+        source_lang = BACKEND_LANGUAGE_CODES.get(source_lang, source_lang)
+        target_lang = BACKEND_LANGUAGE_CODES.get(target_lang, target_lang)
+        key = (source_lang, target_lang)
+        with self._lock:
+            translator = self._translators.get(key)
+            if translator is not None:
+                self._translators.move_to_end(key)
+                return translator
+
+        # Build outside the lock; language validation is cheap but not free
+        translator = PooledGoogleTranslator(
+            source=source_lang,
+            target=target_lang,
+            pool=self.pool,
+            timeout=self.timeout
+        )
+
+        with self._lock:
+            existing = self._translators.get(key)
+            if existing is not None:
+                return existing
+            self._translators[key] = translator
+            while len(self._translators) > self.max_pairs:
+                self._translators.popitem(last=False)
+
+        return translator
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._translators)
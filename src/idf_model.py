@@ -0,0 +1,271 @@
+"""
+IDF Model Module
+Corpus-level document frequencies for key term scoring, built incrementally
+from the texts stored in translation memory and saved as a memory-mappable array
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Same tokens as scikit-learn's default TfidfVectorizer analyzer
+_TOKEN = re.compile(r"(?u)\b\w\w+\b")
+
+_stop_words = None
+
+
+def _english_stop_words() -> frozenset:
+    """scikit-learn's English stopword list (imported on first use)"""
+    global _stop_words
+    if _stop_words is None:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        _stop_words = ENGLISH_STOP_WORDS
+    return _stop_words
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without English stopwords"""
+    stop_words = _english_stop_words()
+    return [token for token in _TOKEN.findall(text.lower()) if token not in stop_words]
+
+
+class _Snapshot(NamedTuple):
+    """Model state, replaced as a whole so readers never mix two versions"""
+    vocabulary: Dict[str, int]
+    doc_freq: np.ndarray
+    num_documents: int
+    last_row_id: int
+
+
+class IDFModel:
+    """
+    Document frequency counts over a growing corpus
+
+    Stored as two files: ``<path>.npy`` holds the document frequency of each
+    term (uint32, loaded with mmap_mode='r') and ``<path>.json`` holds the
+    vocabulary in index order, the document count and the last translation
+    memory row consumed.
+    """
+
+    def __init__(self, path: Optional[str] = None, min_documents: int = 50):
+        """
+        Initialize IDF model, loading it from path if saved before
+
+        Args:
+            path: File path without extension (None = in-memory only)
+            min_documents: Documents needed before the model is used for scoring
+        """
+        self.path = path
+        self.min_documents = min_documents
+        # Serializes writers; readers take one reference to the current snapshot
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+
+        # Never mutated: each update builds a new snapshot and swaps it in
+        # with a single assignment
+        self._state = _Snapshot({}, np.zeros(0, dtype=np.uint32), 0, 0)
+
+        if path and os.path.exists(path + '.npy') and os.path.exists(path + '.json'):
+            self.load()
+
+    @property
+    def num_documents(self) -> int:
+        """Number of documents counted"""
+        return self._state.num_documents
+
+    @property
+    def last_row_id(self) -> int:
+        """Last translation memory row consumed"""
+        return self._state.last_row_id
+
+    def is_trained(self) -> bool:
+        """Check whether enough documents have been seen to score with the model"""
+        return self._state.num_documents >= self.min_documents
+
+    def add_documents(self, texts: Sequence[str]):
+        """
+        Count the terms of new documents
+
+        Args:
+            texts: Document texts
+        """
+        self._add_documents(texts)
+
+    def _add_documents(self, texts: Sequence[str], last_row_id: Optional[int] = None):
+        """Count texts and swap in the new snapshot, optionally advancing last_row_id"""
+        if not texts:
+            return
+
+        with self._lock:
+            state = self._state
+            vocabulary = dict(state.vocabulary)
+            counts = Counter()
+            for text in texts:
+                counts.update(set(tokenize(text)))
+
+            for term in counts:
+                if term not in vocabulary:
+                    vocabulary[term] = len(vocabulary)
+
+            doc_freq = np.zeros(len(vocabulary), dtype=np.uint32)
+            doc_freq[:len(state.doc_freq)] = state.doc_freq
+            indices = np.fromiter((vocabulary[term] for term in counts), dtype=np.int64, count=len(counts))
+            doc_freq[indices] += np.fromiter(counts.values(), dtype=np.uint32, count=len(counts))
+
+            self._state = _Snapshot(
+                vocabulary,
+                doc_freq,
+                state.num_documents + len(texts),
+                state.last_row_id if last_row_id is None else last_row_id
+            )
+
+    def update_from_memory(self, memory, batch_size: int = 1000) -> int:
+        """
+        Add the texts stored in translation memory since the last update
+
+        Args:
+            memory: TranslationMemory to read from
+            batch_size: Rows read per query
+
+        Returns:
+            Number of documents added
+        """
+        added = 0
+        with self._update_lock:
+            while True:
+                rows = memory.get_source_texts(after_id=self.last_row_id, limit=batch_size)
+                if not rows:
+                    break
+                self._add_documents([text for _, text in rows], last_row_id=rows[-1][0])
+                added += len(rows)
+
+        if added:
+            logger.info(f"IDF model updated with {added} documents ({self.num_documents} total)")
+        return added
+
+    def idf(self, terms: Sequence[str]):
+        """
+        Smoothed inverse document frequencies, as TfidfVectorizer computes them
+
+        Args:
+            terms: Terms to look up (unseen terms get the highest IDF)
+
+        Returns:
+            numpy array of IDF values
+        """
+        vocabulary, doc_freq, num_documents, _ = self._state
+        frequencies = np.array(
+            [doc_freq[vocabulary[term]] if term in vocabulary else 0 for term in terms],
+            dtype=np.float64
+        )
+        return np.log((1 + num_documents) / (1 + frequencies)) + 1
+
+    def key_terms(self, text: str, top_n: int = 5) -> List[Tuple[str, float]]:
+        """
+        Score the terms of a text with one TF-IDF transform
+
+        Args:
+            text: Input text
+            top_n: Number of top terms to return
+
+        Returns:
+            List of (term, score) tuples, scores L2-normalized
+        """
+        counts = Counter(tokenize(text))
+        if not counts:
+            return []
+
+        terms = sorted(counts)
+        scores = np.array([counts[term] for term in terms], dtype=np.float64) * self.idf(terms)
+        scores /= np.linalg.norm(scores)
+
+        top = np.argsort(-scores, kind='stable')[:top_n]
+        return [(terms[i], float(scores[i])) for i in top]
+
+    def save(self, path: Optional[str] = None):
+        """
+        Write the model to disk
+
+        Args:
+            path: File path without extension (default: the model's path)
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path to save the IDF model to")
+
+        with self._lock:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # Copy out of any memory map so the file can be replaced
+            state = self._state
+            doc_freq = np.array(state.doc_freq, dtype=np.uint32)
+            self._state = state._replace(doc_freq=doc_freq)
+
+            vocabulary = sorted(state.vocabulary, key=state.vocabulary.get)
+            metadata = {
+                'vocabulary': vocabulary,
+                'num_documents': state.num_documents,
+                'last_row_id': state.last_row_id
+            }
+
+            # Write both files before replacing either, so a crash keeps the old model
+            with open(path + '.npy.tmp', 'wb') as f:
+                np.save(f, doc_freq)
+            with open(path + '.json.tmp', 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, ensure_ascii=False)
+            os.replace(path + '.npy.tmp', path + '.npy')
+            os.replace(path + '.json.tmp', path + '.json')
+
+        logger.info(f"Saved IDF model ({len(vocabulary)} terms, {state.num_documents} documents) to {path}")
+
+    def load(self, path: Optional[str] = None):
+        """
+        Load the model from disk, memory-mapping the frequency array
+
+        Args:
+            path: File path without extension (default: the model's path)
+        """
+        path = path or self.path
+        try:
+            with open(path + '.json', 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            doc_freq = np.load(path + '.npy', mmap_mode='r')
+            if len(doc_freq) != len(metadata['vocabulary']):
+                raise ValueError("vocabulary and frequency array sizes differ")
+
+            state = _Snapshot(
+                {term: i for i, term in enumerate(metadata['vocabulary'])},
+                doc_freq,
+                metadata['num_documents'],
+                metadata['last_row_id']
+            )
+            with self._lock:
+                self._state = state
+            logger.info(f"Loaded IDF model ({len(doc_freq)} terms, {state.num_documents} documents)")
+
+        except Exception as e:
+            logger.error(f"Error loading IDF model: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get model statistics
+
+        Returns:
+            Dictionary with term and document counts and the last row consumed
+        """
+        state = self._state
+        return {
+            'terms': len(state.vocabulary),
+            'documents': state.num_documents,
+            'last_row_id': state.last_row_id
+        }
@@ -0,0 +1,185 @@
+"""
+Language Detection Module
+Memoized language detection with a Unicode-script fast path
+Texts in a distinctive script are classified without running the n-gram model
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from langdetect import detect_langs, DetectorFactory
+
+# Set seed for consistent language detection
+DetectorFactory.seed = 0
+
+logger = logging.getLogger(__name__)
+
+# (language_code, [(first_codepoint, last_codepoint), ...])
+SCRIPT_RANGES = [
+    ('hi', [(0x0900, 0x097F)]),                                      # Devanagari
+    ('ko', [(0xAC00, 0xD7AF), (0x1100, 0x11FF), (0x3130, 0x318F)]),  # Hangul
+    ('ja', [(0x3040, 0x309F), (0x30A0, 0x30FF), (0x31F0, 0x31FF)]),  # Hiragana, Katakana
+    ('ar', [(0x0600, 0x06FF), (0x0750, 0x077F), (0x08A0, 0x08FF)]),  # Arabic
+    ('ru', [(0x0400, 0x04FF), (0x0500, 0x052F)]),                    # Cyrillic
+    ('zh-cn', [(0x4E00, 0x9FFF), (0x3400, 0x4DBF)]),                 # Han
+]
+
+# Share of letters a script must cover before the fast path trusts it
+SCRIPT_THRESHOLD = 0.6
+
+
+def _script_of(char: str) -> Optional[str]:
+    """Return the language code whose script contains char, if any"""
+    code = ord(char)
+    for lang, ranges in SCRIPT_RANGES:
+        for first, last in ranges:
+            if first <= code <= last:
+                return lang
+    return None
+
+
+def detect_by_script(text: str) -> Optional[Tuple[str, float]]:
+    """
+    Classify text by Unicode script alone
+
+    Args:
+        text: Input text
+
+    Returns:
+        Tuple of (language_code, share_of_letters), or None when the text is
+        mostly in a script shared by many languages (e.g. Latin)
+    """
+    counts: Dict[str, int] = {}
+    letters = 0
+    for char in text:
+        if not char.isalpha():
+            continue
+        letters += 1
+        lang = _script_of(char)
+        if lang:
+            counts[lang] = counts.get(lang, 0) + 1
+
+    if not letters or not counts:
+        return None
+
+    # Japanese mixes Kana with Han characters; any Kana means Japanese
+    if counts.get('ja'):
+        counts['ja'] += counts.pop('zh-cn', 0)
+
+    lang, count = max(counts.items(), key=lambda item: item[1])
+    share = count / letters
+    if share < SCRIPT_THRESHOLD:
+        return None
+    return lang, round(share, 4)
+
+
+def detect_with_langdetect(text: str) -> Tuple[str, float]:
+    """Run the langdetect n-gram model and return its most probable language"""
+    best = detect_langs(text)[0]
+    return best.lang, best.prob
+
+
+class LanguageDetector:
+    """
+    Memoized detector: script heuristics first, then a statistical model
+    """
+
+    def __init__(
+        self,
+        model: Optional[Callable[[str], Tuple[str, float]]] = None,
+        cache_size: int = 1024
+    ):
+        """
+        Initialize language detector
+
+        Args:
+            model: Callable returning (language_code, probability) for texts the
+                script heuristics cannot decide (default: langdetect)
+            cache_size: Number of recent detections to remember
+        """
+        self.model = model or detect_with_langdetect
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.cache_hits = 0
+        self.script_hits = 0
+        self.model_calls = 0
+
+    def detect(self, text: str) -> Tuple[str, float]:
+        """
+        Detect language of text
+
+        Args:
+            text: Input text
+
+        Returns:
+            Tuple of (language_code, confidence)
+
+        Raises:
+            Exception: Whatever the model raises when it cannot decide
+        """
+        detection = self.detect_fast(text)
+        if detection is not None:
+            return detection
+
+        with self._lock:
+            self.model_calls += 1
+        detection = self.model(text)
+        self._remember(text, detection)
+        return detection
+
+    def detect_fast(self, text: str) -> Optional[Tuple[str, float]]:
+        """
+        Detect language from the memo or the script heuristics only
+
+        Never calls the model, so it is cheap enough to run on an event loop.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Tuple of (language_code, confidence), or None if the model is needed
+        """
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                self.cache_hits += 1
+                return cached
+
+        detection = detect_by_script(text)
+        if detection is not None:
+            with self._lock:
+                self.script_hits += 1
+            self._remember(text, detection)
+        return detection
+
+    def _remember(self, text: str, detection: Tuple[str, float]):
+        """Memoize a detection, evicting the least recently used entries"""
+        with self._lock:
+            self._cache[text] = detection
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        """Forget memoized detections"""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get detection statistics
+
+        Returns:
+            Dictionary with cache hits, script fast-path hits and model calls
+        """
+        with self._lock:
+            return {
+                'cache_hits': self.cache_hits,
+                'script_hits': self.script_hits,
+                'model_calls': self.model_calls,
+                'cached': len(self._cache)
+            }
@@ -3,9 +3,11 @@ Translation Memory Module
 Manages SQLite database for storing translation history and ensuring consistency
 """
 
+import functools
 import logging
 import sqlite3
 import json
+import threading
 from datetime import datetime
 from typing import Optional, List, Dict, Tuple
 import os
@@ -13,9 +15,21 @@ import os
 logger = logging.getLogger(__name__)
 
 
+def _locked(method):
+    """Run a method while holding the memory's connection lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class TranslationMemory:
     """
     Manages translation memory database for consistent translations
+    
+    The connection is shared across threads (e.g. the offline queue's drain
+    thread), so every database access is serialized by one lock.
     """
     
     def __init__(self, db_path: str = "data/translation_memory.db"):
@@ -27,6 +41,7 @@ class TranslationMemory:
         """
         self.db_path = db_path
         self.conn = None
+        self._lock = threading.RLock()
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
@@ -91,6 +106,22 @@ class TranslationMemory:
                 )
             """)
             
+            # Requests that could not be translated while offline, replayed later
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS pending_translations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    original_text TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    context TEXT,
+                    domain TEXT,
+                    attempts INTEGER DEFAULT 0,
+                    last_error TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(original_text, source_lang, target_lang)
+                )
+            """)
+            
             # Statistics table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS statistics (
@@ -109,6 +140,7 @@ class TranslationMemory:
             logger.error(f"Database initialization error: {e}")
             raise
     
+    @_locked
     def add_translation(
         self,
         original_text: str,
@@ -136,8 +168,13 @@ class TranslationMemory:
             method: Translation method used
             
         Returns:
-            ID of inserted record
+            ID of inserted record (-1 if nothing was stored)
         """
+        if method == 'error':
+            # A failed translation is the untranslated input; never remember it
+            logger.warning("Refusing to store failed translation in memory")
+            return -1
+        
         try:
             cursor = self.conn.cursor()
             
@@ -169,8 +206,16 @@ class TranslationMemory:
                 context, domain, entities_json, confidence, method
             ))
             
-            self.conn.commit()
             translation_id = cursor.lastrowid
+            
+            # Drop untranslated rows stored by older versions for the same text
+            cursor.execute("""
+                DELETE FROM translations
+                WHERE original_text = ? AND source_lang = ? AND target_lang = ?
+                  AND method = 'error'
+            """, (original_text, source_lang, target_lang))
+            
+            self.conn.commit()
             logger.info(f"Added new translation (ID: {translation_id})")
             return translation_id
             
@@ -178,6 +223,7 @@ class TranslationMemory:
             logger.error(f"Error adding translation: {e}")
             return -1
     
+    @_locked
     def find_translation(
         self,
         original_text: str,
@@ -203,6 +249,7 @@ class TranslationMemory:
                 WHERE original_text = ? 
                   AND source_lang = ? 
                   AND target_lang = ?
+                  AND (method IS NULL OR method != 'error')
                 ORDER BY usage_count DESC, timestamp DESC
                 LIMIT 1
             """, (original_text, source_lang, target_lang))
@@ -217,6 +264,51 @@ class TranslationMemory:
             logger.error(f"Error finding translation: {e}")
             return None
     
+    @_locked
+    def find_translations(
+        self,
+        original_text: str,
+        source_lang: str,
+        target_langs: List[str]
+    ) -> Dict[str, Dict]:
+        """
+        Find existing translations of one text into several languages
+        
+        Args:
+            original_text: Original text to search for
+            source_lang: Source language code
+            target_langs: Target language codes
+            
+        Returns:
+            Dictionary mapping target language to its best translation record
+        """
+        if not target_langs:
+            return {}
+        
+        try:
+            cursor = self.conn.cursor()
+            
+            placeholders = ', '.join('?' for _ in target_langs)
+            cursor.execute(f"""
+                SELECT * FROM translations
+                WHERE original_text = ? 
+                  AND source_lang = ? 
+                  AND target_lang IN ({placeholders})
+                  AND (method IS NULL OR method != 'error')
+                ORDER BY usage_count DESC, timestamp DESC
+            """, (original_text, source_lang, *target_langs))
+            
+            found = {}
+            for row in cursor.fetchall():
+                # Rows are ordered best first; keep the first per language
+                found.setdefault(row['target_lang'], dict(row))
+            return found
+            
+        except Exception as e:
+            logger.error(f"Error finding translations: {e}")
+            return {}
+    
+    @_locked
     def search_similar_translations(
         self,
         text: str,
@@ -258,6 +350,46 @@ class TranslationMemory:
             logger.error(f"Error searching translations: {e}")
             return []
     
+    @_locked
+    def get_source_texts(self, after_id: int = 0, limit: int = 1000) -> List[Tuple[int, str]]:
+        """
+        Get distinct original texts stored after a given row, oldest first
+        
+        Each text is returned once, at the row where it was first stored,
+        so callers can consume the memory incrementally by passing the last
+        id they have seen.
+        
+        Args:
+            after_id: Only return rows with a greater id
+            limit: Maximum number of texts
+            
+        Returns:
+            List of (row id, original text) tuples
+        """
+        try:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, original_text FROM translations t
+                WHERE id > ?
+                  AND (method IS NULL OR method != 'error')
+                  AND NOT EXISTS (
+                      SELECT 1 FROM translations earlier
+                      WHERE earlier.original_text = t.original_text
+                        AND earlier.id < t.id
+                        AND (earlier.method IS NULL OR earlier.method != 'error')
+                  )
+                ORDER BY id
+                LIMIT ?
+            """, (after_id, limit))
+            
+            return [(row['id'], row['original_text']) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error(f"Error getting source texts: {e}")
+            return []
+    
+    @_locked
     def add_to_user_dictionary(
         self,
         term: str,
@@ -298,6 +430,7 @@ class TranslationMemory:
             logger.error(f"Error adding to user dictionary: {e}")
             return False
     
+    @_locked
     def get_user_dictionary_term(
         self,
         term: str,
@@ -330,6 +463,122 @@ class TranslationMemory:
             logger.error(f"Error getting user dictionary term: {e}")
             return None
     
+    @_locked
+    def add_pending(
+        self,
+        original_text: str,
+        source_lang: str,
+        target_lang: str,
+        context: Optional[str] = None,
+        domain: Optional[str] = None
+    ) -> bool:
+        """
+        Queue a request that could not be translated for later replay
+        
+        Args:
+            original_text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            context: Surrounding context
+            domain: Domain classification
+            
+        Returns:
+            True if the request is queued (including already queued)
+        """
+        try:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("""
+                INSERT OR IGNORE INTO pending_translations
+                (original_text, source_lang, target_lang, context, domain)
+                VALUES (?, ?, ?, ?, ?)
+            """, (original_text, source_lang, target_lang, context, domain))
+            
+            self.conn.commit()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error queueing pending translation: {e}")
+            return False
+    
+    @_locked
+    def get_pending(self, limit: int = 50, after_id: int = 0) -> List[Dict]:
+        """
+        Get queued requests, oldest first
+        
+        Args:
+            limit: Maximum number of records
+            after_id: Only return records with a greater id
+            
+        Returns:
+            List of pending request records
+        """
+        try:
+            cursor = self.conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM pending_translations
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+            """, (after_id, limit))
+            
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error(f"Error getting pending translations: {e}")
+            return []
+    
+    @_locked
+    def remove_pending(self, pending_id: int):
+        """
+        Remove a request from the queue
+        
+        Args:
+            pending_id: ID of the pending record
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM pending_translations WHERE id = ?", (pending_id,))
+            self.conn.commit()
+            
+        except Exception as e:
+            logger.error(f"Error removing pending translation: {e}")
+    
+    @_locked
+    def record_pending_failure(self, pending_id: int, error: str):
+        """
+        Record a failed replay attempt
+        
+        Args:
+            pending_id: ID of the pending record
+            error: Error message of the attempt
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                UPDATE pending_translations
+                SET attempts = attempts + 1, last_error = ?
+                WHERE id = ?
+            """, (error, pending_id))
+            self.conn.commit()
+            
+        except Exception as e:
+            logger.error(f"Error updating pending translation: {e}")
+    
+    @_locked
+    def count_pending(self) -> int:
+        """Get the number of queued requests"""
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT COUNT(*) as count FROM pending_translations")
+            return cursor.fetchone()['count']
+            
+        except Exception as e:
+            logger.error(f"Error counting pending translations: {e}")
+            return 0
+    
+    @_locked
     def get_history(
         self,
         limit: int = 50,
@@ -374,6 +623,7 @@ class TranslationMemory:
             logger.error(f"Error getting history: {e}")
             return []
     
+    @_locked
     def get_statistics(self) -> Dict[str, any]:
         """
         Get translation statistics
@@ -418,12 +668,17 @@ class TranslationMemory:
             cursor.execute("SELECT COUNT(*) as count FROM user_dictionary")
             stats['user_dictionary_size'] = cursor.fetchone()['count']
             
+            # Requests waiting for the backend to come back
+            cursor.execute("SELECT COUNT(*) as count FROM pending_translations")
+            stats['pending_translations'] = cursor.fetchone()['count']
+            
             return stats
             
         except Exception as e:
             logger.error(f"Error getting statistics: {e}")
             return {}
     
+    @_locked
     def clear_history(self, days_old: Optional[int] = None):
         """
         Clear translation history
@@ -448,6 +703,7 @@ class TranslationMemory:
         except Exception as e:
             logger.error(f"Error clearing history: {e}")
     
+    @_locked
     def close(self):
         """Close database connection"""
         if self.conn:
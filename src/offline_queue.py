@@ -0,0 +1,271 @@
+"""
+Offline Queue Module
+Answers translations from memory while the backend is unreachable and
+replays the requests it could not answer once the backend is back
+"""
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from src.resilience import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class OfflineQueue:
+    """
+    Degraded-mode wrapper around TranslationEngine backed by TranslationMemory
+    """
+
+    def __init__(
+        self,
+        engine,
+        memory,
+        batch_size: int = 50,
+        drain_interval: float = 30.0,
+        max_attempts: int = 5
+    ):
+        """
+        Initialize offline queue
+
+        Args:
+            engine: TranslationEngine used for live and replayed translations
+            memory: TranslationMemory holding past translations and the queue
+            batch_size: Queued requests replayed per batch
+            drain_interval: Seconds between background drain attempts
+            max_attempts: Failed replays after which a request is dropped
+        """
+        self.engine = engine
+        self.memory = memory
+        self.batch_size = batch_size
+        self.drain_interval = drain_interval
+        self.max_attempts = max_attempts
+
+        self._drain_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.offline_answers = 0
+        self.queued = 0
+        self.replayed = 0
+
+    def translate(
+        self,
+        text: str,
+        target_lang: str,
+        source_lang: Optional[str] = None,
+        detection: Optional[Tuple[str, float]] = None,
+        context: Optional[str] = None,
+        domain: Optional[str] = None
+    ) -> Dict[str, any]:
+        """
+        Translate text, falling back to memory and the queue when the backend fails
+
+        Args:
+            text: Text to translate
+            target_lang: Target language code
+            source_lang: Source language code (auto-detect if None)
+            detection: Pre-computed (language_code, confidence)
+            context: Surrounding context, stored with a queued request
+            domain: Domain classification, stored with a queued request
+
+        Returns:
+            Translation result dictionary. Results answered offline carry
+            'offline': True; unanswered requests keep method 'error' and
+            carry 'queued': True.
+        """
+        result = self.engine.translate(
+            text,
+            target_lang=target_lang,
+            source_lang=source_lang,
+            detection=detection
+        )
+        if result['method'] != 'error':
+            return result
+
+        if source_lang is None:
+            source_lang = detection[0] if detection else self.engine.detect_language(text)[0]
+
+        offline_result = self.answer_offline(text, source_lang, target_lang)
+        if offline_result is not None:
+            self.offline_answers += 1
+            return offline_result
+
+        if self.memory.add_pending(text, source_lang, target_lang, context, domain):
+            self.queued += 1
+            result['queued'] = True
+            logger.info("Backend unavailable, request queued for replay")
+        return result
+
+    def answer_offline(self, text: str, source_lang: str, target_lang: str) -> Optional[Dict[str, any]]:
+        """
+        Answer a request from translation memory or the user dictionary
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            Result dictionary, or None if nothing local matches
+        """
+        record = self.memory.find_translation(text, source_lang, target_lang)
+        if record is not None:
+            translated, confidence, method = record['translated_text'], record['confidence'], 'memory'
+        else:
+            translated = self.memory.get_user_dictionary_term(text.strip(), source_lang, target_lang)
+            if translated is None:
+                return None
+            confidence, method = 1.0, 'user_dictionary'
+
+        return {
+            'original_text': text,
+            'translated_text': translated,
+            'source_language': source_lang,
+            'target_language': target_lang,
+            'confidence': confidence,
+            'method': method,
+            'offline': True
+        }
+
+    def backend_available(self) -> bool:
+        """Check whether the backend's circuit currently lets requests through"""
+        return self.engine.circuit_breaker.state != CircuitBreaker.OPEN
+
+    def drain(self, max_items: Optional[int] = None) -> Dict[str, int]:
+        """
+        Replay queued requests in rate-limited batches and store the results in memory
+
+        Each request is tried at most once per drain. Requests that fail
+        permanently (e.g. rejected input) count toward max_attempts; the drain
+        stops early when a batch fails only for reasons that may pass (backend
+        down, circuit open), and such failures are not counted.
+
+        Args:
+            max_items: Maximum number of requests to replay (None = all)
+
+        Returns:
+            Dictionary with translated, failed and remaining counts
+        """
+        stats = {'translated': 0, 'failed': 0}
+        with self._drain_lock:
+            processed = 0
+            last_id = 0
+            while max_items is None or processed < max_items:
+                limit = self.batch_size if max_items is None else min(self.batch_size, max_items - processed)
+                pending = self.memory.get_pending(limit, after_id=last_id)
+                if not pending:
+                    break
+
+                translated, backend_down = self._replay_batch(pending)
+                stats['translated'] += translated
+                stats['failed'] += len(pending) - translated
+                processed += len(pending)
+                last_id = pending[-1]['id']
+                if backend_down:
+                    break
+
+        stats['remaining'] = self.memory.count_pending()
+        if stats['translated']:
+            logger.info(f"Replayed {stats['translated']} queued translations ({stats['remaining']} remaining)")
+        return stats
+
+    def _replay_batch(self, pending: list) -> Tuple[int, bool]:
+        """
+        Translate one batch of pending records
+
+        Returns:
+            Tuple of (number translated, whether the backend seems to be down)
+        """
+        # batch_translate needs a single language pair per call
+        groups: Dict[Tuple[str, str], list] = {}
+        for record in pending:
+            groups.setdefault((record['source_lang'], record['target_lang']), []).append(record)
+
+        translated = 0
+        failures = []
+        transient_failures = []
+        for (source_lang, target_lang), records in groups.items():
+            results = self.engine.batch_translate(
+                [record['original_text'] for record in records],
+                target_lang=target_lang,
+                source_lang=source_lang,
+                pack=True
+            )
+            for record, result in zip(records, results):
+                if result['method'] == 'error':
+                    failed = transient_failures if result.get('transient', True) else failures
+                    failed.append((record, result.get('error', 'unknown error')))
+                    continue
+                self.memory.add_translation(
+                    original_text=record['original_text'],
+                    translated_text=result['translated_text'],
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    context=record['context'],
+                    domain=record['domain'],
+                    confidence=result['confidence'],
+                    method=result['method']
+                )
+                self.memory.remove_pending(record['id'])
+                translated += 1
+
+        # A transient failure only counts against the request while the backend
+        # otherwise answers; a batch that failed as a whole or ran into the open
+        # circuit says nothing about the requests in it. Permanent failures
+        # always count, so a request that can never succeed is eventually dropped.
+        backend_down = not self.backend_available() or (transient_failures and not translated)
+        if not backend_down:
+            failures.extend(transient_failures)
+        for record, error in failures:
+            self._record_failure(record, error)
+
+        self.replayed += translated
+        return translated, bool(backend_down)
+
+    def _record_failure(self, record: Dict, error: str):
+        """Count a failed replay, dropping the request after max_attempts"""
+        if record['attempts'] + 1 >= self.max_attempts:
+            logger.warning(f"Dropping queued translation after {self.max_attempts} attempts: {error}")
+            self.memory.remove_pending(record['id'])
+        else:
+            self.memory.record_pending_failure(record['id'], error)
+
+    def start(self):
+        """Start draining the queue in the background whenever the backend is available"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._drain_loop, name='offline-queue', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background drain thread"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _drain_loop(self):
+        """Background loop: drain when requests are queued and the circuit is not open"""
+        while not self._stop_event.wait(self.drain_interval):
+            try:
+                if self.memory.count_pending() and self.backend_available():
+                    self.drain()
+            except Exception as e:
+                logger.error(f"Offline queue drain failed: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get offline queue statistics
+
+        Returns:
+            Dictionary with offline answers, queued, replayed and pending counts
+        """
+        return {
+            'offline_answers': self.offline_answers,
+            'queued': self.queued,
+            'replayed': self.replayed,
+            'pending': self.memory.count_pending()
+        }
@@ -0,0 +1,124 @@
+"""
+Placeholder Masking Module
+Protects terms from translation by swapping them for numbered placeholders
+Masking and unmasking are each a single regex pass, longest term first
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+PLACEHOLDER_TEMPLATE = "__ENTITY_{}__"
+
+# Translation backends sometimes change case or add spaces inside placeholders
+PLACEHOLDER_PATTERN = re.compile(r'__\s*ENTITY_(\d+)\s*__', re.IGNORECASE)
+
+
+class PlaceholderMasker:
+    """
+    Compiled single-pass matcher for a fixed set of terms
+
+    Protected terms (e.g. named entities) are matched exactly and restored
+    unchanged. Glossary terms are matched case-insensitively on word
+    boundaries and restored as their fixed translation.
+    """
+
+    def __init__(self, terms: Sequence[str], glossary: Optional[Dict[str, str]] = None):
+        """
+        Initialize masker
+
+        Args:
+            terms: Terms to protect; duplicates and empty strings are ignored
+            glossary: Mapping of normalized (lowercase, single-spaced) source
+                term to the translation that replaces it
+        """
+        self.terms = list(dict.fromkeys(term for term in terms if term))
+        self._index = {term: idx for idx, term in enumerate(self.terms)}
+
+        self.glossary = dict(glossary or {})
+        self._glossary_index = {
+            term: len(self.terms) + idx for idx, term in enumerate(self.glossary)
+        }
+
+        alternatives = [(len(term), re.escape(term)) for term in self.terms]
+        for term in self.glossary:
+            words = r'\s+'.join(re.escape(word) for word in term.split())
+            alternatives.append((len(term), rf'(?i:\b{words}\b)'))
+
+        # Longest first so "New York City" wins over "New York" at the same position
+        alternatives.sort(key=lambda item: item[0], reverse=True)
+        self._pattern = re.compile('|'.join(p for _, p in alternatives)) if alternatives else None
+
+    def is_glossary_index(self, idx: int) -> bool:
+        """Check whether a placeholder index belongs to a glossary term"""
+        return idx >= len(self.terms)
+
+    def mask(self, text: str) -> Tuple[str, Dict[int, str]]:
+        """
+        Replace every protected and glossary term with its placeholder
+
+        Args:
+            text: Input text
+
+        Returns:
+            Tuple of (masked_text, {placeholder_index: restored_text}) for terms that occurred
+        """
+        if self._pattern is None:
+            return text, {}
+
+        found: Dict[int, str] = {}
+
+        def replace(match: re.Match) -> str:
+            matched = match.group(0)
+            idx = self._index.get(matched)
+            if idx is not None:
+                found[idx] = matched
+            else:
+                term = ' '.join(matched.lower().split())
+                idx = self._glossary_index[term]
+                found[idx] = self.glossary[term]
+            return PLACEHOLDER_TEMPLATE.format(idx)
+
+        return self._pattern.sub(replace, text), found
+
+    @staticmethod
+    def unmask(text: str, found: Dict[int, str]) -> str:
+        """
+        Restore terms in (translated) text
+
+        Args:
+            text: Text containing placeholders
+            found: Mapping returned by mask()
+
+        Returns:
+            Text with placeholders replaced by their terms
+        """
+        if not found:
+            return text
+
+        def restore(match: re.Match) -> str:
+            return found.get(int(match.group(1)), match.group(0))
+
+        return PLACEHOLDER_PATTERN.sub(restore, text)
+
+
+@lru_cache(maxsize=256)
+def _get_masker(terms: Tuple[str, ...], glossary_items: Tuple[Tuple[str, str], ...]) -> PlaceholderMasker:
+    return PlaceholderMasker(terms, dict(glossary_items))
+
+
+def get_masker(
+    terms: Sequence[str],
+    glossary_items: Tuple[Tuple[str, str], ...] = ()
+) -> PlaceholderMasker:
+    """
+    Get a compiled masker for a set of terms, reusing one built earlier
+
+    Args:
+        terms: Terms to protect
+        glossary_items: (normalized_term, translation) pairs to substitute
+
+    Returns:
+        Cached PlaceholderMasker
+    """
+    return _get_masker(tuple(terms), glossary_items)
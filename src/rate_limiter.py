@@ -0,0 +1,259 @@
+"""
+Rate Limiter Module
+Process-wide token buckets that throttle requests to each translation backend
+Interactive requests are served before bulk jobs waiting on the same bucket
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when no token becomes available before the caller's deadline"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at a fixed rate up to a burst size
+
+    While an interactive caller is waiting, bulk callers do not take tokens,
+    so a user-facing request never queues behind a large batch. Callers of the
+    same priority are served in arrival order.
+    """
+
+    INTERACTIVE = 'interactive'
+    BULK = 'bulk'
+
+    def __init__(self, rate: Optional[float] = None, burst: int = 1, name: str = 'backend'):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens (requests) added per second (None or 0 = unlimited)
+            burst: Maximum tokens that can accumulate
+            name: Name of the throttled backend (for logging)
+        """
+        self.name = name
+        self.rate = rate if rate and rate > 0 else None
+        self.burst = max(1, burst)
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        # Tickets of the callers waiting at each priority, in arrival order
+        self._queues = {self.INTERACTIVE: deque(), self.BULK: deque()}
+        self._stats = {
+            priority: {'acquired': 0, 'delayed': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+            for priority in (self.INTERACTIVE, self.BULK)
+        }
+
+    def _take(self, priority: str, ticket: object) -> float:
+        """
+        Take a token if allowed (caller holds the lock)
+
+        Returns:
+            0.0 if a token was taken, otherwise seconds until one may be available
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        if priority == self.BULK and self._queues[self.INTERACTIVE]:
+            # Leave the next token to the interactive caller
+            return 1.0 / self.rate
+        # Leave one token for each caller that arrived earlier
+        needed = self._queues[priority].index(ticket) + 1.0
+        if self._tokens >= needed:
+            self._tokens -= 1.0
+            return 0.0
+        return (needed - self._tokens) / self.rate
+
+    def _record(self, priority: str, waited: float):
+        """Update wait statistics (caller holds the lock)"""
+        stats = self._stats[priority]
+        stats['acquired'] += 1
+        if waited > 0:
+            stats['delayed'] += 1
+            stats['total_wait'] += waited
+            stats['max_wait'] = max(stats['max_wait'], waited)
+
+    def acquire(self, priority: str = INTERACTIVE, timeout: Optional[float] = None) -> float:
+        """
+        Block until a token is available
+
+        Args:
+            priority: INTERACTIVE or BULK
+            timeout: Maximum seconds to wait (None = wait as long as needed)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If no token became available within timeout
+        """
+        start = time.monotonic()
+        with self._cond:
+            if self.rate is None:
+                self._record(priority, 0.0)
+                return 0.0
+
+            ticket = object()
+            self._queues[priority].append(ticket)
+            delayed = False
+            try:
+                while True:
+                    wait = self._take(priority, ticket)
+                    if wait == 0.0:
+                        break
+                    delayed = True
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - start)
+                        if remaining <= 0:
+                            raise RateLimitTimeout(f"No request token for {self.name} within {timeout:.2f}s")
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._queues[priority].remove(ticket)
+                # Later and bulk waiters re-check once this caller is done
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start if delayed else 0.0
+            self._record(priority, waited)
+        return waited
+
+    async def aacquire(self, priority: str = INTERACTIVE, timeout: Optional[float] = None) -> float:
+        """
+        Async version of acquire() that sleeps on the event loop instead of blocking
+
+        Args:
+            priority: INTERACTIVE or BULK
+            timeout: Maximum seconds to wait (None = wait as long as needed)
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        with self._cond:
+            if self.rate is None:
+                self._record(priority, 0.0)
+                return 0.0
+            ticket = object()
+            self._queues[priority].append(ticket)
+
+        delayed = False
+        try:
+            while True:
+                with self._cond:
+                    wait = self._take(priority, ticket)
+                if wait == 0.0:
+                    break
+                delayed = True
+                if timeout is not None:
+                    remaining = timeout - (time.monotonic() - start)
+                    if remaining <= 0:
+                        raise RateLimitTimeout(f"No request token for {self.name} within {timeout:.2f}s")
+                    wait = min(wait, remaining)
+                await asyncio.sleep(wait)
+        finally:
+            with self._cond:
+                self._queues[priority].remove(ticket)
+                self._cond.notify_all()
+
+        waited = time.monotonic() - start if delayed else 0.0
+        with self._cond:
+            self._record(priority, waited)
+        return waited
+
+    def capacity(self, seconds: float) -> Optional[int]:
+        """
+        Number of tokens a full bucket hands out within a time span
+
+        Args:
+            seconds: Length of the time span
+
+        Returns:
+            Burst plus the tokens refilled in that time (None = unlimited)
+        """
+        if self.rate is None:
+            return None
+        return self.burst + int(self.rate * seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get rate limiting statistics
+
+        Returns:
+            Dictionary with the configured rate and per-priority acquired,
+            delayed, average and maximum wait counters
+        """
+        with self._cond:
+            stats = {'rate': self.rate, 'burst': self.burst}
+            for priority, counters in self._stats.items():
+                acquired = counters['acquired']
+                stats[priority] = {
+                    'acquired': acquired,
+                    'delayed': counters['delayed'],
+                    'avg_wait': counters['total_wait'] / acquired if acquired else 0.0,
+                    'max_wait': counters['max_wait'],
+                    'waiting': len(self._queues[priority])
+                }
+            return stats
+
+
+# One bucket per backend name, shared by every engine in the process
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: Optional[float] = None, burst: int = 1) -> TokenBucket:
+    """
+    Get the process-wide token bucket for a backend, creating it on first use
+
+    Args:
+        name: Backend name
+        rate: Requests per second (None = unlimited); only used on creation
+        burst: Burst size; only used on creation
+
+    Returns:
+        Shared TokenBucket
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucket(rate=rate, burst=burst, name=name)
+            _limiters[name] = limiter
+            if limiter.rate:
+                logger.info(f"Rate limiting {name} to {rate} requests/s (burst {limiter.burst})")
+        return limiter
+
+
+# Priority of backend calls made by the current thread or task
+_current_priority: ContextVar[str] = ContextVar('request_priority', default=TokenBucket.INTERACTIVE)
+
+
+def current_priority() -> str:
+    """Get the priority of requests made in the current context"""
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Run the enclosed translations at the given priority
+
+    Args:
+        priority: TokenBucket.INTERACTIVE or TokenBucket.BULK
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
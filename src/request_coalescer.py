@@ -0,0 +1,134 @@
+"""
+Request Coalescing Module
+Single-flight execution: concurrent identical requests share one in-flight call
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RequestCoalescer:
+    """
+    In-flight table mapping request keys to a shared future
+    """
+
+    def __init__(self):
+        """Initialize request coalescer"""
+        self._inflight: Dict[Hashable, Future] = {}
+        # (event loop id, key) -> [task, number of waiting callers], for coroutine callers
+        self._async_inflight: Dict[Tuple[int, Hashable], list] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def run(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run func once for all concurrent callers using the same key
+
+        The first caller executes func; callers arriving while it runs wait
+        for the same result, or receive the same exception.
+
+        Args:
+            key: Hashable request key
+            func: Zero-argument callable producing the result
+
+        Returns:
+            Tuple of (result, shared) where shared is True if this caller
+            waited on another caller's request
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def arun(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Async version of run() for callers on the same event loop
+
+        The call runs in its own task: cancelling one caller, including the
+        one that started it, does not affect the others. The task is cancelled
+        only when every caller waiting for it has been cancelled.
+
+        Args:
+            key: Hashable request key
+            func: Coroutine function producing the result
+
+        Returns:
+            Tuple of (result, shared)
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+
+        entry = self._async_inflight.get(loop_key)
+        shared = entry is not None
+        if shared:
+            with self._lock:
+                self.coalesced += 1
+        else:
+            entry = [asyncio.ensure_future(func()), 0]
+            self._async_inflight[loop_key] = entry
+            entry[0].add_done_callback(partial(self._async_done, loop_key))
+            with self._lock:
+                self.executed += 1
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # shield() so a cancelled caller does not cancel the shared task
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not task.done():
+                # Nobody else is waiting for the result
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def _async_done(self, loop_key: Tuple[int, Hashable], task: asyncio.Task):
+        """Forget a finished async call so the next request runs again"""
+        entry = self._async_inflight.get(loop_key)
+        if entry is not None and entry[0] is task:
+            del self._async_inflight[loop_key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller was cancelled
+            task.exception()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dictionary with executed, coalesced and currently in-flight counts
+        """
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._inflight) + len(self._async_inflight)
+            }
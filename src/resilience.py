@@ -0,0 +1,346 @@
+"""
+Resilience Module
+Retry with jittered exponential backoff, per-call deadlines and a circuit breaker
+Keeps a slow or failing translation backend from stalling its callers
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the backend's circuit is open"""
+
+    # The request itself is fine; it may succeed once the circuit closes
+    transient = True
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Check whether an error may go away on retry
+
+    Timeouts, connection errors and HTTP 429/5xx responses are transient.
+    Errors can state this themselves with a boolean ``transient`` attribute
+    or an HTTP ``status``/``status_code``. Anything else (invalid input, an
+    unsupported language, an unparseable response) is permanent: retrying
+    will not help and it says nothing about the backend's health.
+
+    Args:
+        error: Exception raised by a backend call
+
+    Returns:
+        True if the call should be retried and counted by the circuit breaker
+    """
+    transient = getattr(error, 'transient', None)
+    if isinstance(transient, bool):
+        return transient
+
+    status = getattr(error, 'status', None)
+    if status is None:
+        status = getattr(error, 'status_code', None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+
+    # asyncio's and concurrent.futures' TimeoutError only alias the builtin from Python 3.11
+    return isinstance(
+        error,
+        (TimeoutError, asyncio.TimeoutError, FutureTimeoutError, ConnectionError, OSError)
+    )
+
+
+class CircuitBreaker:
+    """
+    Three-state circuit breaker (closed -> open -> half-open -> closed)
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail immediately. Once reset_timeout has passed a single trial call is let
+    through; its outcome closes the circuit again or re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str = 'backend', failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize circuit breaker
+
+        Args:
+            name: Name of the protected backend (for logging)
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to wait before allowing a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current circuit state"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed
+
+        Returns:
+            True if the call may go to the backend
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = self.HALF_OPEN
+
+            # Half-open: allow a single trial call at a time
+            if self._trial_in_progress:
+                self.rejected += 1
+                return False
+            self._trial_in_progress = True
+            return True
+
+    def record_success(self):
+        """Record a successful call"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_progress = False
+
+    def release(self):
+        """End a call whose outcome says nothing about the backend (e.g. invalid input)"""
+        with self._lock:
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        """Record a failed call"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_progress = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                    logger.warning(f"Circuit for {self.name} opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get circuit breaker statistics
+
+        Returns:
+            Dictionary with state, consecutive failures and rejection counts
+        """
+        state = self.state
+        with self._lock:
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'rejected': self.rejected,
+                'times_opened': self.times_opened
+            }
+
+
+class RetryPolicy:
+    """
+    Retry a call with jittered exponential backoff within an overall deadline
+
+    Only transient errors (see is_transient_error) are retried and counted
+    as circuit breaker failures; permanent errors are raised at once.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 4.0,
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize retry policy
+
+        Args:
+            attempts: Maximum number of attempts (including the first)
+            base_delay: Backoff before the second attempt, doubled per retry
+            max_delay: Upper bound for a single backoff
+            timeout: Overall deadline in seconds across all attempts (None = none)
+        """
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+
+    def backoff(self, retry_number: int) -> float:
+        """
+        Backoff before a retry ("full jitter": uniform in [0, capped exponential])
+
+        Args:
+            retry_number: 1 for the first retry, 2 for the second, ...
+
+        Returns:
+            Seconds to sleep
+        """
+        cap = min(self.max_delay, self.base_delay * (2 ** (retry_number - 1)))
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        """Seconds left until deadline (None = no deadline)"""
+        return None if deadline is None else deadline - time.monotonic()
+
+    def execute(
+        self,
+        func: Callable[[Optional[float]], Any],
+        breaker: Optional[CircuitBreaker] = None,
+        throttle: Optional[Callable[[Optional[float]], Any]] = None
+    ) -> Any:
+        """
+        Call func until it succeeds, attempts run out or the deadline passes
+
+        A running call cannot be interrupted, so func must honour the remaining
+        time budget it is given for the deadline to hold.
+
+        Args:
+            func: Callable taking the remaining time budget in seconds (or None)
+            breaker: Circuit breaker consulted before and updated after each attempt
+            throttle: Called with the remaining time budget before each attempt,
+                e.g. to wait for a rate limit token. Runs before the breaker is
+                consulted and its errors are raised as is, never counted as failures.
+
+        Returns:
+            Result of func
+
+        Raises:
+            CircuitOpenError: If the breaker rejects the call
+            TimeoutError: If the deadline passes before an attempt can start
+            Exception: A permanent error, or the last transient error raised by func,
+                or any error raised by throttle
+        """
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        last_error = None
+
+        for attempt in range(1, self.attempts + 1):
+            remaining = self._remaining(deadline)
+            if throttle is not None and (remaining is None or remaining > 0):
+                throttle(remaining)
+                remaining = self._remaining(deadline)
+            if remaining is not None and remaining <= 0:
+                break
+
+            if breaker is not None and not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit for {breaker.name} is open")
+
+            try:
+                result = func(remaining)
+            except Exception as e:
+                if not is_transient_error(e):
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+                last_error = e
+                if breaker is not None:
+                    breaker.record_failure()
+                logger.warning(f"Attempt {attempt}/{self.attempts} failed: {e}")
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+
+            if attempt < self.attempts:
+                delay = self.backoff(attempt)
+                if deadline is not None:
+                    delay = min(delay, max(0.0, deadline - time.monotonic()))
+                time.sleep(delay)
+
+        if last_error is None:
+            raise TimeoutError(f"Deadline of {self.timeout}s exceeded")
+        raise last_error
+
+    async def aexecute(
+        self,
+        func: Callable[[Optional[float]], Awaitable[Any]],
+        breaker: Optional[CircuitBreaker] = None,
+        throttle: Optional[Callable[[Optional[float]], Awaitable[Any]]] = None
+    ) -> Any:
+        """
+        Async version of execute(): awaits func with the remaining time budget,
+        cancelling an attempt that outlives the deadline
+
+        Args:
+            func: Coroutine function taking the remaining time budget in seconds (or None)
+            breaker: Circuit breaker consulted before and updated after each attempt
+            throttle: Coroutine function awaited like execute()'s throttle; it
+                enforces its own timeout and is not cancelled at the deadline
+
+        Returns:
+            Result of func
+        """
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        last_error = None
+
+        for attempt in range(1, self.attempts + 1):
+            remaining = self._remaining(deadline)
+            if throttle is not None and (remaining is None or remaining > 0):
+                await throttle(remaining)
+                remaining = self._remaining(deadline)
+            if remaining is not None and remaining <= 0:
+                break
+
+            if breaker is not None and not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit for {breaker.name} is open")
+
+            try:
+                result = await asyncio.wait_for(func(remaining), timeout=remaining)
+            except Exception as e:
+                if not is_transient_error(e):
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+                last_error = e
+                if breaker is not None:
+                    breaker.record_failure()
+                logger.warning(f"Attempt {attempt}/{self.attempts} failed: {e!r}")
+            except BaseException:
+                # Cancelled by the caller: says nothing about the backend,
+                # but a half-open trial must not stay claimed
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+
+            if attempt < self.attempts:
+                delay = self.backoff(attempt)
+                if deadline is not None:
+                    delay = min(delay, max(0.0, deadline - time.monotonic()))
+                await asyncio.sleep(delay)
+
+        if last_error is None:
+            raise TimeoutError(f"Deadline of {self.timeout}s exceeded")
+        raise last_error
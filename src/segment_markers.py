@@ -0,0 +1,54 @@
+"""
+Segment Markers Module
+Joins several segments into one translatable string with numbered markers
+and splits the translated string back into its segments
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+MARKER_TEMPLATE = "[[{}]]"
+
+# Backends may add spaces inside or around markers
+MARKER_PATTERN = re.compile(r'\[\s*\[\s*(\d+)\s*\]\s*\]')
+
+
+def join_segments(segments: Sequence[str]) -> str:
+    """
+    Join segments into one string, each preceded by its numbered marker
+
+    Args:
+        segments: Texts to join
+
+    Returns:
+        String like "[[0]] first [[1]] second"
+    """
+    return ' '.join(f"{MARKER_TEMPLATE.format(idx)} {segment}" for idx, segment in enumerate(segments))
+
+
+def split_segments(text: str, expected: int) -> Optional[List[str]]:
+    """
+    Split a (translated) joined string back into its segments
+
+    Args:
+        text: String produced by translating join_segments() output
+        expected: Number of segments that were joined
+
+    Returns:
+        List of stripped segments, or None if the markers did not survive
+        intact and in order
+    """
+    matches = list(MARKER_PATTERN.finditer(text))
+    if len(matches) != expected:
+        return None
+    if [int(match.group(1)) for match in matches] != list(range(expected)):
+        return None
+    if text[:matches[0].start()].strip() if matches else text.strip():
+        # Text before the first marker cannot be attributed to a segment
+        return None
+
+    segments = []
+    for idx, match in enumerate(matches):
+        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
+        segments.append(text[match.end():end].strip())
+    return segments
@@ -0,0 +1,215 @@
+"""
+Speculative Execution Module
+Starts detection, context analysis and likely translations as soon as text is
+selected, so the work is done (or under way) by the time a language is chosen
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Speculation:
+    """
+    Background work started for one selection before the target language is known
+    """
+
+    def __init__(
+        self,
+        text: str,
+        detection: Future,
+        analysis: Future,
+        translations: Dict[str, Future]
+    ):
+        """
+        Initialize speculation
+
+        Args:
+            text: Selected text
+            detection: Future resolving to (language_code, confidence)
+            analysis: Future resolving to the context analysis dictionary
+            translations: Target language -> future resolving to a translation result
+        """
+        self.text = text
+        self.detection = detection
+        self.analysis = analysis
+        self.translations = translations
+        self.resolved = False
+
+    @staticmethod
+    def _result(future: Optional[Future]) -> Any:
+        """Wait for a future, returning None if it was cancelled or failed"""
+        if future is None or future.cancelled():
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning(f"Speculative task failed: {e}")
+            return None
+
+    def get_detection(self) -> Optional[Tuple[str, float]]:
+        """Get the speculative language detection (waits if still running)"""
+        return self._result(self.detection)
+
+    def get_analysis(self) -> Optional[Dict]:
+        """Get the speculative context analysis (waits if still running)"""
+        return self._result(self.analysis)
+
+    def get_translation(self, target_lang: str) -> Optional[Dict]:
+        """
+        Get the speculative translation into target_lang
+
+        Args:
+            target_lang: Chosen target language
+
+        Returns:
+            Translation result, or None if target_lang was not speculated on
+        """
+        return self._result(self.translations.get(target_lang))
+
+    def cancel(self, keep: Optional[str] = None):
+        """
+        Cancel speculative translations that have not started yet
+
+        Args:
+            keep: Target language whose translation should be kept
+        """
+        for lang, future in self.translations.items():
+            if lang != keep:
+                future.cancel()
+
+
+class SpeculativeExecutor:
+    """
+    Runs speculations on a small thread pool and tracks how often they pay off
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize speculative executor
+
+        Args:
+            max_workers: Threads shared by all speculative tasks
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max(2, max_workers), thread_name_prefix='speculate')
+        self._lock = threading.Lock()
+
+        self.speculations = 0
+        self.hits = 0
+        self.misses = 0
+        self.abandoned = 0
+
+    def start(
+        self,
+        text: str,
+        detect: Callable[[str], Tuple[str, float]],
+        analyze: Callable[[str], Dict],
+        translate: Callable[[str, str, Tuple[str, float]], Dict],
+        targets: List[str]
+    ) -> Speculation:
+        """
+        Start detection, analysis and translations into the likely targets
+
+        Args:
+            text: Selected text
+            detect: Language detection function
+            analyze: Context analysis function
+            translate: Function called as translate(text, target_lang, detection)
+            targets: Target languages to translate into speculatively
+
+        Returns:
+            Speculation holding the futures
+        """
+        # Detection is submitted first so translations waiting on it cannot starve it
+        detection = self._executor.submit(detect, text)
+        analysis = self._executor.submit(analyze, text)
+
+        def translate_after_detection(target_lang: str) -> Dict:
+            return translate(text, target_lang, detection.result())
+
+        translations = {
+            lang: self._executor.submit(translate_after_detection, lang)
+            for lang in dict.fromkeys(targets)
+        }
+
+        with self._lock:
+            self.speculations += 1
+        logger.debug(f"Speculating on {list(translations)} for selected text")
+        return Speculation(text, detection, analysis, translations)
+
+    def submit(self, func: Callable, *args) -> Future:
+        """
+        Run a task on the speculative pool (e.g. work needed after a miss)
+
+        Args:
+            func: Callable to run
+            *args: Arguments for func
+
+        Returns:
+            Future for the result
+        """
+        return self._executor.submit(func, *args)
+
+    def resolve(self, speculation: Speculation, target_lang: str) -> bool:
+        """
+        Settle a speculation once the target language is chosen
+
+        Translations into other languages that have not started are cancelled;
+        the chosen one (if any) is fetched later with get_translation().
+
+        Args:
+            speculation: Speculation started for the selection
+            target_lang: Chosen target language
+
+        Returns:
+            True if target_lang was speculated on
+        """
+        hit = target_lang in speculation.translations
+        speculation.cancel(keep=target_lang)
+        speculation.resolved = True
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit
+
+    def abandon(self, speculation: Speculation):
+        """
+        Drop a speculation whose selection was never translated
+
+        Args:
+            speculation: Speculation to drop
+        """
+        if speculation.resolved:
+            return
+        speculation.cancel()
+        speculation.resolved = True
+        with self._lock:
+            self.abandoned += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get speculation statistics
+
+        Returns:
+            Dictionary with speculation, hit, miss and abandoned counts and the
+            hit rate over resolved speculations
+        """
+        with self._lock:
+            resolved = self.hits + self.misses
+            return {
+                'speculations': self.speculations,
+                'hits': self.hits,
+                'misses': self.misses,
+                'abandoned': self.abandoned,
+                'hit_rate': self.hits / resolved if resolved else 0.0
+            }
+
+    def shutdown(self):
+        """Stop the worker threads, cancelling queued speculative work"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,94 @@
+"""
+Text Chunking Module
+Splits long texts on sentence boundaries so each piece fits a backend request
+Chunks keep their original whitespace, so joining them restores the input exactly
+"""
+
+import re
+from typing import List, Tuple
+
+# Sentence end: terminal punctuation (optionally followed by closing quotes/brackets)
+# and the whitespace after it
+SENTENCE_END_PATTERN = re.compile(r'[.!?。！？।]+[\'")\]”’]*\s+')
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def split_sentences_with_whitespace(text: str) -> List[str]:
+    """
+    Split text into sentences, keeping the whitespace that follows each one
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of sentence pieces; ''.join(pieces) == text
+    """
+    pieces = []
+    start = 0
+    for match in SENTENCE_END_PATTERN.finditer(text):
+        pieces.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+
+def _split_oversized(piece: str, max_length: int) -> List[str]:
+    """Split a single over-long sentence at whitespace, or hard-cut if there is none"""
+    parts = []
+    while len(piece) > max_length:
+        cut = -1
+        for match in WHITESPACE_PATTERN.finditer(piece, 0, max_length):
+            cut = match.end()
+        if cut <= 0:
+            cut = max_length
+        parts.append(piece[:cut])
+        piece = piece[cut:]
+    if piece:
+        parts.append(piece)
+    return parts
+
+
+def split_into_chunks(text: str, max_length: int) -> List[str]:
+    """
+    Pack sentences greedily into chunks no longer than max_length
+
+    Args:
+        text: Input text
+        max_length: Maximum characters per chunk
+
+    Returns:
+        List of chunks; ''.join(chunks) == text
+    """
+    if len(text) <= max_length:
+        return [text] if text else []
+
+    chunks = []
+    current = ''
+    for sentence in split_sentences_with_whitespace(text):
+        for piece in _split_oversized(sentence, max_length):
+            if current and len(current) + len(piece) > max_length:
+                chunks.append(current)
+                current = ''
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_whitespace(chunk: str) -> Tuple[str, str, str]:
+    """
+    Separate a chunk into leading whitespace, content and trailing whitespace
+
+    Args:
+        chunk: Text chunk
+
+    Returns:
+        Tuple of (leading, content, trailing)
+    """
+    content = chunk.strip()
+    if not content:
+        return chunk, '', ''
+    start = len(chunk) - len(chunk.lstrip())
+    return chunk[:start], content, chunk[start + len(content):]
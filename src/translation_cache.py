@@ -0,0 +1,171 @@
+"""
+Translation Cache Module
+In-process LRU cache of translation results, bounded by entry count and size
+Entries can optionally expire after a time-to-live
+"""
+
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationCache:
+    """
+    Thread-safe LRU cache keyed on normalized text and language pair
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        max_bytes: int = 8 * 1024 * 1024,
+        ttl: Optional[float] = None
+    ):
+        """
+        Initialize translation cache
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum approximate size of cached text in bytes
+            ttl: Seconds after which an entry expires (None = never)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = True
+
+        # key -> (stored_at, size_in_bytes, result)
+        self._entries: "OrderedDict[Tuple, Tuple[float, int, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize Unicode form and collapse whitespace so trivial variants share an entry"""
+        return unicodedata.normalize('NFC', ' '.join(text.split()))
+
+    @classmethod
+    def make_key(cls, text: str, source_lang: Optional[str], target_lang: str, *extra) -> Tuple:
+        """
+        Build a cache key
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code (None = auto-detect)
+            target_lang: Target language code
+            *extra: Additional hashable values that change the result (e.g. preserved entities)
+
+        Returns:
+            Hashable cache key
+        """
+        return (cls.normalize_text(text), source_lang or 'auto', target_lang) + extra
+
+    @staticmethod
+    def _entry_size(key: Tuple, result: Dict) -> int:
+        """Approximate memory used by an entry's text"""
+        size = sum(len(str(part).encode('utf-8')) for part in key)
+        for field in ('original_text', 'translated_text'):
+            size += len(str(result.get(field, '')).encode('utf-8'))
+        return size
+
+    def get(self, key: Tuple, allow_expired: bool = False) -> Optional[Dict]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Cache key from make_key()
+            allow_expired: Return an entry even if its TTL has passed
+                (stale entries stay until replaced or evicted)
+
+        Returns:
+            Copy of the cached result dictionary, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, _, result = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl and not allow_expired:
+                # Keep the stale entry: it can still be served while the backend is down
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def put(self, key: Tuple, result: Dict):
+        """
+        Store a result, evicting least recently used entries beyond the limits
+
+        Args:
+            key: Cache key from make_key()
+            result: Translation result dictionary
+        """
+        if not self.enabled:
+            return
+
+        size = self._entry_size(key, result)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (time.monotonic(), size, dict(result))
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        logger.info("Translation cache cleared")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and current size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
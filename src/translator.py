@@ -1,27 +1,31 @@
 """
 Core Translation Module
-Handles translation using Google Translate API with fallback to deep-translator
+Handles translation through a pluggable backend (Google Translate by default)
 Includes language detection and multi-language support
 """
 
+import asyncio
+import contextvars
 import logging
-from typing import Optional, Dict, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Optional, Dict, Tuple, Callable
 
-# Try importing googletrans (fails on Python 3.13+ due to missing 'cgi' module)
-try:
-    from googletrans import Translator
-    GOOGLETRANS_AVAILABLE = True
-except (ImportError, ModuleNotFoundError) as e:
-    GOOGLETRANS_AVAILABLE = False
-    logging.warning(f"googletrans not available: {e}. Using deep-translator as primary.")
-
-from deep_translator import GoogleTranslator
-from langdetect import detect, DetectorFactory
 import json
 import os
 
-# Set seed for consistent language detection
-DetectorFactory.seed = 0
+import config
+from src.backends import TranslationBackend, GoogleBackend
+from src.text_chunker import split_into_chunks, split_whitespace
+from src.translation_cache import TranslationCache
+from src.request_coalescer import RequestCoalescer
+from src.language_detector import LanguageDetector, detect_with_langdetect
+from src.resilience import CircuitBreaker, RetryPolicy, is_transient_error
+from src.rate_limiter import TokenBucket, current_priority, get_rate_limiter, request_priority
+from src.placeholders import PlaceholderMasker, PLACEHOLDER_PATTERN
+from src.glossary import Glossary
+from src.segment_markers import MARKER_TEMPLATE, join_segments, split_segments
 
 logger = logging.getLogger(__name__)
 
@@ -47,29 +51,78 @@ class TranslationEngine:
         'ko': 'Korean'
     }
     
-    def __init__(self, custom_dict_path: Optional[str] = None):
+    def __init__(
+        self,
+        custom_dict_path: Optional[str] = None,
+        backend: Optional[TranslationBackend] = None,
+        cache: Optional[TranslationCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[TokenBucket] = None
+    ):
         """
         Initialize translation engine
         
         Args:
             custom_dict_path: Path to custom dictionary JSON file
+            backend: Translation backend (default: GoogleBackend)
+            cache: In-process result cache (default: sized from config)
+            retry_policy: Retry/deadline policy for backend calls (default: from config)
+            circuit_breaker: Circuit breaker for the backend (default: from config)
+            rate_limiter: Token bucket for backend calls (default: the process-wide
+                bucket for the backend, sized from config.RATE_LIMITS)
         """
-        # Initialize googletrans only if available (Python 3.12 and below)
-        self.translator = Translator() if GOOGLETRANS_AVAILABLE else None
-        self.use_deep_translator = not GOOGLETRANS_AVAILABLE
+        if backend is None:
+            backend = GoogleBackend(
+                pool_connections=config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=config.HTTP_POOL_MAXSIZE,
+                registry_size=config.TRANSLATOR_REGISTRY_SIZE,
+                timeout=config.TRANSLATION_TIMEOUT,
+                async_connection_limit=config.ASYNC_MAX_CONNECTIONS
+            )
+        self.backend = backend
+        self.retry_policy = retry_policy or RetryPolicy(
+            attempts=config.TRANSLATION_RETRY_ATTEMPTS,
+            base_delay=config.TRANSLATION_RETRY_BASE_DELAY,
+            max_delay=config.TRANSLATION_RETRY_MAX_DELAY,
+            timeout=config.TRANSLATION_TIMEOUT
+        )
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            name=backend.name,
+            failure_threshold=config.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=config.CIRCUIT_BREAKER_RESET_TIMEOUT
+        )
+        if rate_limiter is None:
+            limits = config.RATE_LIMITS.get(backend.name, {})
+            rate_limiter = get_rate_limiter(backend.name, limits.get('qps'), limits.get('burst', 1))
+        # Shared with every other engine using this backend in the process
+        self.rate_limiter = rate_limiter
+        self.cache = cache if cache is not None else TranslationCache(
+            max_entries=config.TRANSLATION_CACHE_SIZE,
+            max_bytes=config.TRANSLATION_CACHE_MAX_BYTES,
+            ttl=config.TRANSLATION_CACHE_TTL
+        )
+        # Identical concurrent requests share one backend call
+        self.coalescer = RequestCoalescer()
+        # Script heuristics first, then the backend's detector or langdetect
+        self.language_detector = LanguageDetector(
+            model=self._detect_with_backend if backend.capabilities().get('detect') else None
+        )
         self.custom_dict = {}
+        self.glossary = Glossary()
+        self.max_text_length = min(config.MAX_TRANSLATION_LENGTH, backend.max_payload)
         
         if custom_dict_path and os.path.exists(custom_dict_path):
             self._load_custom_dictionary(custom_dict_path)
         
-        translator_type = "googletrans" if GOOGLETRANS_AVAILABLE else "deep-translator (primary)"
-        logger.info(f"Translation engine initialized using {translator_type}")
+        logger.info(f"Translation engine initialized using {self.backend.name} backend")
     
     def _load_custom_dictionary(self, dict_path: str):
         """Load custom terminology dictionary"""
         try:
             with open(dict_path, 'r', encoding='utf-8') as f:
                 self.custom_dict = json.load(f)
+            self.glossary = Glossary(self.custom_dict)
             logger.info(f"Loaded custom dictionary from {dict_path}")
         except Exception as e:
             logger.error(f"Error loading custom dictionary: {e}")
@@ -85,30 +138,48 @@ class TranslationEngine:
             Tuple of (language_code, confidence)
         """
         try:
-            # Try with googletrans if available
-            if GOOGLETRANS_AVAILABLE and self.translator:
-                detected = self.translator.detect(text)
-                return detected.lang, detected.confidence
-            else:
-                # Use langdetect as primary on Python 3.13+
-                lang = detect(text)
-                return lang, 0.99  # langdetect doesn't provide confidence
+            return self.language_detector.detect(text)
         except Exception as e:
-            logger.warning(f"Language detection failed: {e}")
-            try:
-                # Fallback to langdetect
-                lang = detect(text)
-                return lang, 0.95
-            except Exception as e2:
-                logger.error(f"Language detection failed: {e2}")
-                return 'en', 0.5
+            logger.error(f"Language detection failed: {e}")
+            return 'en', 0.5
+    
+    async def adetect_language(self, text: str) -> Tuple[str, float]:
+        """
+        Detect language of input text without blocking the event loop
+        
+        Memoized and script-based detections are answered inline; only texts
+        that need the statistical model are sent to a worker thread.
+        
+        Args:
+            text: Input text to analyze
+            
+        Returns:
+            Tuple of (language_code, confidence)
+        """
+        try:
+            detection = self.language_detector.detect_fast(text)
+            if detection is not None:
+                return detection
+            return await asyncio.to_thread(self.language_detector.detect, text)
+        except Exception as e:
+            logger.error(f"Language detection failed: {e}")
+            return 'en', 0.5
+    
+    def _detect_with_backend(self, text: str) -> Tuple[str, float]:
+        """Detect language with the backend, falling back to langdetect"""
+        try:
+            return self.backend.detect(text)
+        except Exception as e:
+            logger.warning(f"Backend language detection failed: {e}")
+            return detect_with_langdetect(text)
     
     def translate(
         self, 
         text: str, 
         target_lang: str = 'en',
         source_lang: Optional[str] = None,
-        preserve_entities: Optional[list] = None
+        preserve_entities: Optional[list] = None,
+        detection: Optional[Tuple[str, float]] = None
     ) -> Dict[str, any]:
         """
         Translate text to target language
@@ -118,86 +189,387 @@ class TranslationEngine:
             target_lang: Target language code (default: 'en')
             source_lang: Source language code (auto-detect if None)
             preserve_entities: List of entities to preserve during translation
+            detection: Pre-computed (language_code, confidence) from detect_language(),
+                used instead of detecting again when source_lang is None
             
         Returns:
             Dictionary containing translation results
         """
+        cache_key = self.cache.make_key(
+            text, source_lang, target_lang, tuple(preserve_entities or ())
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached['original_text'] = text
+            cached['from_cache'] = True
+            return cached
+        
+        def translate_once() -> Dict[str, any]:
+            # Another request may have filled the cache since the lookup above
+            cached_now = self.cache.get(cache_key)
+            if cached_now is not None:
+                return cached_now
+            fresh = self._translate_uncached(
+                text, target_lang, source_lang, preserve_entities, detection
+            )
+            if fresh['method'] != 'error':
+                self.cache.put(cache_key, fresh)
+            return fresh
+        
+        result, shared = self.coalescer.run(cache_key, translate_once)
+        return self._finish_request(text, cache_key, result, shared)
+    
+    async def atranslate(
+        self,
+        text: str,
+        target_lang: str = 'en',
+        source_lang: Optional[str] = None,
+        preserve_entities: Optional[list] = None,
+        detection: Optional[Tuple[str, float]] = None
+    ) -> Dict[str, any]:
+        """
+        Translate text to target language without blocking the event loop
+        
+        Same arguments, caching and coalescing as translate(); backend calls go
+        through the backend's async client, so one event loop can drive many
+        concurrent translations.
+        
+        Returns:
+            Dictionary containing translation results
+        """
+        cache_key = self.cache.make_key(
+            text, source_lang, target_lang, tuple(preserve_entities or ())
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached['original_text'] = text
+            cached['from_cache'] = True
+            return cached
+        
+        async def translate_once() -> Dict[str, any]:
+            cached_now = self.cache.get(cache_key)
+            if cached_now is not None:
+                return cached_now
+            fresh = await self._atranslate_uncached(
+                text, target_lang, source_lang, preserve_entities, detection
+            )
+            if fresh['method'] != 'error':
+                self.cache.put(cache_key, fresh)
+            return fresh
+        
+        result, shared = await self.coalescer.arun(cache_key, translate_once)
+        return self._finish_request(text, cache_key, result, shared)
+    
+    def _finish_request(
+        self,
+        text: str,
+        cache_key: tuple,
+        result: Dict[str, any],
+        shared: bool
+    ) -> Dict[str, any]:
+        """Copy coalesced results and fall back to a stale cache entry on error"""
+        if shared:
+            # Followers get their own copy of the leader's result
+            result = dict(result)
+            result['original_text'] = text
+            result['coalesced'] = True
+        
+        if result['method'] == 'error':
+            # Backend degraded: an expired cache entry beats untranslated text
+            stale = self.cache.get(cache_key, allow_expired=True)
+            if stale is not None:
+                logger.info("Serving stale cached translation while backend is failing")
+                stale['original_text'] = text
+                stale['from_cache'] = True
+                stale['stale'] = True
+                return stale
+        return result
+    
+    def _translate_uncached(
+        self,
+        text: str,
+        target_lang: str,
+        source_lang: Optional[str],
+        preserve_entities: Optional[list],
+        detection: Optional[Tuple[str, float]] = None
+    ) -> Dict[str, any]:
+        """Detect, mask entities and glossary terms and translate text without consulting the cache"""
         try:
-            # Detect source language if not provided
-            if source_lang is None:
-                source_lang, confidence = self.detect_language(text)
-                logger.info(f"Detected language: {source_lang} (confidence: {confidence})")
+            result, plan = self._prepare_translation(
+                text, target_lang, source_lang, preserve_entities, detection
+            )
+            if result is not None:
+                return result
+            
+            if plan['needs_backend']:
+                # Attempt translation (oversize input is split into chunks)
+                translated_text, method, num_chunks = self._translate_payload(
+                    plan['working_text'],
+                    plan['source_lang'],
+                    target_lang
+                )
             else:
-                confidence = 1.0
+                # Nothing left to translate once terms are masked
+                translated_text, method, num_chunks = plan['working_text'], 'glossary', 0
             
-            # Don't translate if source and target are the same
-            if source_lang == target_lang:
-                return {
-                    'original_text': text,
-                    'translated_text': text,
-                    'source_language': source_lang,
-                    'target_language': target_lang,
-                    'confidence': confidence,
-                    'method': 'no_translation_needed'
-                }
+            return self._finish_translation(text, target_lang, plan, translated_text, method, num_chunks)
             
-            # Replace entities with placeholders if provided
-            entity_map = {}
-            working_text = text
-            if preserve_entities:
-                for idx, entity in enumerate(preserve_entities):
-                    placeholder = f"__ENTITY_{idx}__"
-                    entity_map[placeholder] = entity
-                    working_text = working_text.replace(entity, placeholder)
+        except Exception as e:
+            logger.error(f"Translation error: {e}")
+            return self._error_result(text, source_lang, target_lang, e)
+    
+    async def _atranslate_uncached(
+        self,
+        text: str,
+        target_lang: str,
+        source_lang: Optional[str],
+        preserve_entities: Optional[list],
+        detection: Optional[Tuple[str, float]] = None
+    ) -> Dict[str, any]:
+        """Async version of _translate_uncached()"""
+        try:
+            # Detect up front (off the loop if needed) unless a glossary term answers it
+            if (source_lang is None and detection is None
+                    and self.glossary.lookup(text, None, target_lang) is None):
+                detection = await self.adetect_language(text)
             
-            # Attempt translation
-            try:
-                # Use googletrans if available (Python 3.12 and below)
-                if GOOGLETRANS_AVAILABLE and self.translator:
-                    translation = self.translator.translate(
-                        working_text,
-                        src=source_lang,
-                        dest=target_lang
-                    )
-                    translated_text = translation.text
-                    method = 'googletrans'
-                else:
-                    # Use deep-translator as primary (Python 3.13+)
-                    translator = GoogleTranslator(source=source_lang, target=target_lang)
-                    translated_text = translator.translate(working_text)
-                    method = 'deep_translator'
-            except Exception as e:
-                logger.warning(f"Primary translator failed: {e}, trying fallback")
-                # Fallback to deep-translator
-                translator = GoogleTranslator(source=source_lang, target=target_lang)
-                translated_text = translator.translate(working_text)
-                method = 'deep_translator_fallback'
+            result, plan = self._prepare_translation(
+                text, target_lang, source_lang, preserve_entities, detection
+            )
+            if result is not None:
+                return result
             
-            # Restore entities
-            for placeholder, entity in entity_map.items():
-                translated_text = translated_text.replace(placeholder, entity)
+            if plan['needs_backend']:
+                translated_text, method, num_chunks = await self._atranslate_payload(
+                    plan['working_text'],
+                    plan['source_lang'],
+                    target_lang
+                )
+            else:
+                translated_text, method, num_chunks = plan['working_text'], 'glossary', 0
             
-            return {
-                'original_text': text,
-                'translated_text': translated_text,
-                'source_language': source_lang,
-                'target_language': target_lang,
-                'confidence': confidence,
-                'method': method,
-                'preserved_entities': list(entity_map.values()) if entity_map else []
-            }
+            return self._finish_translation(text, target_lang, plan, translated_text, method, num_chunks)
             
         except Exception as e:
             logger.error(f"Translation error: {e}")
+            return self._error_result(text, source_lang, target_lang, e)
+    
+    def _prepare_translation(
+        self,
+        text: str,
+        target_lang: str,
+        source_lang: Optional[str],
+        preserve_entities: Optional[list],
+        detection: Optional[Tuple[str, float]] = None
+    ) -> Tuple[Optional[Dict[str, any]], Optional[Dict[str, any]]]:
+        """
+        Run every local step before the backend call: glossary lookup,
+        language detection, and entity/glossary masking
+        
+        Returns:
+            Tuple of (result, plan). result is set when no backend call is needed;
+            otherwise plan holds the masked text and what is needed to finish
+        """
+        # Selections that are exactly a glossary term need no detection or network
+        glossary_translation = self.glossary.lookup(text, source_lang, target_lang)
+        if glossary_translation is not None:
+            return {
+                'original_text': text,
+                'translated_text': glossary_translation,
+                'source_language': source_lang or self.glossary.source_lang,
+                'target_language': target_lang,
+                'confidence': 1.0,
+                'method': 'glossary',
+                'preserved_entities': [],
+                'glossary_terms': 1
+            }, None
+        
+        # Detect source language if not provided
+        if source_lang is None:
+            source_lang, confidence = detection or self.detect_language(text)
+            logger.info(f"Detected language: {source_lang} (confidence: {confidence})")
+        else:
+            confidence = 1.0
+        
+        # Don't translate if source and target are the same
+        if source_lang == target_lang:
             return {
                 'original_text': text,
                 'translated_text': text,
-                'source_language': source_lang or 'unknown',
+                'source_language': source_lang,
                 'target_language': target_lang,
-                'confidence': 0.0,
-                'method': 'error',
-                'error': str(e)
-            }
+                'confidence': confidence,
+                'method': 'no_translation_needed'
+            }, None
+        
+        # Replace entities and glossary terms with placeholders in one regex pass
+        placeholder_map = {}
+        preserved = []
+        glossary_terms = 0
+        working_text = text
+        use_glossary = self.glossary.applies_to(source_lang, target_lang)
+        if preserve_entities or use_glossary:
+            masker = self.glossary.get_masker(
+                target_lang if use_glossary else None,
+                preserve_entities or ()
+            )
+            working_text, placeholder_map = masker.mask(text)
+            for idx, restored in placeholder_map.items():
+                if masker.is_glossary_index(idx):
+                    glossary_terms += 1
+                else:
+                    preserved.append(restored)
+        
+        needs_backend = not placeholder_map or any(
+            ch.isalpha() for ch in PLACEHOLDER_PATTERN.sub('', working_text)
+        )
+        
+        return None, {
+            'source_lang': source_lang,
+            'confidence': confidence,
+            'working_text': working_text,
+            'placeholder_map': placeholder_map,
+            'preserved': preserved,
+            'glossary_terms': glossary_terms,
+            'needs_backend': needs_backend
+        }
+    
+    def _finish_translation(
+        self,
+        text: str,
+        target_lang: str,
+        plan: Dict[str, any],
+        translated_text: str,
+        method: str,
+        num_chunks: int
+    ) -> Dict[str, any]:
+        """Restore placeholders in the backend output and build the result dictionary"""
+        # Restore entities and substitute glossary translations
+        translated_text = PlaceholderMasker.unmask(translated_text, plan['placeholder_map'])
+        
+        return {
+            'original_text': text,
+            'translated_text': translated_text,
+            'source_language': plan['source_lang'],
+            'target_language': target_lang,
+            'confidence': plan['confidence'],
+            'method': method,
+            'preserved_entities': plan['preserved'],
+            'glossary_terms': plan['glossary_terms'],
+            'chunks': num_chunks
+        }
+    
+    def _translate_payload(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str
+    ) -> Tuple[str, str, int]:
+        """
+        Translate text, splitting it on sentence boundaries when it exceeds
+        max_text_length and translating the chunks in parallel
+        
+        Args:
+            text: Text to translate (entities already masked)
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Tuple of (translated_text, method, number_of_chunks)
+        """
+        if len(text) <= self.max_text_length:
+            translated_text, method = self._translate_text(text, source_lang, target_lang)
+            return translated_text, method, 1
+        
+        chunks = split_into_chunks(text, self.max_text_length)
+        logger.info(f"Text of {len(text)} chars split into {len(chunks)} chunks")
+        
+        def translate_chunk(chunk: str) -> Tuple[str, str]:
+            leading, content, trailing = split_whitespace(chunk)
+            if not content:
+                return chunk, None
+            translated, chunk_method = self._translate_text(content, source_lang, target_lang)
+            return f"{leading}{translated}{trailing}", chunk_method
+        
+        workers = min(len(chunks), config.BATCH_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='translate-chunk') as executor:
+            # Run each chunk in a copy of this context so it keeps the request priority
+            futures = [
+                executor.submit(contextvars.copy_context().run, translate_chunk, chunk)
+                for chunk in chunks
+            ]
+            translated_chunks = [future.result() for future in futures]
+        
+        methods = [m for _, m in translated_chunks if m]
+        method = methods[0] if methods and len(set(methods)) == 1 else 'mixed'
+        return ''.join(t for t, _ in translated_chunks), method, len(chunks)
+    
+    def _translate_text(self, text: str, source_lang: str, target_lang: str) -> Tuple[str, str]:
+        """
+        Send a single piece of text to the translation backend, retrying with
+        backoff within the call deadline and failing fast while the circuit is open
+        
+        Every attempt first takes a token from the backend's rate limiter at the
+        priority of the current context. The token is taken outside the circuit
+        breaker's accounting: running out of time waiting for one is not a
+        backend failure.
+        
+        Args:
+            text: Text to translate (at most max_text_length chars)
+            source_lang: Source language code
+            target_lang: Target language code
+            
+        Returns:
+            Tuple of (translated_text, method)
+        """
+        def attempt(timeout: Optional[float]) -> str:
+            return self.backend.translate(text, source_lang, target_lang, timeout=timeout)
+        
+        translated_text = self.retry_policy.execute(
+            attempt,
+            breaker=self.circuit_breaker,
+            throttle=partial(self.rate_limiter.acquire, current_priority())
+        )
+        return translated_text, self.backend.name
+    
+    async def _atranslate_payload(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str
+    ) -> Tuple[str, str, int]:
+        """Async version of _translate_payload(); chunks are translated concurrently"""
+        if len(text) <= self.max_text_length:
+            translated_text, method = await self._atranslate_text(text, source_lang, target_lang)
+            return translated_text, method, 1
+        
+        chunks = split_into_chunks(text, self.max_text_length)
+        logger.info(f"Text of {len(text)} chars split into {len(chunks)} chunks")
+        
+        async def translate_chunk(chunk: str) -> Tuple[str, str]:
+            leading, content, trailing = split_whitespace(chunk)
+            if not content:
+                return chunk, None
+            translated, chunk_method = await self._atranslate_text(content, source_lang, target_lang)
+            return f"{leading}{translated}{trailing}", chunk_method
+        
+        translated_chunks = await asyncio.gather(*(translate_chunk(chunk) for chunk in chunks))
+        
+        methods = [m for _, m in translated_chunks if m]
+        method = methods[0] if methods and len(set(methods)) == 1 else 'mixed'
+        return ''.join(t for t, _ in translated_chunks), method, len(chunks)
+    
+    async def _atranslate_text(self, text: str, source_lang: str, target_lang: str) -> Tuple[str, str]:
+        """Async version of _translate_text() with the same retry policy and circuit breaker"""
+        async def attempt(timeout: Optional[float]) -> str:
+            return await self.backend.atranslate(text, source_lang, target_lang, timeout=timeout)
+        
+        translated_text = await self.retry_policy.aexecute(
+            attempt,
+            breaker=self.circuit_breaker,
+            throttle=partial(self.rate_limiter.aacquire, current_priority())
+        )
+        return translated_text, self.backend.name
     
     def translate_with_context(
         self,
@@ -220,59 +592,527 @@ class TranslationEngine:
         Returns:
             Translation result dictionary
         """
-        # Build full context
-        full_context = f"{context_before} {text} {context_after}".strip()
+        entities_key = tuple(preserve_entities or ())
+        
+        # Sliding over a document: this sentence may already have been
+        # translated as context of an earlier window
+        cached = self.cache.get(self._context_cache_key(text, target_lang, entities_key))
+        if cached is not None:
+            cached['from_cache'] = True
+            return cached
         
-        # Translate with full context
+        # Wrap each part in numbered markers so the main segment can be cut out exactly
+        parts = [context_before.strip()] if context_before.strip() else []
+        main_idx = len(parts)
+        parts.append(text)
+        if context_after.strip():
+            parts.append(context_after.strip())
+        if len(parts) == 1 or not text.strip():
+            # No context, or nothing of our own to translate within it
+            result = self.translate(text, target_lang=target_lang, preserve_entities=preserve_entities)
+            result['context_used'] = False
+            return result
+        
+        # The source language is that of the selection, not of its surroundings
+        detection = self.detect_language(text)
         result = self.translate(
-            full_context,
+            join_segments(parts),
             target_lang=target_lang,
-            preserve_entities=preserve_entities
+            preserve_entities=preserve_entities,
+            detection=detection
         )
+        if result['method'] == 'error':
+            # The failed payload is the marker-joined window; report the main text only
+            result['original_text'] = text
+            result['translated_text'] = text
+            result['context_used'] = False
+            return result
         
-        # Try to extract just the main translation
-        # This is a simple heuristic - in production, use better alignment
-        if result['method'] != 'error':
-            words_before = len(context_before.split())
-            words_main = len(text.split())
-            translated_words = result['translated_text'].split()
-            
-            # Extract approximate translated portion
-            if len(translated_words) > words_main:
-                start_idx = max(0, words_before)
-                end_idx = min(len(translated_words), start_idx + words_main + 5)
-                main_translation = ' '.join(translated_words[start_idx:end_idx])
-            else:
-                main_translation = result['translated_text']
-            
-            result['translated_text'] = main_translation
-            result['context_used'] = True
+        translated_parts = split_segments(result['translated_text'], len(parts))
+        if translated_parts is None:
+            # Markers were mangled: translate the main text alone rather than guess
+            logger.warning("Context markers lost in translation, translating main text alone")
+            result = self.translate(
+                text,
+                target_lang=target_lang,
+                preserve_entities=preserve_entities,
+                detection=detection
+            )
+            result['context_used'] = False
+            return result
+        
+        # Remember every sentence of the window so neighbours are not re-translated
+        for original, translated in zip(parts, translated_parts):
+            segment_result = dict(result)
+            segment_result['original_text'] = original
+            segment_result['translated_text'] = translated
+            segment_result['context_used'] = True
+            self.cache.put(self._context_cache_key(original, target_lang, entities_key), segment_result)
         
+        result['original_text'] = text
+        result['translated_text'] = translated_parts[main_idx]
+        result['context_used'] = True
         return result
     
+    def _context_cache_key(self, text: str, target_lang: str, entities_key: tuple) -> tuple:
+        """Cache key for a sentence translated together with its context"""
+        return self.cache.make_key(text, None, target_lang, 'context', entities_key)
+    
     def batch_translate(
         self,
         texts: list,
         target_lang: str = 'en',
-        source_lang: Optional[str] = None
+        source_lang: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        priority: str = TokenBucket.BULK,
+        pack: bool = False
     ) -> list:
         """
-        Translate multiple texts
+        Translate multiple texts concurrently
         
         Args:
             texts: List of texts to translate
             target_lang: Target language code
             source_lang: Source language code
+            max_workers: Number of concurrent requests (default: config.BATCH_MAX_WORKERS),
+                capped at what the rate limiter can serve within the retry deadline
+            progress_callback: Called as callback(completed, total) after each item
+            priority: Rate limiter priority; bulk by default so interactive
+                requests are served first
+            pack: Join short texts into as few backend requests as the payload
+                limit allows (useful for tables of short UI strings)
             
         Returns:
-            List of translation result dictionaries
+            List of translation result dictionaries, in the same order as texts.
+            Failed items carry method 'error' instead of aborting the batch.
         """
-        results = []
-        for text in texts:
-            result = self.translate(text, target_lang, source_lang)
-            results.append(result)
+        total = len(texts)
+        results = [None] * total
+        if total == 0:
+            return results
+        
+        completed = 0
+        
+        def report(idx: int, result: Dict[str, any]):
+            nonlocal completed
+            results[idx] = result
+            completed += 1
+            if progress_callback:
+                try:
+                    progress_callback(completed, total)
+                except Exception as e:
+                    logger.warning(f"Progress callback failed: {e}")
+        
+        def translate_item(idx: int) -> list:
+            return [(idx, self.translate(texts[idx], target_lang, source_lang))]
+        
+        # Jobs are (indices, func); func returns [(index, result), ...] for those items
+        if pack:
+            jobs = self._plan_packed_batch(texts, target_lang, source_lang, report, translate_item)
+        else:
+            jobs = [([idx], partial(translate_item, idx)) for idx in range(total)]
+        
+        if not jobs:
+            return results
+        
+        def run_job(job: Callable[[], list]) -> list:
+            with request_priority(priority):
+                return job()
+        
+        workers = min(self._rate_limited_concurrency(max_workers or config.BATCH_MAX_WORKERS), len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-translate') as executor:
+            futures = {executor.submit(run_job, job): indices for indices, job in jobs}
+            
+            for future in as_completed(futures):
+                try:
+                    job_results = future.result()
+                except Exception as e:
+                    indices = futures[future]
+                    logger.error(f"Batch items {indices} failed: {e}")
+                    job_results = [
+                        (idx, self._error_result(texts[idx], source_lang, target_lang, e))
+                        for idx in indices
+                    ]
+                for idx, result in job_results:
+                    report(idx, result)
+        
         return results
     
+    def _plan_packed_batch(
+        self,
+        texts: list,
+        target_lang: str,
+        source_lang: Optional[str],
+        report: Callable[[int, Dict[str, any]], None],
+        translate_item: Callable[[int], list]
+    ) -> list:
+        """
+        Resolve what can be answered locally and group the rest into packed requests
+        
+        Cached, glossary-only and same-language items are reported immediately.
+        The remaining masked texts are grouped per source language into payloads
+        of at most max_text_length characters joined with segment markers.
+        
+        Returns:
+            List of (indices, job) pairs for batch_translate() to run
+        """
+        jobs = []
+        groups: Dict[str, list] = {}
+        
+        for idx, text in enumerate(texts):
+            cache_key = self.cache.make_key(text, source_lang, target_lang, ())
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                cached['original_text'] = text
+                cached['from_cache'] = True
+                report(idx, cached)
+                continue
+            
+            try:
+                result, plan = self._prepare_translation(text, target_lang, source_lang, None)
+            except Exception as e:
+                report(idx, self._error_result(text, source_lang, target_lang, e))
+                continue
+            if result is None and not plan['needs_backend']:
+                result = self._finish_translation(text, target_lang, plan, plan['working_text'], 'glossary', 0)
+            if result is not None:
+                self.cache.put(cache_key, result)
+                report(idx, result)
+                continue
+            
+            leading, content, trailing = split_whitespace(plan['working_text'])
+            if not content or len(join_segments([content])) > self.max_text_length:
+                # Too long to share a request (or nothing to pack): translate on its own
+                jobs.append(([idx], partial(translate_item, idx)))
+                continue
+            groups.setdefault(plan['source_lang'], []).append((idx, cache_key, plan, content))
+        
+        for detected_lang, members in groups.items():
+            group, size = [], 0
+            for member in members:
+                # Marker, space and separator added by join_segments()
+                added = len(MARKER_TEMPLATE.format(len(group))) + 2 + len(member[3])
+                if group and size + added > self.max_text_length:
+                    jobs.append(self._packed_job(texts, target_lang, source_lang, detected_lang, group, translate_item))
+                    group, size = [], 0
+                    added = len(MARKER_TEMPLATE.format(0)) + 2 + len(member[3])
+                group.append(member)
+                size += added
+            if group:
+                jobs.append(self._packed_job(texts, target_lang, source_lang, detected_lang, group, translate_item))
+        
+        return jobs
+    
+    def _packed_job(
+        self,
+        texts: list,
+        target_lang: str,
+        source_lang: Optional[str],
+        detected_lang: str,
+        group: list,
+        translate_item: Callable[[int], list]
+    ) -> Tuple[list, Callable[[], list]]:
+        """Build the (indices, job) pair translating a group of (index, cache_key, plan, content) members in one request"""
+        indices = [idx for idx, _, _, _ in group]
+        if len(group) == 1:
+            return indices, partial(translate_item, indices[0])
+        
+        def run() -> list:
+            translated_parts = None
+            try:
+                translated, method = self._translate_text(
+                    join_segments([content for _, _, _, content in group]),
+                    detected_lang,
+                    target_lang
+                )
+                translated_parts = split_segments(translated, len(group))
+            except Exception as e:
+                logger.warning(f"Packed request of {len(group)} segments failed: {e}")
+            
+            if translated_parts is None:
+                # Markers lost or request failed: fall back to one request per segment
+                logger.info(f"Translating {len(group)} packed segments individually")
+                return [pair for idx, _, _, _ in group for pair in translate_item(idx)]
+            
+            packed_results = []
+            for (idx, cache_key, plan, _), part in zip(group, translated_parts):
+                leading, _, trailing = split_whitespace(plan['working_text'])
+                result = self._finish_translation(
+                    texts[idx], target_lang, plan, f"{leading}{part}{trailing}", method, 1
+                )
+                result['packed'] = True
+                self.cache.put(cache_key, result)
+                packed_results.append((idx, result))
+            return packed_results
+        
+        return indices, run
+    
+    def translate_to_many(
+        self,
+        text: str,
+        targets: Optional[list] = None,
+        source_lang: Optional[str] = None,
+        preserve_entities: Optional[list] = None,
+        memory=None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Dict[str, any]]:
+        """
+        Translate one text into several target languages concurrently
+        
+        The source language is detected once and shared by every target.
+        Targets already in the translation memory are answered from it, and
+        new translations are stored back.
+        
+        Args:
+            text: Text to translate
+            targets: Target language codes (default: all supported languages)
+            source_lang: Source language code (auto-detect if None)
+            preserve_entities: List of entities to preserve during translation
+            memory: Optional TranslationMemory to reuse and store translations
+            max_workers: Number of concurrent requests (default: config.BATCH_MAX_WORKERS),
+                capped at what the rate limiter can serve within the retry deadline
+            
+        Returns:
+            Dictionary mapping each target language to its result dictionary,
+            in the order of targets. Each result carries 'elapsed_ms'.
+        """
+        targets = list(dict.fromkeys(targets or self.SUPPORTED_LANGUAGES))
+        results = {}
+        
+        detection = None
+        if source_lang is None:
+            detection = self.detect_language(text)
+        detected_lang = source_lang or detection[0]
+        
+        if memory is not None:
+            start = time.perf_counter()
+            stored = memory.find_translations(text, detected_lang, targets)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for lang, record in stored.items():
+                results[lang] = {
+                    'original_text': text,
+                    'translated_text': record['translated_text'],
+                    'source_language': record['source_lang'],
+                    'target_language': record['target_lang'],
+                    'confidence': record['confidence'],
+                    'method': 'cache',
+                    'elapsed_ms': elapsed_ms
+                }
+        
+        def translate_target(target_lang: str) -> Dict[str, any]:
+            start = time.perf_counter()
+            result = self.translate(text, target_lang, source_lang, preserve_entities, detection)
+            result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+            return result
+        
+        pending = [lang for lang in targets if lang not in results]
+        if pending:
+            workers = min(self._rate_limited_concurrency(max_workers or config.BATCH_MAX_WORKERS), len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='translate-target') as executor:
+                futures = {
+                    executor.submit(contextvars.copy_context().run, translate_target, lang): lang
+                    for lang in pending
+                }
+                for future in as_completed(futures):
+                    lang = futures[future]
+                    try:
+                        results[lang] = future.result()
+                    except Exception as e:
+                        logger.error(f"Translation to {lang} failed: {e}")
+                        results[lang] = self._error_result(text, source_lang, lang, e)
+                        results[lang]['elapsed_ms'] = 0.0
+        
+        if memory is not None:
+            # Store from this thread; the memory's connection is not shared with workers
+            for lang in pending:
+                result = results[lang]
+                if result['method'] in ('error', 'no_translation_needed'):
+                    continue
+                memory.add_translation(
+                    original_text=text,
+                    translated_text=result['translated_text'],
+                    source_lang=result['source_language'],
+                    target_lang=lang,
+                    entities=result.get('preserved_entities'),
+                    confidence=result['confidence'],
+                    method=result['method']
+                )
+        
+        return {lang: results[lang] for lang in targets}
+    
+    async def abatch_translate(
+        self,
+        texts: list,
+        target_lang: str = 'en',
+        source_lang: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        priority: str = TokenBucket.BULK
+    ) -> list:
+        """
+        Translate multiple texts concurrently on the running event loop
+        
+        Args:
+            texts: List of texts to translate
+            target_lang: Target language code
+            source_lang: Source language code
+            max_concurrency: Items in flight at once (default: config.ASYNC_MAX_CONCURRENCY),
+                capped at what the rate limiter can serve within the retry deadline
+            progress_callback: Called as callback(completed, total) after each item
+            priority: Rate limiter priority (default: bulk)
+            
+        Returns:
+            List of translation result dictionaries, in the same order as texts.
+            Failed items carry method 'error' instead of aborting the batch.
+        """
+        total = len(texts)
+        if total == 0:
+            return []
+        
+        semaphore = asyncio.Semaphore(
+            self._rate_limited_concurrency(max_concurrency or config.ASYNC_MAX_CONCURRENCY)
+        )
+        completed = 0
+        
+        async def translate_item(idx: int, text: str) -> Dict[str, any]:
+            nonlocal completed
+            async with semaphore:
+                try:
+                    with request_priority(priority):
+                        result = await self.atranslate(text, target_lang, source_lang)
+                except Exception as e:
+                    logger.error(f"Batch item {idx} failed: {e}")
+                    result = self._error_result(text, source_lang, target_lang, e)
+            
+            completed += 1
+            if progress_callback:
+                try:
+                    progress_callback(completed, total)
+                except Exception as e:
+                    logger.warning(f"Progress callback failed: {e}")
+            return result
+        
+        return list(await asyncio.gather(
+            *(translate_item(idx, text) for idx, text in enumerate(texts))
+        ))
+    
+    def _rate_limited_concurrency(self, requested: int) -> int:
+        """
+        Cap the requests a batch keeps in flight to what the rate limiter can serve
+        
+        Requests started beyond this would time out waiting for a token; half
+        the retry deadline is left for the backend calls themselves.
+        
+        Args:
+            requested: Concurrency asked for
+            
+        Returns:
+            Concurrency to use (at least 1)
+        """
+        if self.retry_policy.timeout:
+            capacity = self.rate_limiter.capacity(self.retry_policy.timeout / 2)
+            if capacity is not None and capacity < requested:
+                logger.debug(f"Batch concurrency capped at {capacity} by the rate limit")
+                return max(1, capacity)
+        return max(1, requested)
+    
+    def _error_result(
+        self,
+        text: str,
+        source_lang: Optional[str],
+        target_lang: str,
+        error: Exception
+    ) -> Dict[str, any]:
+        """
+        Build the result dictionary returned when a translation fails
+        
+        'transient' tells whether the same request may succeed later
+        (backend down, rate limited, circuit open) or will keep failing.
+        """
+        return {
+            'original_text': text,
+            'translated_text': text,
+            'source_language': source_lang or 'unknown',
+            'target_language': target_lang,
+            'confidence': 0.0,
+            'method': 'error',
+            'error': str(error),
+            'transient': is_transient_error(error)
+        }
+    
+    def get_cache_stats(self) -> Dict[str, any]:
+        """
+        Get in-process translation cache statistics
+        
+        Returns:
+            Dictionary with hit/miss/eviction counters and current size
+        """
+        return self.cache.get_stats()
+    
+    def clear_cache(self):
+        """Remove all cached translations"""
+        self.cache.clear()
+    
+    def set_cache_enabled(self, enabled: bool):
+        """Enable or disable the in-process translation cache"""
+        self.cache.enabled = enabled
+        if not enabled:
+            self.cache.clear()
+    
+    def get_detection_stats(self) -> Dict[str, int]:
+        """
+        Get language detection statistics
+        
+        Returns:
+            Dictionary with detection cache hits, script fast-path hits and model calls
+        """
+        return self.language_detector.get_stats()
+    
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """
+        Get request coalescing statistics
+        
+        Returns:
+            Dictionary with executed, coalesced and in-flight request counts
+        """
+        return self.coalescer.get_stats()
+    
+    def get_circuit_stats(self) -> Dict[str, any]:
+        """
+        Get circuit breaker statistics for the backend
+        
+        Returns:
+            Dictionary with circuit state, consecutive failures and rejected calls
+        """
+        return self.circuit_breaker.get_stats()
+    
+    def get_rate_limit_stats(self) -> Dict[str, any]:
+        """
+        Get rate limiter statistics for the backend
+        
+        Returns:
+            Dictionary with the configured rate and per-priority wait metrics
+        """
+        return self.rate_limiter.get_stats()
+    
+    def get_connection_stats(self) -> Dict[str, int]:
+        """
+        Get backend connection statistics
+        
+        Returns:
+            Dictionary of backend request counters (for Google: new vs reused connections)
+        """
+        return self.backend.get_stats()
+    
+    def close(self):
+        """Release backend resources such as pooled network connections"""
+        self.backend.close()
+    
+    async def aclose(self):
+        """Release async backend resources such as the shared HTTP session"""
+        await self.backend.aclose()
+    
     def get_supported_languages(self) -> Dict[str, str]:
         """Get dictionary of supported languages"""
         return self.SUPPORTED_LANGUAGES.copy()
@@ -2,10 +2,31 @@
 Unit tests for Context Analyzer
 """
 
+import threading
 import unittest
+import spacy
 from src.context_analyzer import ContextAnalyzer
 
 
+class SlowLoadingAnalyzer(ContextAnalyzer):
+    """Analyzer whose model loading waits until released"""
+    
+    def __init__(self, **kwargs):
+        self.release = threading.Event()
+        super().__init__(**kwargs)
+    
+    def _load_models(self):
+        self.release.wait(5)
+        super()._load_models()
+
+
+class FailingAnalyzer(ContextAnalyzer):
+    """Analyzer whose model loading always fails"""
+    
+    def _load_models(self):
+        raise OSError("model files missing")
+
+
 class TestContextAnalyzer(unittest.TestCase):
     """Test cases for context analyzer"""
     
@@ -55,6 +76,30 @@ class TestContextAnalyzer(unittest.TestCase):
         self.assertIn('main_text', context)
         self.assertIn('context_after', context)
     
+    def test_context_spanning_sentences(self):
+        """Test that a selection crossing a sentence boundary gets both sentences"""
+        full_text = "First one. Second one. Third one. Fourth one."
+        sentences = ["First one.", "Second one.", "Third one.", "Fourth one."]
+        
+        context = self.analyzer.extract_contexts(full_text, ["one. third"], 1, 1, sentences=sentences)[0]
+        
+        self.assertEqual(context['context_before'], "First one.")
+        self.assertEqual(context['main_text'], "Second one. Third one.")
+        self.assertEqual(context['context_after'], "Fourth one.")
+    
+    def test_contexts_for_many_selections(self):
+        """Test that repeated strings and offsets resolve to their own sentences"""
+        full_text = "Save the file. Close it. Save the file. Exit."
+        sentences = ["Save the file.", "Close it.", "Save the file.", "Exit."]
+        
+        contexts = self.analyzer.extract_contexts(
+            full_text, ["Save the file", "Save the file", (25, 29), "missing"], 0, 1, sentences=sentences
+        )
+        
+        self.assertEqual([c['context_after'] for c in contexts[:2]], ["Close it.", "Exit."])
+        self.assertEqual(contexts[2]['main_text'], "Save the file.")
+        self.assertEqual(contexts[3], {'context_before': '', 'main_text': 'missing', 'context_after': ''})
+    
     def test_tokenization(self):
         """Test tokenization and preprocessing"""
         text = "The quick brown fox jumps."
@@ -111,6 +156,115 @@ class TestContextAnalyzer(unittest.TestCase):
         self.assertIn('key_terms', analysis)
         self.assertIn('sentences', analysis)
 
+    
+    def test_stages_share_one_parse(self):
+        """Test that spaCy stages on the same text reuse one Doc"""
+        analyzer = ContextAnalyzer()
+        text = "Ada Lovelace wrote programs. Charles Babbage built engines."
+        analyzer.segment_sentences(text)
+        analyzer.extract_named_entities(text)
+        analyzer.get_entity_texts(text)
+        analyzer.extract_context(text, "Charles Babbage")
+        
+        stats = analyzer.get_parse_stats()
+        self.assertEqual(stats['parses'], 1)
+        self.assertEqual(stats['doc_cache_hits'], 3)
+    
+    def test_tasks_run_only_needed_components(self):
+        """Test that segmentation skips NER and entities run only NER components"""
+        analyzer = ContextAnalyzer()
+        analyzer.wait_until_ready()
+        analyzer.nlp = spacy.blank('en')
+        analyzer.nlp.add_pipe('sentencizer')
+        ruler = analyzer.nlp.add_pipe('entity_ruler')
+        ruler.add_patterns([{'label': 'PERSON', 'pattern': 'Ada Lovelace'}])
+        
+        sentences = analyzer.segment_sentences("Ada Lovelace wrote programs. She was first.")
+        self.assertEqual(len(sentences), 2)
+        self.assertEqual(analyzer.get_parse_stats()['component_runs'], {'sentencizer': 1})
+        
+        entities = analyzer.extract_named_entities("Charles Babbage met Ada Lovelace.")
+        self.assertEqual([ent['text'] for ent in entities], ['Ada Lovelace'])
+        self.assertEqual(analyzer.get_parse_stats()['component_runs'], {'sentencizer': 1, 'entity_ruler': 1})
+        
+        # Entities on an already segmented text extend the cached Doc
+        analyzer.extract_named_entities("Ada Lovelace wrote programs. She was first.")
+        stats = analyzer.get_parse_stats()
+        self.assertEqual(stats['parses'], 2)
+        self.assertEqual(stats['component_runs'], {'sentencizer': 1, 'entity_ruler': 2})
+    
+    def test_analyze_many_matches_single_analysis(self):
+        """Test that bulk analysis yields the per-text results in order"""
+        texts = [
+            "John Smith is a software engineer. He works on AI algorithms.",
+            "Hello, thanks a lot!",
+            "The server compiles the code. The client calls the API. Debug the loop.",
+            "Don't forget the e-mail, it's a thank-you note."
+        ]
+        results = list(self.analyzer.analyze_many(texts, batch_size=2))
+        
+        self.assertEqual(len(results), len(texts))
+        for text, result in zip(texts, results):
+            expected = self.analyzer.analyze_full_context(text)
+            self.assertEqual(result['sentences'], expected['sentences'])
+            self.assertEqual(result['entities'], expected['entities'])
+            self.assertEqual(result['domain_scores'], expected['domain_scores'])
+            self.assertEqual(result['primary_domain'], expected['primary_domain'])
+            self.assertEqual([term for term, _ in result['key_terms']],
+                             [term for term, _ in expected['key_terms']])
+    
+    def test_batched_key_terms_match_tfidf(self):
+        """Test that one vectorizer pass scores each text like its own TF-IDF"""
+        sentence_lists = [
+            ["Database server client.", "Server loop array loop.", "Debug syntax compile server."],
+            ["The cat sat.", "The dog ran after the cat."],
+            ["Only one sentence here."]
+        ]
+        preprocessing = {'filtered_tokens': ['only', 'one', 'sentence']}
+        batched = self.analyzer._batch_key_terms(sentence_lists, [preprocessing] * 3)
+        
+        for sentences, terms in zip(sentence_lists[:2], batched):
+            expected = self.analyzer.extract_key_terms(' '.join(sentences), sentences=sentences)
+            self.assertEqual([term for term, _ in terms], [term for term, _ in expected])
+            for (_, score), (_, expected_score) in zip(terms, expected):
+                self.assertAlmostEqual(score, expected_score)
+        self.assertEqual(batched[2], [('only', 1), ('one', 1), ('sentence', 1)])
+    
+    def test_models_load_lazily(self):
+        """Test that models are loaded on first use, not at construction"""
+        analyzer = ContextAnalyzer()
+        self.assertFalse(analyzer.is_ready())
+        self.assertIsNone(analyzer.nlp)
+        
+        analyzer.segment_sentences("One sentence. Another one.")
+        self.assertTrue(analyzer.is_ready())
+    
+    def test_degraded_analysis_before_warm_up(self):
+        """Test that analysis during background loading is cheap and degraded"""
+        analyzer = SlowLoadingAnalyzer(load_in_background=True)
+        text = "The server runs the algorithm on the database. Thanks, that was fun!"
+        
+        analysis = analyzer.analyze_full_context(text, "algorithm")
+        self.assertTrue(analysis['degraded'])
+        self.assertEqual(analysis['sentences'], ["The server runs the algorithm on the database.", "Thanks, that was fun!"])
+        self.assertEqual(analysis['context']['main_text'], "The server runs the algorithm on the database.")
+        self.assertEqual(analysis['entities'], [])
+        self.assertEqual(analysis['primary_domain'], 'technical')
+        
+        analyzer.release.set()
+        self.assertTrue(analyzer.wait_until_ready(timeout=10))
+        self.assertTrue(analyzer.is_ready())
+    
+    def test_degraded_analysis_after_failed_load(self):
+        """Test that a failed model load keeps serving degraded analyses"""
+        for load_in_background in (True, False):
+            analyzer = FailingAnalyzer(load_in_background=load_in_background)
+            self.assertFalse(analyzer.wait_until_ready(timeout=10))
+            
+            analysis = analyzer.analyze_full_context("The server crashed. Restart it.", "server")
+            self.assertTrue(analysis['degraded'])
+            self.assertEqual(analysis['primary_domain'], 'technical')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+"""
+Unit tests for Domain Classifier
+"""
+
+import unittest
+from src.domain_classifier import DomainClassifier
+
+
+class TestDomainClassifier(unittest.TestCase):
+    """Test cases for compiled domain classification"""
+
+    def setUp(self):
+        """Create a classifier with single-word and phrase keywords"""
+        self.classifier = DomainClassifier({
+            'technical': ['algorithm', 'API', 'server', 'unit test'],
+            'casual': ['thanks', 'thank you', 'see you later', 'bye']
+        })
+
+    def test_phrases_and_case(self):
+        """Test that multi-word keywords match and keywords ignore case"""
+        scores = self.classifier.score("Thank you, see you later! The api is down.")
+
+        self.assertEqual(scores['casual'], 0.5)
+        self.assertEqual(scores['technical'], 0.25)
+
+    def test_partial_phrase_does_not_match(self):
+        """Test that a phrase only matches when all of its tokens are present in order"""
+        self.assertEqual(self.classifier.score("You thank me later")['casual'], 0.0)
+        self.assertEqual(self.classifier.classify("Nothing relevant here"), 'general')
+
+    def test_batch_matches_single_scores(self):
+        """Test that the sparse batch scorer agrees with per-text scoring"""
+        texts = [
+            "The algorithm runs on the server.",
+            "Thanks, bye!",
+            "",
+            ["unit", "test", "the", "api"]
+        ]
+        batch = self.classifier.score_batch(texts)
+
+        for text, scores in zip(texts[:3], batch):
+            for domain, score in self.classifier.score(text).items():
+                self.assertAlmostEqual(scores[domain], score)
+        self.assertAlmostEqual(batch[3]['technical'], 0.5)
+        self.assertEqual(self.classifier.classify_batch(texts), ['technical', 'casual', 'general', 'technical'])
+
+    def test_sources_are_merged(self):
+        """Test that config keywords and the dictionary's domains block are merged in"""
+        classifier = DomainClassifier.from_sources(
+            {'technical': ['algorithm']},
+            {'domains': {'medical': ['diagnosis', 'blood pressure'], 'technical': ['kernel']}}
+        )
+
+        self.assertEqual(classifier.classify("Check the blood pressure"), 'medical')
+        self.assertGreater(classifier.score("Rebuild the kernel")['technical'], 0)
+        # 'hey' and 'thank you' only come from config.CASUAL_KEYWORDS
+        self.assertEqual(classifier.classify("Hey, thank you"), 'casual')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for IDF Model
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+from src.context_analyzer import ContextAnalyzer
+from src.idf_model import IDFModel
+from src.memory import TranslationMemory
+
+
+class TestIDFModel(unittest.TestCase):
+    """Test cases for the corpus document frequency model"""
+
+    def setUp(self):
+        """Create a temporary memory and model directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory = TranslationMemory(os.path.join(self.temp_dir, 'memory.db'))
+        self.path = os.path.join(self.temp_dir, 'idf_model')
+
+    def tearDown(self):
+        """Clean up temporary files"""
+        self.memory.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _store(self, texts, target_lang='es'):
+        for text in texts:
+            self.memory.add_translation(text, f"[{target_lang}] {text}", 'en', target_lang)
+
+    def test_incremental_update_counts_each_text_once(self):
+        """Test that updates only read new rows and skip repeated texts"""
+        self._store(["The server restarted", "The server crashed"])
+        self._store(["The server restarted"], target_lang='fr')
+        model = IDFModel(min_documents=1)
+
+        self.assertEqual(model.update_from_memory(self.memory), 2)
+        self.assertEqual(model.update_from_memory(self.memory), 0)
+
+        self._store(["A quantum kernel crashed"])
+        self.assertEqual(model.update_from_memory(self.memory), 1)
+        self.assertEqual(model.num_documents, 3)
+        np.testing.assert_allclose(
+            model.idf(['server', 'quantum', 'unseen']),
+            np.log(4 / np.array([3, 2, 1])) + 1
+        )
+
+    def test_save_and_load_memory_mapped(self):
+        """Test that a saved model reloads memory-mapped and keeps updating"""
+        self._store(["Database migration failed", "Database backup finished"])
+        model = IDFModel(self.path, min_documents=1)
+        model.update_from_memory(self.memory)
+        model.save()
+
+        loaded = IDFModel(self.path, min_documents=1)
+        self.assertIsInstance(loaded._state.doc_freq, np.memmap)
+        self.assertEqual(loaded.get_stats(), model.get_stats())
+
+        self._store(["Database index rebuilt"])
+        self.assertEqual(loaded.update_from_memory(self.memory), 1)
+        loaded.save()
+        self.assertEqual(IDFModel(self.path).num_documents, 3)
+
+    def test_rare_terms_rank_first(self):
+        """Test that corpus-rare terms outrank common ones"""
+        model = IDFModel(min_documents=1)
+        model.add_documents([f"Please restart the server {i}" for i in range(20)] + ["Kubernetes pod"])
+
+        terms = model.key_terms("Restart the server before the Kubernetes upgrade", top_n=3)
+
+        self.assertEqual([term for term, _ in terms][:2], ['upgrade', 'kubernetes'])
+        self.assertAlmostEqual(sum(score ** 2 for _, score in model.key_terms("server kubernetes upgrade")), 1.0)
+
+    def test_readers_see_consistent_state(self):
+        """Test that scoring while documents are added never mixes two model versions"""
+        model = IDFModel(min_documents=1)
+        errors = []
+
+        def read():
+            while not done.is_set():
+                try:
+                    model.key_terms(f"term{model.num_documents} server", top_n=2)
+                except Exception as e:
+                    errors.append(e)
+
+        done = threading.Event()
+        reader = threading.Thread(target=read)
+        reader.start()
+        for i in range(200):
+            model.add_documents([f"term{i} server", f"term{i + 1}"])
+        done.set()
+        reader.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(model.get_stats()['documents'], 400)
+
+    def test_analyzer_uses_trained_model(self):
+        """Test that extract_key_terms switches to the model once it is trained"""
+        model = IDFModel(min_documents=3)
+        analyzer = ContextAnalyzer(idf_model=model)
+        model.add_documents(["server", "server", "server"])
+
+        self.assertEqual(analyzer.extract_key_terms("Server upgrade", top_n=1)[0][0], 'upgrade')
+
+
+if __name__ == '__main__':
+    unittest.main()
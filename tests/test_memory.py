@@ -5,6 +5,7 @@ Unit tests for Translation Memory
 import unittest
 import os
 import tempfile
+import threading
 from src.memory import TranslationMemory
 
 
@@ -131,6 +132,32 @@ class TestTranslationMemory(unittest.TestCase):
         results = self.memory.search_similar_translations("Hello", "en", "es", limit=5)
         
         self.assertGreater(len(results), 0)
+    
+    def test_find_translations_for_many_targets(self):
+        """Test looking up several target languages in one query"""
+        self.memory.add_translation("Hello", "Hola", "en", "es")
+        self.memory.add_translation("Hello", "Bonjour", "en", "fr")
+        
+        found = self.memory.find_translations("Hello", "en", ["es", "fr", "de"])
+        
+        self.assertEqual(set(found), {"es", "fr"})
+        self.assertEqual(found["fr"]["translated_text"], "Bonjour")
+    
+    def test_concurrent_writes(self):
+        """Test that threads sharing the connection do not interleave statements"""
+        def write(worker):
+            for i in range(50):
+                self.memory.add_translation(f"Text {worker}-{i}", f"Texto {worker}-{i}", "en", "es")
+                self.memory.add_pending(f"Queued {worker}-{i}", "en", "es")
+        
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(self.memory.get_statistics()['total_translations'], 200)
+        self.assertEqual(self.memory.count_pending(), 200)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,106 @@
+"""
+Unit tests for Offline Queue
+"""
+
+import unittest
+import os
+import tempfile
+from src.backends import BackendError, FakeBackend
+from src.memory import TranslationMemory
+from src.offline_queue import OfflineQueue
+from src.resilience import CircuitBreaker, RetryPolicy
+from src.translator import TranslationEngine
+
+
+class RejectingBackend(FakeBackend):
+    """Fake backend that permanently rejects texts mentioning 'Klingon'"""
+
+    def translate(self, text, source_lang, target_lang, timeout=None):
+        if 'Klingon' in text:
+            raise BackendError("Unsupported text", transient=False)
+        return super().translate(text, source_lang, target_lang, timeout)
+
+
+class TestOfflineQueue(unittest.TestCase):
+    """Test cases for offline answering and replay"""
+
+    def setUp(self):
+        """Create an engine whose backend is down and a temporary memory"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.memory = TranslationMemory(self.temp_db.name)
+        self.backend = FakeBackend(error_rate=1.0)
+        self.engine = TranslationEngine(
+            backend=self.backend,
+            retry_policy=RetryPolicy(attempts=1),
+            circuit_breaker=CircuitBreaker(failure_threshold=100)
+        )
+        self.queue = OfflineQueue(self.engine, self.memory, batch_size=10)
+
+    def tearDown(self):
+        """Clean up temporary database"""
+        self.memory.close()
+        if os.path.exists(self.temp_db.name):
+            os.unlink(self.temp_db.name)
+
+    def test_answers_from_memory_when_offline(self):
+        """Test that known translations are served while the backend is down"""
+        self.memory.add_translation("Good morning", "Buenos días", "en", "es")
+        result = self.queue.translate("Good morning", 'es', source_lang='en')
+
+        self.assertEqual(result['translated_text'], "Buenos días")
+        self.assertTrue(result['offline'])
+        self.assertEqual(self.memory.count_pending(), 0)
+
+    def test_unanswered_requests_queued_not_stored(self):
+        """Test that failures are queued instead of poisoning memory"""
+        result = self.queue.translate("Good night", 'es', source_lang='en')
+
+        self.assertEqual(result['method'], 'error')
+        self.assertTrue(result['queued'])
+        self.assertEqual(self.memory.count_pending(), 1)
+        self.assertEqual(self.memory.add_translation("Good night", "Good night", "en", "es", method='error'), -1)
+        self.assertIsNone(self.memory.find_translation("Good night", "en", "es"))
+
+    def test_drain_replays_when_backend_returns(self):
+        """Test that queued requests are translated and stored once the backend is back"""
+        for text in ("One", "Two", "Three"):
+            self.queue.translate(text, 'es', source_lang='en')
+        self.assertEqual(self.queue.drain()['translated'], 0)
+
+        self.backend.error_rate = 0.0
+        stats = self.queue.drain()
+
+        self.assertEqual(stats['translated'], 3)
+        self.assertEqual(stats['remaining'], 0)
+        self.assertEqual(self.memory.find_translation("Two", "en", "es")['translated_text'], "[es] Two")
+
+    def test_outage_does_not_use_up_attempts(self):
+        """Test that drains during a long outage keep queued requests for replay"""
+        self.queue.translate("Hello", 'es', source_lang='en')
+        for _ in range(self.queue.max_attempts + 1):
+            self.assertEqual(self.queue.drain()['translated'], 0)
+
+        self.assertEqual(self.memory.get_pending()[0]['attempts'], 0)
+        self.backend.error_rate = 0.0
+        self.assertEqual(self.queue.drain()['translated'], 1)
+
+    def test_permanent_failures_counted_and_do_not_block_queue(self):
+        """Test that a request that can never succeed is dropped and does not hold up later ones"""
+        backend = RejectingBackend(error_rate=1.0)
+        engine = TranslationEngine(backend=backend, retry_policy=RetryPolicy(attempts=1))
+        queue = OfflineQueue(engine, self.memory, batch_size=1, max_attempts=2)
+        queue.translate("Speak Klingon", 'es', source_lang='en')
+        queue.translate("Good evening", 'es', source_lang='en')
+
+        backend.error_rate = 0.0
+        stats = queue.drain()
+        self.assertEqual(stats['translated'], 1)
+        self.assertEqual(self.memory.get_pending()[0]['attempts'], 1)
+
+        self.assertEqual(queue.drain()['remaining'], 0)
+        self.assertIsNotNone(self.memory.find_translation("Good evening", "en", "es"))
+
+
+if __name__ == '__main__':
+    unittest.main()
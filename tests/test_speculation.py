@@ -0,0 +1,60 @@
+"""
+Unit tests for Speculative Execution
+"""
+
+import unittest
+from src.backends import FakeBackend
+from src.speculation import SpeculativeExecutor
+from src.translator import TranslationEngine
+
+
+class TestSpeculativeExecutor(unittest.TestCase):
+    """Test cases for speculative translation"""
+
+    def setUp(self):
+        """Create an executor and an offline engine"""
+        self.engine = TranslationEngine(backend=FakeBackend(latency=0.01))
+        self.speculator = SpeculativeExecutor(max_workers=3)
+
+    def tearDown(self):
+        self.speculator.shutdown()
+
+    def _start(self, text, targets):
+        return self.speculator.start(
+            text,
+            detect=lambda t: ('en', 0.99),
+            analyze=lambda t: {'primary_domain': 'general'},
+            translate=lambda t, lang, detection: self.engine.translate(t, target_lang=lang, detection=detection),
+            targets=targets
+        )
+
+    def test_hit_returns_speculative_translation(self):
+        """Test that choosing a speculated language reuses its translation"""
+        speculation = self._start("Hello", ['es', 'fr'])
+
+        self.assertTrue(self.speculator.resolve(speculation, 'es'))
+        self.assertEqual(speculation.get_translation('es')['translated_text'], "[es] Hello")
+        self.assertEqual(speculation.get_analysis()['primary_domain'], 'general')
+        self.assertEqual(speculation.get_detection(), ('en', 0.99))
+
+    def test_hit_rate_counts_misses_and_abandoned(self):
+        """Test that hit rate covers resolved speculations only"""
+        self.speculator.resolve(self._start("One", ['es']), 'es')
+        self.speculator.resolve(self._start("Two", ['es']), 'de')
+        abandoned = self._start("Three", ['es'])
+        self.speculator.abandon(abandoned)
+        self.speculator.abandon(abandoned)
+
+        stats = self.speculator.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['abandoned']), (1, 1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_miss_has_no_translation(self):
+        """Test that a language that was not speculated on returns None"""
+        speculation = self._start("Hello", ['es'])
+        self.assertFalse(self.speculator.resolve(speculation, 'ja'))
+        self.assertIsNone(speculation.get_translation('ja'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for Translation Cache
+"""
+
+import unittest
+import threading
+import time
+from src.translation_cache import TranslationCache
+from src.translator import TranslationEngine
+from src.backends import FakeBackend
+
+
+class TestTranslationCache(unittest.TestCase):
+    """Test cases for the in-process translation cache"""
+    
+    def _result(self, text):
+        return {'original_text': text, 'translated_text': text.upper(), 'method': 'fake'}
+    
+    def test_hit_and_miss_counters(self):
+        """Test lookups update hit and miss counters"""
+        cache = TranslationCache()
+        key = cache.make_key("Hello", 'en', 'es')
+        
+        self.assertIsNone(cache.get(key))
+        cache.put(key, self._result("Hello"))
+        self.assertEqual(cache.get(key)['translated_text'], "HELLO")
+        
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+    
+    def test_key_normalizes_whitespace(self):
+        """Test that whitespace variants share a key"""
+        cache = TranslationCache()
+        self.assertEqual(
+            cache.make_key("  Hello   world\n", 'en', 'es'),
+            cache.make_key("Hello world", 'en', 'es')
+        )
+    
+    def test_lru_eviction_by_count(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = TranslationCache(max_entries=2)
+        keys = [cache.make_key(t, 'en', 'es') for t in ("a", "b", "c")]
+        cache.put(keys[0], self._result("a"))
+        cache.put(keys[1], self._result("b"))
+        cache.get(keys[0])
+        cache.put(keys[2], self._result("c"))
+        
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+    
+    def test_byte_limit(self):
+        """Test that the byte bound evicts entries"""
+        cache = TranslationCache(max_bytes=100)
+        for i in range(10):
+            cache.put(cache.make_key(f"text number {i}", 'en', 'es'), self._result(f"text number {i}"))
+        
+        self.assertLessEqual(cache.get_stats()['bytes'], 100)
+        self.assertLess(len(cache), 10)
+    
+    def test_ttl_expiry(self):
+        """Test that expired entries are not served"""
+        cache = TranslationCache(ttl=0.01)
+        key = cache.make_key("Hello", 'en', 'es')
+        cache.put(key, self._result("Hello"))
+        time.sleep(0.02)
+        
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.get_stats()['expirations'], 1)
+    
+    def test_engine_serves_repeats_from_cache(self):
+        """Test that repeated engine translations skip the backend"""
+        backend = FakeBackend()
+        engine = TranslationEngine(backend=backend)
+        
+        first = engine.translate("Hello", target_lang='es', source_lang='en')
+        second = engine.translate("Hello", target_lang='es', source_lang='en')
+        
+        self.assertEqual(first['translated_text'], second['translated_text'])
+        self.assertTrue(second['from_cache'])
+        self.assertEqual(backend.request_count, 1)
+        
+        engine.set_cache_enabled(False)
+        engine.translate("Hello", target_lang='es', source_lang='en')
+        self.assertEqual(backend.request_count, 2)
+
+    
+    def test_concurrent_identical_requests_coalesce(self):
+        """Test that concurrent identical requests share one backend call"""
+        backend = FakeBackend(latency=0.2)
+        engine = TranslationEngine(backend=backend)
+        results = []
+        
+        def worker():
+            results.append(engine.translate("Hello", target_lang='es', source_lang='en'))
+        
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(backend.request_count, 1)
+        self.assertEqual(len({r['translated_text'] for r in results}), 1)
+        self.assertEqual(engine.get_coalescing_stats()['coalesced'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,24 @@
 Unit tests for Translation Engine
 """
 
+import asyncio
+import os
+import tempfile
+import threading
 import unittest
+import time
+from types import SimpleNamespace
 from src.translator import TranslationEngine
+from src.backends import AIOHTTP_AVAILABLE, FakeBackend, GoogleBackend
+from src.memory import TranslationMemory
+from src.http_pool import ConnectionPool, HTTPStatusError, TranslatorRegistry
+from src.text_chunker import split_into_chunks
+from src.language_detector import LanguageDetector, detect_by_script
+from src.resilience import CircuitBreaker, RetryPolicy, is_transient_error
+from src.rate_limiter import RateLimitTimeout, TokenBucket, get_rate_limiter
+from src.placeholders import PlaceholderMasker, get_masker
+from src.glossary import Glossary
+from src.segment_markers import join_segments, split_segments
 
 
 class TestTranslationEngine(unittest.TestCase):
@@ -74,6 +90,801 @@ class TestTranslationEngine(unittest.TestCase):
         self.assertTrue(self.translator.is_language_supported('en'))
         self.assertTrue(self.translator.is_language_supported('es'))
         self.assertFalse(self.translator.is_language_supported('xyz'))
+    
+    def test_batch_translation_order_and_progress(self):
+        """Test that batch results keep input order and report progress"""
+        texts = [f"Line {i}" for i in range(10)]
+        progress = []
+        
+        results = self.translator.batch_translate(
+            texts,
+            target_lang='en',
+            source_lang='en',
+            max_workers=4,
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+        
+        self.assertEqual([r['original_text'] for r in results], texts)
+        self.assertEqual(len(progress), 10)
+        self.assertEqual(progress[-1], (10, 10))
+    
+    def test_batch_translation_per_item_errors(self):
+        """Test that a failing item does not abort the batch"""
+        class FailingEngine(TranslationEngine):
+            def translate(self, text, target_lang='en', source_lang=None, **kwargs):
+                if text == 'boom':
+                    raise RuntimeError('backend exploded')
+                return super().translate(text, target_lang, source_lang, **kwargs)
+        
+        engine = FailingEngine()
+        results = engine.batch_translate(['ok', 'boom', 'fine'], target_lang='en', source_lang='en')
+        
+        self.assertEqual(results[0]['method'], 'no_translation_needed')
+        self.assertEqual(results[1]['method'], 'error')
+        self.assertIn('backend exploded', results[1]['error'])
+        self.assertEqual(results[2]['original_text'], 'fine')
+
+
+class TestFakeBackend(unittest.TestCase):
+    """Test cases for running the engine on the offline fake backend"""
+    
+    def test_engine_uses_backend(self):
+        """Test that translations go through the configured backend"""
+        backend = FakeBackend()
+        engine = TranslationEngine(backend=backend)
+        result = engine.translate("Hello", target_lang='es', source_lang='en')
+        
+        self.assertEqual(result['translated_text'], "[es] Hello")
+        self.assertEqual(result['method'], 'fake')
+        self.assertEqual(engine.get_connection_stats()['requests'], 1)
+    
+    def test_simulated_errors_are_deterministic(self):
+        """Test that error simulation is reproducible for a given seed"""
+        def run():
+            engine = TranslationEngine(
+                backend=FakeBackend(error_rate=0.5, seed=42),
+                retry_policy=RetryPolicy(attempts=1),
+                circuit_breaker=CircuitBreaker(failure_threshold=100)
+            )
+            return [
+                engine.translate(f"Text {i}", target_lang='es', source_lang='en')['method']
+                for i in range(20)
+            ]
+        
+        first = run()
+        self.assertEqual(first, run())
+        self.assertIn('error', first)
+        self.assertIn('fake', first)
+    
+    def test_backend_payload_limit_applies_to_engine(self):
+        """Test that the engine chunks to the backend's payload limit"""
+        engine = TranslationEngine(backend=FakeBackend(max_payload=50))
+        result = engine.translate("A short sentence. " * 10, target_lang='es', source_lang='en')
+        
+        self.assertNotEqual(result['method'], 'error')
+        self.assertGreater(result['chunks'], 1)
+
+
+class TestResilience(unittest.TestCase):
+    """Test cases for retries, deadlines and the circuit breaker"""
+    
+    def test_retries_recover_from_transient_errors(self):
+        """Test that a failed attempt is retried"""
+        attempts = []
+        
+        def flaky(timeout):
+            attempts.append(timeout)
+            if len(attempts) < 3:
+                raise ConnectionError("transient")
+            return "ok"
+        
+        policy = RetryPolicy(attempts=3, base_delay=0)
+        self.assertEqual(policy.execute(flaky), "ok")
+        self.assertEqual(len(attempts), 3)
+    
+    def test_deadline_bounds_slow_backend(self):
+        """Test that a hung backend is cut off by the call deadline"""
+        engine = TranslationEngine(
+            backend=FakeBackend(latency=5.0),
+            retry_policy=RetryPolicy(attempts=3, base_delay=0, timeout=0.2)
+        )
+        start = time.monotonic()
+        result = engine.translate("Hello", target_lang='es', source_lang='en')
+        
+        self.assertEqual(result['method'], 'error')
+        self.assertLess(time.monotonic() - start, 1.0)
+    
+    def test_circuit_opens_and_fails_fast(self):
+        """Test that repeated failures open the circuit and skip the backend"""
+        backend = FakeBackend(error_rate=1.0)
+        engine = TranslationEngine(
+            backend=backend,
+            retry_policy=RetryPolicy(attempts=1),
+            circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        )
+        for i in range(2):
+            engine.translate(f"Text {i}", target_lang='es', source_lang='en')
+        
+        result = engine.translate("Another", target_lang='es', source_lang='en')
+        
+        self.assertEqual(result['method'], 'error')
+        self.assertEqual(backend.request_count, 2)
+        self.assertEqual(engine.get_circuit_stats()['state'], CircuitBreaker.OPEN)
+    
+    def test_half_open_trial_closes_circuit(self):
+        """Test that a successful trial call closes the circuit"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+    
+    def test_permanent_errors_not_retried_or_counted(self):
+        """Test that an error retrying can not fix is raised at once without tripping the circuit"""
+        attempts = []
+        
+        def unsupported(timeout):
+            attempts.append(timeout)
+            raise ValueError("language not supported")
+        
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        policy = RetryPolicy(attempts=3, base_delay=0)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                policy.execute(unsupported, breaker=breaker)
+        
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+    
+    def test_permanent_error_releases_half_open_trial(self):
+        """Test that a permanent error during the trial call lets the next trial through"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        
+        with self.assertRaises(ValueError):
+            RetryPolicy(attempts=1).execute(lambda timeout: int("x"), breaker=breaker)
+        self.assertTrue(breaker.allow_request())
+    
+    def test_transient_error_classification(self):
+        """Test which errors count as transient"""
+        self.assertTrue(is_transient_error(TimeoutError()))
+        self.assertTrue(is_transient_error(ConnectionError()))
+        self.assertTrue(is_transient_error(asyncio.TimeoutError()))
+        self.assertTrue(is_transient_error(HTTPStatusError(429)))
+        self.assertTrue(is_transient_error(HTTPStatusError(503)))
+        self.assertFalse(is_transient_error(HTTPStatusError(400)))
+        self.assertFalse(is_transient_error(ValueError()))
+    
+    def test_cancelled_trial_is_released(self):
+        """Test that cancelling the half-open trial call lets the next trial through"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        
+        async def slow(timeout):
+            await asyncio.sleep(10)
+        
+        async def run():
+            task = asyncio.ensure_future(RetryPolicy(attempts=1).aexecute(slow, breaker=breaker))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+        
+        asyncio.run(run())
+        self.assertTrue(breaker.allow_request())
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the token bucket rate limiter"""
+    
+    def test_burst_then_rate(self):
+        """Test that a burst is served immediately and later calls are paced"""
+        bucket = TokenBucket(rate=20, burst=3)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+        
+        self.assertGreaterEqual(elapsed, 0.08)
+        stats = bucket.get_stats()['interactive']
+        self.assertEqual(stats['acquired'], 5)
+        self.assertEqual(stats['delayed'], 2)
+    
+    def test_timeout_raises(self):
+        """Test that waiting past the deadline raises RateLimitTimeout"""
+        bucket = TokenBucket(rate=1, burst=1)
+        bucket.acquire()
+        with self.assertRaises(RateLimitTimeout):
+            bucket.acquire(timeout=0.05)
+    
+    def test_interactive_jumps_ahead_of_bulk(self):
+        """Test that a waiting interactive caller gets the next token first"""
+        bucket = TokenBucket(rate=10, burst=1)
+        bucket.acquire(TokenBucket.BULK)
+        order = []
+        
+        def take(priority):
+            bucket.acquire(priority)
+            order.append(priority)
+        
+        bulk = [threading.Thread(target=take, args=(TokenBucket.BULK,)) for _ in range(3)]
+        for thread in bulk:
+            thread.start()
+        time.sleep(0.01)
+        interactive = threading.Thread(target=take, args=(TokenBucket.INTERACTIVE,))
+        interactive.start()
+        for thread in bulk + [interactive]:
+            thread.join()
+        
+        self.assertLess(order.index(TokenBucket.INTERACTIVE), 2)
+    
+    def test_same_priority_served_in_arrival_order(self):
+        """Test that async waiters of one priority get tokens first come, first served"""
+        bucket = TokenBucket(rate=50, burst=1)
+        bucket.acquire()
+        order = []
+        
+        async def take(i):
+            await bucket.aacquire(TokenBucket.BULK)
+            order.append(i)
+        
+        async def run():
+            tasks = []
+            for i in range(5):
+                tasks.append(asyncio.ensure_future(take(i)))
+                await asyncio.sleep(0)
+            await asyncio.gather(*tasks)
+        
+        asyncio.run(run())
+        self.assertEqual(order, list(range(5)))
+    
+    def test_bucket_shared_per_backend(self):
+        """Test that engines on the same backend share one bucket"""
+        self.assertIs(get_rate_limiter('shared-test', 5, 2), get_rate_limiter('shared-test'))
+        engine = TranslationEngine(backend=FakeBackend(), rate_limiter=TokenBucket(rate=100, burst=1))
+        engine.batch_translate(["a", "b", "c"], target_lang='es', source_lang='en')
+        
+        stats = engine.get_rate_limit_stats()
+        self.assertEqual(stats['bulk']['acquired'], 3)
+        self.assertEqual(stats['interactive']['acquired'], 0)
+    
+    def test_rate_limit_timeout_does_not_open_circuit(self):
+        """Test that running out of time waiting for a token is not a backend failure"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        engine = TranslationEngine(
+            backend=FakeBackend(),
+            retry_policy=RetryPolicy(attempts=3, base_delay=0.0, timeout=0.1),
+            circuit_breaker=breaker,
+            rate_limiter=TokenBucket(rate=1, burst=1)
+        )
+        results = engine.batch_translate(["a", "b", "c"], target_lang='es', source_lang='en')
+        
+        self.assertEqual(sum(r['method'] == 'error' for r in results), 2)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+    
+    def test_sync_batch_workers_fit_rate_limit(self):
+        """Test that batch worker threads do not outnumber what the bucket serves per deadline"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        engine = TranslationEngine(
+            backend=FakeBackend(),
+            retry_policy=RetryPolicy(attempts=1, timeout=0.5),
+            circuit_breaker=breaker,
+            rate_limiter=TokenBucket(rate=20, burst=1)
+        )
+        texts = [f"Sentence {i}" for i in range(24)]
+        results = engine.batch_translate(texts, target_lang='es', source_lang='en', max_workers=24)
+        
+        self.assertFalse([r for r in results if r['method'] == 'error'])
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+    
+    def test_async_batch_concurrency_fits_rate_limit(self):
+        """Test that an async batch larger than the bucket serves per deadline still completes"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        engine = TranslationEngine(
+            backend=FakeBackend(),
+            retry_policy=RetryPolicy(attempts=1, timeout=1.0),
+            circuit_breaker=breaker,
+            rate_limiter=TokenBucket(rate=20, burst=1)
+        )
+        texts = [f"Sentence {i}" for i in range(30)]
+        results = asyncio.run(engine.abatch_translate(texts, target_lang='es', source_lang='en'))
+        
+        self.assertFalse([r for r in results if r['method'] == 'error'])
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestPlaceholderMasker(unittest.TestCase):
+    """Test cases for single-pass entity masking"""
+    
+    def test_longest_match_wins(self):
+        """Test that overlapping entities do not clobber each other"""
+        masker = PlaceholderMasker(['New York', 'New York City', 'York'])
+        masked, found = masker.mask("New York City is not York.")
+        
+        self.assertEqual(sorted(found.values()), ['New York City', 'York'])
+        self.assertNotIn('York', masked)
+        self.assertEqual(masker.unmask(masked, found), "New York City is not York.")
+    
+    def test_unmask_tolerates_mangled_placeholders(self):
+        """Test that placeholders altered by the backend are still restored"""
+        masker = get_masker(['Microsoft'])
+        masked, found = masker.mask("Microsoft")
+        
+        self.assertEqual(masker.unmask("en __entity_0 __ hoy", found), "en Microsoft hoy")
+    
+    def test_masker_is_reused_per_entity_set(self):
+        """Test that compiled maskers are cached"""
+        self.assertIs(get_masker(['A', 'B']), get_masker(('A', 'B')))
+    
+    def test_engine_preserves_entities(self):
+        """Test entity round trip through the engine"""
+        engine = TranslationEngine(backend=FakeBackend())
+        result = engine.translate(
+            "John Smith met John at Microsoft",
+            target_lang='es',
+            source_lang='en',
+            preserve_entities=['John', 'John Smith', 'Microsoft']
+        )
+        
+        self.assertEqual(result['translated_text'], "[es] John Smith met John at Microsoft")
+        self.assertEqual(len(result['preserved_entities']), 3)
+
+
+class TestGlossary(unittest.TestCase):
+    """Test cases for custom dictionary terminology"""
+    
+    CUSTOM_DICT = {
+        'technical_terms': {
+            'machine learning': {'es': 'aprendizaje automático'},
+            'database': {'es': 'base de datos'}
+        },
+        'user_defined': {
+            'database': {'es': 'BD'}
+        }
+    }
+    
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.engine = TranslationEngine(backend=self.backend)
+        self.engine.glossary = Glossary(self.CUSTOM_DICT)
+    
+    def test_multi_word_terms_substituted(self):
+        """Test that glossary terms are enforced inside a translated sentence"""
+        result = self.engine.translate(
+            "Machine   learning needs a database.",
+            target_lang='es',
+            source_lang='en'
+        )
+        
+        self.assertEqual(result['translated_text'], "[es] aprendizaje automático needs a BD.")
+        self.assertEqual(result['glossary_terms'], 2)
+    
+    def test_glossary_only_selection_skips_backend(self):
+        """Test that a selection that is just a term is answered locally"""
+        result = self.engine.translate("Machine Learning", target_lang='es')
+        
+        self.assertEqual(result['translated_text'], "aprendizaje automático")
+        self.assertEqual(result['method'], 'glossary')
+        self.assertEqual(self.backend.request_count, 0)
+    
+    def test_other_languages_unaffected(self):
+        """Test that terms without a translation for the target are left alone"""
+        result = self.engine.translate("A database.", target_lang='fr', source_lang='en')
+        
+        self.assertEqual(result['translated_text'], "[fr] A database.")
+        self.assertEqual(result['glossary_terms'], 0)
+
+
+class TestContextTranslation(unittest.TestCase):
+    """Test cases for marker-based context translation"""
+    
+    def test_markers_round_trip(self):
+        """Test splitting tolerates spacing changes and rejects lost markers"""
+        joined = join_segments(["One.", "Two.", "Three."])
+        self.assertEqual(split_segments(joined, 3), ["One.", "Two.", "Three."])
+        self.assertEqual(split_segments("[ [0] ] Uno. [[1 ]] Dos.", 2), ["Uno.", "Dos."])
+        self.assertIsNone(split_segments("[[0]] Uno. Dos.", 2))
+        self.assertIsNone(split_segments("[[1]] Uno. [[0]] Dos.", 2))
+    
+    def test_main_segment_extracted_exactly(self):
+        """Test that only the main segment is returned"""
+        engine = TranslationEngine(backend=FakeBackend())
+        result = engine.translate_with_context(
+            "It was a great time.",
+            context_before="I went to the concert yesterday. It was loud.",
+            context_after="We left late.",
+            target_lang='es'
+        )
+        
+        self.assertEqual(result['translated_text'], "[es] It was a great time.")
+        self.assertEqual(result['original_text'], "It was a great time.")
+        self.assertTrue(result['context_used'])
+    
+    def test_sliding_window_reuses_context_translations(self):
+        """Test that sentences translated as context are not sent again"""
+        backend = FakeBackend()
+        engine = TranslationEngine(backend=backend)
+        sentences = ["First one.", "Second one.", "Third one.", "Fourth one."]
+        
+        for idx, sentence in enumerate(sentences):
+            engine.translate_with_context(
+                sentence,
+                context_before=sentences[idx - 1] if idx > 0 else "",
+                context_after=sentences[idx + 1] if idx + 1 < len(sentences) else "",
+                target_lang='es',
+                preserve_entities=None
+            )
+        
+        self.assertEqual(backend.request_count, 2)
+    
+    def test_backend_failure_reports_main_text_only(self):
+        """Test that a failed context request never returns the marker-joined window"""
+        engine = TranslationEngine(
+            backend=FakeBackend(error_rate=1.0),
+            retry_policy=RetryPolicy(attempts=1)
+        )
+        result = engine.translate_with_context(
+            "It was a great time.",
+            context_before="I went to the concert yesterday.",
+            context_after="We left late.",
+            target_lang='es'
+        )
+        
+        self.assertEqual(result['method'], 'error')
+        self.assertEqual(result['translated_text'], "It was a great time.")
+        self.assertEqual(result['original_text'], "It was a great time.")
+        self.assertFalse(result['context_used'])
+    
+    def test_blank_text_never_returns_context(self):
+        """Test that a blank main text is not replaced by a context translation"""
+        engine = TranslationEngine(backend=FakeBackend())
+        result = engine.translate_with_context(
+            "  ",
+            context_before="Before.",
+            context_after="After.",
+            target_lang='es'
+        )
+        
+        self.assertNotIn("After", result['translated_text'])
+        self.assertFalse(result['context_used'])
+
+
+class TestLanguageDetector(unittest.TestCase):
+    """Test cases for script heuristics and memoized detection"""
+    
+    def test_script_fast_path(self):
+        """Test that distinctive scripts are classified without the model"""
+        self.assertEqual(detect_by_script("नमस्ते दुनिया")[0], 'hi')
+        self.assertEqual(detect_by_script("안녕하세요")[0], 'ko')
+        self.assertEqual(detect_by_script("こんにちは世界")[0], 'ja')
+        self.assertEqual(detect_by_script("مرحبا بالعالم")[0], 'ar')
+        self.assertEqual(detect_by_script("Привет мир")[0], 'ru')
+        self.assertEqual(detect_by_script("你好世界")[0], 'zh-cn')
+        self.assertIsNone(detect_by_script("Hello world"))
+    
+    def test_detections_are_memoized(self):
+        """Test that repeated detections do not call the model again"""
+        calls = []
+        
+        def model(text):
+            calls.append(text)
+            return 'en', 0.9
+        
+        detector = LanguageDetector(model=model)
+        detector.detect("Hello world")
+        detector.detect("Hello world")
+        detector.detect("Привет мир")
+        
+        self.assertEqual(calls, ["Hello world"])
+        stats = detector.get_stats()
+        self.assertEqual(stats['cache_hits'], 1)
+        self.assertEqual(stats['script_hits'], 1)
+    
+    def test_translate_accepts_precomputed_detection(self):
+        """Test that translate() skips detection when given one"""
+        engine = TranslationEngine(backend=FakeBackend())
+        result = engine.translate("Bonjour", target_lang='es', detection=('fr', 0.8))
+        
+        self.assertEqual(result['source_language'], 'fr')
+        self.assertEqual(result['confidence'], 0.8)
+        self.assertEqual(engine.get_detection_stats()['model_calls'], 0)
+
+
+class TestTranslatorRegistry(unittest.TestCase):
+    """Test cases for pooled translator reuse"""
+    
+    def setUp(self):
+        self.pool = ConnectionPool()
+        self.registry = TranslatorRegistry(self.pool, max_pairs=2)
+    
+    def tearDown(self):
+        self.pool.close()
+    
+    def test_translator_reused_per_pair(self):
+        """Test that the same translator object serves a language pair"""
+        first = self.registry.get('en', 'es')
+        second = self.registry.get('en', 'es')
+        
+        self.assertIs(first, second)
+        self.assertIs(first.pool, self.pool)
+    
+    def test_registry_evicts_least_recent_pair(self):
+        """Test that the registry stays within its size limit"""
+        en_es = self.registry.get('en', 'es')
+        self.registry.get('en', 'fr')
+        self.registry.get('en', 'es')
+        self.registry.get('en', 'de')
+        
+        self.assertEqual(len(self.registry), 2)
+        self.assertIs(self.registry.get('en', 'es'), en_es)
+    
+    def test_engine_codes_mapped_to_google_codes(self):
+        """Test that engine codes like zh-cn are accepted and shared with their Google spelling"""
+        translator = self.registry.get('en', 'zh-cn')
+        
+        self.assertEqual(translator._target, 'zh-CN')
+        self.assertIs(self.registry.get('en', 'zh-CN'), translator)
+    
+    def test_connection_stats(self):
+        """Test connection statistics structure"""
+        stats = self.pool.get_stats()
+        
+        self.assertEqual(stats['requests'], 0)
+        self.assertIn('new_connections', stats)
+        self.assertIn('reused_connections', stats)
+
+
+class StubTranslator:
+    """Stand-in for googletrans and deep-translator clients"""
+    
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.timeouts = []
+    
+    def translate(self, text, src=None, dest=None, timeout=None):
+        self.timeouts.append(timeout)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        # googletrans returns an object with .text, deep-translator a string
+        return text if dest is None else SimpleNamespace(text=text)
+
+
+class TestGoogleBackendDeadline(unittest.TestCase):
+    """Test cases for the shared timeout budget of the primary and fallback translators"""
+    
+    def setUp(self):
+        self.backend = GoogleBackend(timeout=0.3)
+        self.fallback = StubTranslator()
+        self.backend.translator_registry.get = lambda source, target: self.fallback
+    
+    def tearDown(self):
+        self.backend.close()
+    
+    def test_slow_primary_abandoned_at_deadline(self):
+        """Test that a hanging googletrans call does not outlive the budget"""
+        self.backend.translator = StubTranslator(delay=2.0)
+        
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            self.backend.translate("Hello", 'en', 'es')
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(self.fallback.timeouts, [])
+    
+    def test_fallback_gets_remaining_budget(self):
+        """Test that the fallback only gets the time the primary left over"""
+        self.backend.translator = StubTranslator(delay=0.1, error=ValueError("bad response"))
+        
+        self.assertEqual(self.backend.translate("Hello", 'en', 'es'), "Hello")
+        self.assertLess(self.fallback.timeouts[0], 0.25)
+
+
+class TestTextChunking(unittest.TestCase):
+    """Test cases for sentence-aware chunking of long texts"""
+    
+    def test_chunks_respect_limit_and_round_trip(self):
+        """Test that chunks fit the limit and rejoin to the original text"""
+        text = "First sentence here.  Second one!\n\nThird? " * 20
+        chunks = split_into_chunks(text, 100)
+        
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), text)
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+    
+    def test_oversized_sentence_split_on_whitespace(self):
+        """Test that a sentence longer than the limit is split between words"""
+        text = "word " * 50
+        chunks = split_into_chunks(text, 32)
+        
+        self.assertEqual(''.join(chunks), text)
+        self.assertTrue(all(chunk.startswith('word') for chunk in chunks))
+    
+    def test_long_text_translated_in_chunks(self):
+        """Test that translate() stitches chunk translations in order"""
+        class UpperEngine(TranslationEngine):
+            def _translate_text(self, text, source_lang, target_lang):
+                return text.upper(), 'stub'
+        
+        engine = UpperEngine()
+        engine.max_text_length = 40
+        text = "One sentence.\nTwo sentence.  Three sentence. Four sentence. Five."
+        result = engine.translate(text, target_lang='es', source_lang='en')
+        
+        self.assertEqual(result['translated_text'], text.upper())
+        self.assertGreater(result['chunks'], 1)
+        self.assertEqual(result['method'], 'stub')
+
+
+class TestPackedBatch(unittest.TestCase):
+    """Test cases for packing short segments into shared backend requests"""
+    
+    def test_packing_cuts_request_count(self):
+        """Test that short strings share requests and map back in order"""
+        backend = FakeBackend()
+        engine = TranslationEngine(backend=backend)
+        texts = [f"Menu item {i}" for i in range(100)] + ["  Padded label  "]
+        
+        results = engine.batch_translate(texts, target_lang='es', source_lang='en', pack=True)
+        
+        self.assertEqual([r['translated_text'] for r in results[:3]],
+                         ["[es] Menu item 0", "[es] Menu item 1", "[es] Menu item 2"])
+        self.assertEqual(results[-1]['translated_text'], "  [es] Padded label  ")
+        self.assertLessEqual(backend.request_count, 2)
+        self.assertTrue(results[0]['packed'])
+    
+    def test_payload_limit_respected(self):
+        """Test that packed requests never exceed the backend payload limit"""
+        backend = FakeBackend(max_payload=120)
+        engine = TranslationEngine(backend=backend)
+        texts = [f"String number {i}" for i in range(30)]
+        
+        results = engine.batch_translate(texts, target_lang='es', source_lang='en', pack=True)
+        
+        self.assertEqual(backend.error_count, 0)
+        self.assertTrue(all(r['method'] == 'fake' for r in results))
+        self.assertLess(backend.request_count, 30)
+    
+    def test_falls_back_to_singles_when_markers_lost(self):
+        """Test that a response that does not split cleanly is retried per segment"""
+        class MarkerDroppingBackend(FakeBackend):
+            @staticmethod
+            def _fake_translate(text, target_lang):
+                return FakeBackend._fake_translate(text, target_lang).replace('[[1]]', '')
+        
+        backend = MarkerDroppingBackend()
+        engine = TranslationEngine(backend=backend)
+        results = engine.batch_translate(["One", "Two", "Three"], target_lang='es', source_lang='en', pack=True)
+        
+        self.assertEqual([r['translated_text'] for r in results], ["[es] One", "[es] Two", "[es] Three"])
+        self.assertEqual(backend.request_count, 4)
+
+
+class TestMultiTargetTranslation(unittest.TestCase):
+    """Test cases for translating one text into many languages"""
+    
+    def test_all_supported_targets_detected_once(self):
+        """Test fan-out to every supported language with a single detection"""
+        engine = TranslationEngine(backend=FakeBackend())
+        results = engine.translate_to_many("Hello there, my friend")
+        
+        self.assertEqual(list(results), list(TranslationEngine.SUPPORTED_LANGUAGES))
+        self.assertEqual(results['es']['translated_text'], "[es] Hello there, my friend")
+        self.assertEqual(results['en']['method'], 'no_translation_needed')
+        self.assertTrue(all('elapsed_ms' in r for r in results.values()))
+        stats = engine.get_detection_stats()
+        self.assertEqual(stats['model_calls'] + stats['script_hits'], 1)
+    
+    def test_memory_targets_reused_and_new_ones_stored(self):
+        """Test that translation memory answers known targets and learns new ones"""
+        with tempfile.TemporaryDirectory() as tmp:
+            memory = TranslationMemory(os.path.join(tmp, 'tm.db'))
+            memory.add_translation("Hello", "Hola", "en", "es")
+            backend = FakeBackend()
+            engine = TranslationEngine(backend=backend)
+            
+            results = engine.translate_to_many("Hello", ['es', 'fr'], source_lang='en', memory=memory)
+            
+            self.assertEqual(results['es']['translated_text'], "Hola")
+            self.assertEqual(results['es']['method'], 'cache')
+            self.assertEqual(backend.request_count, 1)
+            self.assertEqual(memory.find_translation("Hello", "en", "fr")['translated_text'], "[fr] Hello")
+            memory.close()
+
+
+class TestAsyncTranslation(unittest.TestCase):
+    """Test cases for the asyncio API"""
+    
+    def test_atranslate_matches_translate(self):
+        """Test that atranslate() produces the same result as translate()"""
+        engine = TranslationEngine(backend=FakeBackend())
+        result = asyncio.run(engine.atranslate("Hello", target_lang='es', source_lang='en'))
+        
+        self.assertEqual(result['translated_text'], "[es] Hello")
+        self.assertEqual(result['method'], 'fake')
+        self.assertTrue(engine.translate("Hello", target_lang='es', source_lang='en')['from_cache'])
+    
+    def test_abatch_translate_runs_concurrently(self):
+        """Test that one event loop overlaps many slow requests and keeps order"""
+        backend = FakeBackend(latency=0.1)
+        engine = TranslationEngine(backend=backend)
+        texts = [f"Sentence {i}" for i in range(50)]
+        progress = []
+        
+        start = time.monotonic()
+        results = asyncio.run(engine.abatch_translate(
+            texts, target_lang='es', source_lang='en',
+            progress_callback=lambda done, total: progress.append(done)
+        ))
+        elapsed = time.monotonic() - start
+        
+        self.assertEqual([r['original_text'] for r in results], texts)
+        self.assertEqual(progress[-1], 50)
+        self.assertEqual(backend.request_count, 50)
+        self.assertLess(elapsed, 2.0)
+    
+    def test_identical_async_requests_coalesced(self):
+        """Test that concurrent identical coroutines share one backend call"""
+        backend = FakeBackend(latency=0.05)
+        engine = TranslationEngine(backend=backend)
+        
+        async def run():
+            return await asyncio.gather(*(
+                engine.atranslate("Same text", target_lang='es', source_lang='en')
+                for _ in range(10)
+            ))
+        
+        results = asyncio.run(run())
+        self.assertEqual(backend.request_count, 1)
+        self.assertEqual(len({r['translated_text'] for r in results}), 1)
+        self.assertEqual(engine.get_coalescing_stats()['coalesced'], 9)
+    
+    def test_cancelled_leader_does_not_fail_followers(self):
+        """Test that cancelling the caller that started a coalesced request spares the others"""
+        backend = FakeBackend(latency=0.05)
+        engine = TranslationEngine(backend=backend)
+        
+        async def run():
+            leader = asyncio.ensure_future(engine.atranslate("Shared", target_lang='es', source_lang='en'))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(engine.atranslate("Shared", target_lang='es', source_lang='en'))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+        
+        result = asyncio.run(run())
+        self.assertEqual(result['translated_text'], "[es] Shared")
+        self.assertEqual(backend.request_count, 1)
+    
+    def test_async_deadline_bounds_slow_backend(self):
+        """Test that the retry deadline cancels a slow async request"""
+        engine = TranslationEngine(
+            backend=FakeBackend(latency=5.0),
+            retry_policy=RetryPolicy(attempts=2, base_delay=0.0, timeout=0.2)
+        )
+        start = time.monotonic()
+        result = asyncio.run(engine.atranslate("Hello", target_lang='es', source_lang='en'))
+        
+        self.assertEqual(result['method'], 'error')
+        self.assertLess(time.monotonic() - start, 1.0)
+    
+    @unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp not installed")
+    def test_session_closed_when_event_loop_changes(self):
+        """Test that a new event loop gets a new session and the old one is closed"""
+        backend = GoogleBackend()
+        first = asyncio.run(backend._get_async_session())
+        
+        async def second_run():
+            session = await backend._get_async_session()
+            await backend.aclose()
+            return session
+        
+        second = asyncio.run(second_run())
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        self.assertTrue(second.closed)
 
 
 if __name__ == '__main__':